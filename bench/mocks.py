@@ -0,0 +1,446 @@
+"""
+Local stand-ins for every backend the wallet scripts talk to.
+- HTTP mocks (threaded, 127.0.0.1, random port): EVM JSON-RPC, Solana RPC,
+  Tron full node, monerod (over a generated fixture chain), explorer + price API
+- RedirectAdapter sends requests for real hostnames (api.coinbase.com,
+  api.trongrid.io, ...) to a mock, so the scripts' hard-coded URLs still work
+- In-process stubs for the SDKs that hide their transport: bitcoinlib's
+  Service providers and bitcash's NetworkAPI
+
+Every mock answers with fixed data, so runs are reproducible; an optional
+per-request delay simulates network latency.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+BALANCE_WEI = 5 * 10 ** 18
+BALANCE_LAMPORTS = 5 * 10 ** 9
+BALANCE_SATS = 10 ** 9
+USDT_BALANCE = 250 * 10 ** 6
+PRICES = {"BTC": "65000.00", "LTC": "80.00", "DOGE": "0.15", "ETH": "3200.00", "BNB": "580.00"}
+TRC20_ABI = [
+    {"type": "function", "name": "balanceOf", "stateMutability": "View",
+     "inputs": [{"name": "who", "type": "address"}], "outputs": [{"name": "", "type": "uint256"}]},
+    {"type": "function", "name": "transfer", "stateMutability": "Nonpayable",
+     "inputs": [{"name": "_to", "type": "address"}, {"name": "_value", "type": "uint256"}],
+     "outputs": [{"name": "", "type": "bool"}]},
+]
+
+
+class MockServer:
+    """Threaded HTTP server; handle(method, path, body) -> (status, payload)."""
+
+    def __init__(self, handle: Callable[[str, str, Any], tuple], delay: float = 0.0):
+        self.requests = 0
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _serve(self, method):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+                body = json.loads(raw) if raw else None
+                outer.requests += 1
+                if delay:
+                    time.sleep(delay)
+                status, payload = handle(method, self.path, body)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    @property
+    def host(self) -> str:
+        return f"127.0.0.1:{self.server.server_address[1]}"
+
+    def close(self):
+        self.server.shutdown()
+
+
+def _fake_hash(data: Any) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+
+
+# ---------- EVM JSON-RPC ----------
+_evm_sent: Dict[str, str] = {}  # tx hash -> raw legacy transaction, for eth_getTransactionByHash
+
+
+def _evm_pending_tx(tx_hash: str) -> Any:
+    """A transaction sent to the mock, decoded and reported as still pending."""
+    import rlp
+    from eth_account import Account
+    raw = _evm_sent.get(tx_hash)
+    if raw is None:
+        return None
+    nonce, gas_price, gas, to, value, data, *_ = rlp.decode(bytes.fromhex(raw[2:]))
+    as_hex = lambda b: hex(int.from_bytes(b, "big"))
+    return {"hash": tx_hash, "from": Account.recover_transaction(raw), "to": "0x" + to.hex(), "nonce": as_hex(nonce),
+            "gasPrice": as_hex(gas_price), "gas": as_hex(gas), "value": as_hex(value), "input": "0x" + data.hex(),
+            "blockNumber": None}
+
+
+def _evm_one(call: Dict[str, Any]) -> Dict[str, Any]:
+    method, params = call["method"], call.get("params") or []
+    results = {
+        "eth_chainId": "0x1",
+        "net_version": "1",
+        "eth_blockNumber": hex(19_000_000),
+        "eth_getBalance": hex(BALANCE_WEI),
+        "eth_getTransactionCount": "0x0",
+        "eth_gasPrice": hex(20 * 10 ** 9),
+        "eth_maxPriorityFeePerGas": hex(10 ** 9),
+        "eth_estimateGas": hex(60_000),
+        "eth_call": "0x" + f"{USDT_BALANCE:064x}",
+        "web3_clientVersion": "hiderax-bench/evm",
+    }
+    if method == "eth_sendRawTransaction":
+        from eth_utils import keccak
+        result = "0x" + keccak(hexstr=params[0]).hex()
+        _evm_sent[result] = params[0]
+    elif method == "eth_getTransactionByHash":
+        result = _evm_pending_tx(params[0])
+    elif method == "eth_getTransactionReceipt":  # every transaction mined 20 blocks ago
+        result = {"transactionHash": params[0], "blockNumber": hex(19_000_000 - 20), "status": "0x1",
+                  "gasUsed": hex(21_000)}
+    elif method == "eth_getBlockByNumber":
+        result = {"number": hex(19_000_000), "baseFeePerGas": hex(15 * 10 ** 9), "timestamp": hex(int(time.time())),
+                  "hash": "0x" + "ab" * 32, "transactions": []}
+    elif method in results:
+        result = results[method]
+    else:
+        return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32601, "message": f"{method} not mocked"}}
+    return {"jsonrpc": "2.0", "id": call.get("id"), "result": result}
+
+
+def evm(delay: float = 0.0) -> MockServer:
+    def handle(method, path, body):
+        return 200, [_evm_one(c) for c in body] if isinstance(body, list) else _evm_one(body)
+    return MockServer(handle, delay)
+
+
+# ---------- Solana RPC ----------
+def _sol_one(call: Dict[str, Any]) -> Dict[str, Any]:
+    method, params = call["method"], call.get("params") or []
+    ctx = {"context": {"slot": 250_000_000}}
+    if method == "getMultipleAccounts":
+        result = {**ctx, "value": [{"lamports": BALANCE_LAMPORTS, "owner": "11111111111111111111111111111111",
+                                    "data": ["", "base64"], "executable": False, "rentEpoch": 0}
+                                   for _ in params[0]]}
+    elif method == "getBalance":
+        result = {**ctx, "value": BALANCE_LAMPORTS}
+    elif method == "getLatestBlockhash":
+        result = {**ctx, "value": {"blockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N",
+                                   "lastValidBlockHeight": 230_000_000}}
+    elif method == "sendTransaction":
+        result = _fake_hash(params[0])[:64]
+    elif method == "getHealth":
+        result = "ok"
+    else:
+        return {"jsonrpc": "2.0", "id": call.get("id"), "error": {"code": -32601, "message": f"{method} not mocked"}}
+    return {"jsonrpc": "2.0", "id": call.get("id"), "result": result}
+
+
+def solana(delay: float = 0.0) -> MockServer:
+    def handle(method, path, body):
+        return 200, [_sol_one(c) for c in body] if isinstance(body, list) else _sol_one(body)
+    return MockServer(handle, delay)
+
+
+# ---------- Tron full node ----------
+def tron(delay: float = 0.0) -> MockServer:
+    block_id = "0000000003b9aca0" + "a1" * 24
+
+    def handle(method, path, body):
+        route = urlsplit(path).path.strip("/")
+        if route == "wallet/getnodeinfo":
+            return 200, {"block": f"Num:62500000,ID:{block_id}", "solidityBlock": f"Num:62499980,ID:{block_id}"}
+        if route == "wallet/getcontract":
+            return 200, {"contract_address": body["value"], "name": "TetherToken", "bytecode": "",
+                         "abi": {"entrys": TRC20_ABI}, "origin_address": body["value"]}
+        if route == "wallet/triggerconstantcontract":
+            return 200, {"result": {"result": True}, "constant_result": [f"{USDT_BALANCE:064x}"],
+                         "energy_used": 900}
+        if route == "wallet/getsignweight":
+            return 200, {"transaction": {"transaction": {"txID": _fake_hash(body.get("raw_data"))}},
+                         "permission": {"keys": [{"address": body.get("raw_data", {}).get("contract", [{}])[0]
+                                                  .get("parameter", {}).get("value", {}).get("owner_address", ""),
+                                                  "weight": 1}], "threshold": 1}}
+        if route == "wallet/broadcasttransaction":
+            return 200, {"result": True, "txid": body.get("txID")}
+        if route == "wallet/gettransactioninfobyid":
+            return 200, {"id": body["value"], "blockNumber": 62_499_900, "receipt": {"result": "SUCCESS"}}
+        if route == "wallet/getaccount":
+            return 200, {"address": body.get("address"), "balance": 10 ** 9}
+        return 404, {"Error": f"{route} not mocked"}
+    return MockServer(handle, delay)
+
+
+# ---------- Monero daemon ----------
+XMR_AMOUNT = 1_250_000_000  # atomic units per fixture payment (0.00125 XMR)
+XMR_COINBASE = 600_000_000_000
+_XMR_H = bytes.fromhex("8b655970153799af2aeadc9ff1add0ea6c7251d54154cfa92c173a0dd39c1f94")
+
+
+def _xmr_scalar(data: bytes) -> bytes:
+    import nacl.bindings as sodium
+    from monero.keccak import keccak_256
+    return sodium.crypto_core_ed25519_scalar_reduce(keccak_256(data).digest() + bytes(32))
+
+
+def _xmr_output(r: bytes, n: int, view_pub: bytes, spend_pub: bytes, amount: int):
+    """One-time output of tx key r to (A, B) at index n: (key, view tag, encrypted amount, commitment)."""
+    import nacl.bindings as sodium
+    import varint
+    from monero.keccak import keccak_256
+    eight_r = sodium.crypto_core_ed25519_scalar_mul(r, (8).to_bytes(32, "little"))
+    derivation = sodium.crypto_scalarmult_ed25519_noclamp(eight_r, view_pub)
+    index = varint.encode(n)
+    hs = _xmr_scalar(derivation + index)
+    key = sodium.crypto_core_ed25519_add(sodium.crypto_scalarmult_ed25519_base_noclamp(hs), spend_pub)
+    tag = keccak_256(b"view_tag" + derivation + index).digest()[:1]
+    value = amount.to_bytes(8, "little")
+    encrypted = bytes(a ^ b for a, b in zip(value, keccak_256(b"amount" + hs).digest()[:8]))
+    commitment = sodium.crypto_core_ed25519_add(
+        sodium.crypto_scalarmult_ed25519_base_noclamp(_xmr_scalar(b"commitment_mask" + hs)),
+        sodium.crypto_scalarmult_ed25519_noclamp(value + bytes(24), _XMR_H))
+    return key, tag, encrypted, commitment
+
+
+def monero_blocks(view_pub: bytes, spend_pub: bytes, start: int, count: int, every: int = 10,
+                  txs_per_block: int = 4, seed: bytes = b"hiderax", subaddresses: tuple = ()) -> tuple:
+    """
+    Fixture chain for the view-key scanner: blocks start..start+count-1, each
+    with a coinbase and `txs_per_block` two-output RingCT transactions. Every
+    `every`-th block pays the wallet (view_pub, spend_pub) once in a regular
+    transaction and mines its coinbase to it; with `subaddresses` ((C, D) pairs)
+    its second transaction also pays the next of them (tx key r·D, as wallets do
+    for a single subaddress recipient). Deterministic for a given seed.
+    Returns (blocks by height, transactions by hash, expected [(height, amount)]).
+    """
+    import nacl.bindings as sodium
+    blocks, txs, expected = {}, {}, []
+    counter = iter(range(10 ** 9))
+
+    def secret():
+        return _xmr_scalar(seed + next(counter).to_bytes(8, "little"))
+
+    def stranger():
+        return sodium.crypto_scalarmult_ed25519_base_noclamp(secret())
+
+    def transaction(outputs, height, coinbase=False, key_base=None):
+        r = secret()
+        vout, ecdh, out_pk = [], [], []
+        for n, (view, spend, amount) in enumerate(outputs):
+            key, tag, encrypted, commitment = _xmr_output(r, n, view, spend, amount)
+            vout.append({"amount": amount if coinbase else 0,
+                         "target": {"tagged_key": {"key": key.hex(), "view_tag": tag.hex()}}})
+            ecdh.append({"amount": encrypted.hex()})
+            out_pk.append(commitment.hex())
+        tx = {"version": 2, "unlock_time": height + 60 if coinbase else 0,
+              "vin": [{"gen": {"height": height}}] if coinbase else
+                     [{"key": {"amount": 0, "key_offsets": [1], "k_image": secret().hex()}}],
+              "vout": vout, "extra": list(b"\x01" + (sodium.crypto_scalarmult_ed25519_noclamp(r, key_base) if key_base
+                                                     else sodium.crypto_scalarmult_ed25519_base_noclamp(r))),
+              "rct_signatures": {"type": 0} if coinbase else
+                                {"type": 6, "txnFee": 30_000_000, "ecdhInfo": ecdh, "outPk": out_pk}}
+        return hashlib.sha256(json.dumps(tx, sort_keys=True).encode()).hexdigest(), tx
+
+    prev_hash, global_index, paid = "00" * 32, 0, 0
+    for height in range(start, start + count):
+        ours = (height - start) % every == 0
+        miner = (view_pub, spend_pub) if ours else (stranger(), stranger())
+        miner_hash, miner_tx = transaction([(*miner, XMR_COINBASE)], height, coinbase=True)
+        if ours:
+            expected.append((height, XMR_COINBASE))
+        hashes = []
+        for k in range(txs_per_block):
+            first, key_base = (stranger(), stranger()), None
+            if ours and k == 0:
+                first = (view_pub, spend_pub)
+                expected.append((height, XMR_AMOUNT))
+            elif ours and k == 1 and subaddresses:
+                first = subaddresses[paid % len(subaddresses)]
+                key_base, paid = first[1], paid + 1
+                expected.append((height, 2 * XMR_AMOUNT))
+            tx_hash, tx = transaction([(*first, 2 * XMR_AMOUNT if key_base else XMR_AMOUNT),
+                                       (stranger(), stranger(), 7 * XMR_AMOUNT)], height, key_base=key_base)
+            txs[tx_hash] = {"tx_hash": tx_hash, "as_json": json.dumps(tx), "block_height": height,
+                            "output_indices": [global_index, global_index + 1]}
+            global_index += 2
+            hashes.append(tx_hash)
+        block_hash = hashlib.sha256(f"{seed!r}{height}".encode()).hexdigest()
+        blocks[height] = {"block_header": {"height": height, "hash": block_hash, "prev_hash": prev_hash},
+                          "json": json.dumps({"miner_tx": miner_tx, "tx_hashes": hashes}),
+                          "miner_tx_hash": miner_hash, "tx_hashes": hashes, "status": "OK"}
+        prev_hash = block_hash
+    return blocks, txs, expected
+
+
+def monerod(delay: float = 0.0) -> MockServer:
+    """monerod RPC over a fixture chain; load one with `server.chain = monero_blocks(...)`."""
+    def handle(method, path, body):
+        blocks, txs, _ = server.chain
+        route = urlsplit(path).path
+        if route == "/get_transactions":
+            return 200, {"txs": [txs[h] for h in body["txs_hashes"] if h in txs], "status": "OK"}
+        if route != "/json_rpc":
+            return 404, {"error": f"{route} not mocked"}
+        params = body.get("params") or {}
+        if body["method"] == "get_block_count":
+            result = {"count": max(blocks, default=-1) + 1, "status": "OK"}
+        elif body["method"] == "get_block" and params.get("height") in blocks:
+            result = blocks[params["height"]]
+        else:
+            return 200, {"jsonrpc": "2.0", "id": body.get("id"), "error": {"code": -2, "message": "not mocked"}}
+        return 200, {"jsonrpc": "2.0", "id": body.get("id"), "result": result}
+
+    server = MockServer(handle, delay)
+    server.chain = ({}, {}, [])
+    return server
+
+
+# ---------- Explorer + price API ----------
+def _explorer_utxo(address: str) -> Dict[str, Any]:
+    """Every address holds one confirmed BALANCE_SATS output."""
+    return {"address": address, "txid": hashlib.sha256(address.encode()).hexdigest(), "vout": 0,
+            "value": BALANCE_SATS, "confirmations": 12, "height": 2_000_000}
+
+
+def explorer(delay: float = 0.0) -> MockServer:
+    """Price API plus the BlockCypher, Insight and Blockbook explorer flavours (batched where they batch)."""
+    def handle(method, path, body):
+        path = urlsplit(path).path
+        m = re.search(r"/prices/(\w+)-USDT/spot$", path)
+        if m:
+            return 200, {"data": {"base": m.group(1), "currency": "USDT", "amount": PRICES.get(m.group(1), "1.00")}}
+        m = re.search(r"/api/v2/address/(\w+)$", path)
+        if m:
+            return 200, {"address": m.group(1), "balance": str(BALANCE_SATS), "unconfirmedBalance": "0", "txs": 1}
+        m = re.search(r"/api/v2/utxo/(\w+)$", path)
+        if m:
+            u = _explorer_utxo(m.group(1))
+            return 200, [{"txid": u["txid"], "vout": 0, "value": str(BALANCE_SATS), "height": u["height"],
+                          "confirmations": u["confirmations"]}]
+        m = re.search(r"/addrs/([\w,]+)/utxo$", path)
+        if m:
+            return 200, [{"address": u["address"], "txid": u["txid"], "vout": 0, "satoshis": BALANCE_SATS,
+                          "height": u["height"], "confirmations": u["confirmations"]}
+                         for u in map(_explorer_utxo, m.group(1).split(","))]
+        m = re.search(r"/addrs/([\w;]+)(/balance)?$", path)
+        if m:
+            entries = []
+            for u in map(_explorer_utxo, m.group(1).split(";")):
+                entry = {"address": u["address"], "balance": BALANCE_SATS, "final_balance": BALANCE_SATS}
+                if not m.group(2):
+                    entry["txrefs"] = [{"tx_hash": u["txid"], "tx_output_n": 0, "value": BALANCE_SATS,
+                                        "confirmations": u["confirmations"], "block_height": u["height"]}]
+                entries.append(entry)
+            return 200, entries if len(entries) > 1 else entries[0]
+        return 404, {"error": f"{path} not mocked"}
+    return MockServer(handle, delay)
+
+
+class RedirectAdapter(HTTPAdapter):
+    """Transport adapter that swaps scheme://host of every request for a mock's base URL."""
+
+    def __init__(self, target: str):
+        super().__init__()
+        self.target = target.rstrip("/")
+
+    def send(self, request, **kwargs):
+        parts = urlsplit(request.url)
+        request.url = self.target + parts.path + (f"?{parts.query}" if parts.query else "")
+        return super().send(request, **kwargs)
+
+
+def redirect(session, host: str, target: str):
+    session.mount(f"https://{host}", RedirectAdapter(target))
+
+
+# ---------- SDK stubs ----------
+def _utxo(address: str) -> Dict[str, Any]:
+    return {
+        "address": address, "txid": os.urandom(32).hex(), "confirmations": 12, "output_n": 0, "input_n": 0,
+        "index": 0, "block_height": 840_000, "fee": None, "size": 0, "value": BALANCE_SATS, "script": "",
+        "date": datetime.now(timezone.utc),
+    }
+
+
+def stub_bitcoinlib(delay: float = 0.0):
+    """Answer bitcoinlib Service calls locally (a fresh UTXO per address lookup)."""
+    from bitcoinlib.services.services import Service
+    from bitcoinlib.transactions import Transaction
+
+    def _provider_execute(self, method, *args):
+        if delay:
+            time.sleep(delay)
+        self.results = {"bench": True}
+        if method == "getutxos":
+            return [_utxo(args[0])]
+        if method == "getbalance":
+            return BALANCE_SATS
+        if method == "gettransactions":
+            return []
+        if method == "gettransaction":
+            return Transaction(network=self.network, txid=args[0], block_height=840_000, confirmations=13,
+                               status="confirmed")
+        if method == "blockcount":
+            return 840_012
+        if method == "estimatefee":
+            return 10_000
+        if method == "sendrawtransaction":
+            return {"txid": hashlib.sha256(bytes.fromhex(args[0])).hexdigest(), "response_dict": {}}
+        raise NotImplementedError(f"bitcoinlib stub: {method}")
+
+    Service._provider_execute = _provider_execute
+
+
+def stub_bitcash(delay: float = 0.0):
+    from bitcash.network import NetworkAPI
+    from bitcash.network.meta import Unspent
+    from bitcash.format import address_to_public_key_hash
+    from bitcash.op import OpCodes
+
+    def get_unspent(cls, address, *args, **kwargs):
+        if delay:
+            time.sleep(delay)
+        script = (OpCodes.OP_DUP.binary + OpCodes.OP_HASH160.binary + b"\x14" + address_to_public_key_hash(address)
+                  + OpCodes.OP_EQUALVERIFY.binary + OpCodes.OP_CHECKSIG.binary).hex()
+        return [Unspent(BALANCE_SATS // 4, 12, script, os.urandom(32).hex(), i) for i in range(4)]
+
+    def broadcast_tx(cls, tx_hex, *args, **kwargs):
+        if delay:
+            time.sleep(delay)
+
+    NetworkAPI.get_unspent = classmethod(get_unspent)
+    NetworkAPI.broadcast_tx = classmethod(broadcast_tx)
@@ -0,0 +1,427 @@
+"""
+Benchmark suite for the wallet scripts.
+- Runs each script's operations (create / view / receive / send, plus the
+  extra network paths such as TRC20 balance) in-process against the local
+  backends in bench/mocks.py: no network, no funds, reproducible answers
+- Every round starts from empty wallets in a fresh temp directory with a cold
+  HTTP cache; prompts are answered from a script, output is captured
+- Reports p50 / p95 / p99 latency and throughput per operation, compares
+  them with bench/baseline.json and writes a plain-text copy to
+  bench_output.txt
+
+    python3 bench/run.py                         # 10 rounds, every script
+    python3 bench/run.py --rounds 30 --only btc,eth
+    python3 bench/run.py --latency 0.02          # 20 ms per mocked backend call
+    python3 bench/run.py --save-baseline         # record the current numbers
+
+Exits 1 when an operation fails or its p50 regresses by more than --threshold.
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Union
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+SCRIPTS_DIR = os.path.join(ROOT_DIR, "scripts")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+REPORT_PATH = os.path.join(ROOT_DIR, "bench_output.txt")
+
+DEFAULT_ROUNDS = 10
+XMR_FIXTURE_BLOCKS = 100  # blocks the xmr sync op scans per round
+TRC20_PAYOUTS = 20  # rows in the usdt batch payout op
+DEFAULT_THRESHOLD = 0.25  # p50 slower than baseline by more than this fraction = regression
+FAILURE_MARKERS = ("❌", "Error", "Failed", "unavailable", "Invalid")
+
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, SCRIPTS_DIR)
+
+import mocks  # noqa: E402
+
+
+# ---------- Scenarios ----------
+class Op(NamedTuple):
+    name: str
+    func: Union[str, Callable[[Any], Any]]  # script function name, or callable(module)
+    answers: Callable[[], List[str]] = list  # prompt answers, built fresh each round
+    setup: Optional[Callable[[Any], None]] = None  # untimed, runs right before the op
+
+
+def _btc_address(network: str) -> Callable[[], str]:
+    def make():
+        from bitcoinlib.keys import Key
+        return Key(network=network).address()
+    return make
+
+
+def _evm_address() -> str:
+    from eth_account import Account
+    return Account.create().address
+
+
+def _tron_address() -> str:
+    from tronpy.keys import PrivateKey
+    return PrivateKey.random().public_key.to_base58check_address()
+
+
+def _sol_address() -> str:
+    from solders.keypair import Keypair
+    return str(Keypair().pubkey())
+
+
+def _bch_address() -> str:
+    from bitcash import Key
+    return Key().address
+
+
+def _fund_bitcoinlib(module):
+    # bitcoinlib spends from its local UTXO table; pull the mocked UTXOs in first
+    from bitcoinlib.wallets import Wallet
+    Wallet(module.WALLET_NAME, db_uri=f"sqlite:///{module.DB_PATH}").utxos_update()
+
+
+def _trc20_balance(module):
+    return module.get_trc20_usdt_balance(module.load_wallet()["tron"]["address"])
+
+
+def _trc20_payouts(module):
+    with open("payouts.csv", "w") as f:
+        f.writelines(f"{_tron_address()},1.5\n" for _ in range(TRC20_PAYOUTS))
+
+
+def _utxo_ops(coin: str, network: str, amount: str, fee: str) -> List[Op]:
+    to = _btc_address(network)
+    return [
+        Op("create", "create_wallet"),
+        Op("view", "view_wallet"),
+        Op("receive", f"receive_{coin}", lambda: ["2"]),
+        Op("send", f"send_{coin}", lambda: [to(), amount, fee], _fund_bitcoinlib),
+    ]
+
+
+def _evm_ops(coin: str, amount: str, fee: str) -> List[Op]:
+    return [
+        Op("create", "create_wallet"),
+        Op("view", "view_wallet"),
+        Op("receive", f"receive_{coin}"),
+        Op("send", f"send_{coin}", lambda: [_evm_address(), amount, fee]),
+    ]
+
+
+def _xmr_chain(module):
+    """A fresh fixture chain paying this round's wallet and subaddresses (untimed); the sync op scans it."""
+    import xmr_subaddress
+    from monero.address import address
+    with open(module.INFO_PATH) as f:
+        addr = address(json.load(f)["address"])
+    subaddresses = tuple((bytes.fromhex(sub.view_key()), bytes.fromhex(sub.spend_key()))
+                         for sub in map(address, [row[2] for row in xmr_subaddress.load()[:100]]))
+    _backends.monerod.chain = mocks.monero_blocks(bytes.fromhex(addr.view_key()), bytes.fromhex(addr.spend_key()),
+                                                  0, XMR_FIXTURE_BLOCKS, subaddresses=subaddresses)
+
+
+def _offline_ops(coin: str) -> List[Op]:
+    return [Op("create", "create_wallet"), Op("view", "view_wallet"), Op("receive", f"receive_{coin}")]
+
+
+SCENARIOS: Dict[str, List[Op]] = {
+    "btc": _utxo_ops("btc", "bitcoin", "0.001", "500"),
+    "ltc": _utxo_ops("ltc", "litecoin", "0.01", "0.01"),
+    "doge": _utxo_ops("doge", "dogecoin", "5", "0.05"),
+    "bch": [
+        Op("create", "create_wallet"),
+        Op("view", "view_wallet"),
+        Op("receive", "receive_bch"),
+        Op("send", "send_bch", lambda: [_bch_address(), "0.001", ""]),
+    ],
+    "eth": _evm_ops("eth", "0.01", "1"),
+    "bnb": _evm_ops("bnb", "0.01", "0.5"),
+    "pol": _evm_ops("matic", "0.5", "30"),
+    "usdt": [
+        Op("create", "create_wallet"),
+        Op("view", "view_wallet"),
+        Op("receive", "receive_usdt", lambda: ["2"]),
+        Op("trc20-balance", _trc20_balance),
+        Op("send-erc20", "send_usdt", lambda: ["1", _evm_address(), "5", "20"]),
+        Op("send-trc20", "send_usdt", lambda: ["2", _tron_address(), "5"]),
+        Op("send-trc20-batch", "send_usdt", lambda: ["3", "payouts.csv"], _trc20_payouts),
+    ],
+    "sol": [
+        Op("create", "create_wallet"),
+        Op("view", "view_wallet"),
+        Op("receive", "receive_sol"),
+        Op("send", "send_sol", lambda: [_sol_address(), "0.01"]),
+    ],
+    "dash": _offline_ops("dash"),
+    "zec": _offline_ops("zec"),
+    "xmr": _offline_ops("xmr") + [
+        Op("subaddresses", "generate_subaddresses", lambda: ["0", "1000"]),
+        Op("sync", "sync_wallet", setup=_xmr_chain),
+    ],
+    "ada-atom": [
+        Op("create", "create_wallet"),
+        Op("view", "view_wallet"),
+        Op("receive", "receive_cli", lambda: ["ATOM", "1"]),
+    ],
+}
+
+
+# ---------- Environment ----------
+class Backends(NamedTuple):
+    evm: mocks.MockServer
+    solana: mocks.MockServer
+    tron: mocks.MockServer
+    explorer: mocks.MockServer
+    monerod: mocks.MockServer
+
+
+_backends: Optional[Backends] = None
+
+
+def start_backends(latency: float, cache_dir: str) -> Backends:
+    global _backends
+    backends = _backends = Backends(mocks.evm(latency), mocks.solana(latency), mocks.tron(latency),
+                                    mocks.explorer(latency), mocks.monerod(latency))
+    # must be in place before the scripts import rpc_router / http_cache
+    for chain in ("ETH", "BSC", "POLYGON"):
+        os.environ[f"HIDERAX_RPC_{chain}"] = backends.evm.url
+    os.environ["HIDERAX_RPC_SOL"] = backends.solana.url
+    os.environ["HIDERAX_RPC_DASH"] = backends.explorer.url
+    os.environ["HIDERAX_RPC_ZEC"] = backends.explorer.url
+    os.environ["HIDERAX_RPC_XMR"] = backends.monerod.url
+    os.environ["HIDERAX_CACHE_DIR"] = cache_dir
+    os.environ["HIDERAX_SEND_DB"] = os.path.join(cache_dir, "send_queue.db")  # sends are tracked
+    os.environ.pop("HIDERAX_RPC_CONFIG", None)
+
+    import net
+    import rate_limit
+    for host in ("api.coinbase.com", "api.blockcypher.com"):
+        mocks.redirect(net.session, host, backends.explorer.url)
+    for server in backends:
+        rate_limit.set_quota(server.host, 1e6, 10 ** 6)  # measure the scripts, not the token buckets
+    for host in ("api.coinbase.com", "api.blockcypher.com", "api.trongrid.io"):
+        rate_limit.set_quota(host, 1e6, 10 ** 6)
+
+    mocks.stub_bitcoinlib(latency)
+    mocks.stub_bitcash(latency)
+    return backends
+
+
+def load_script(name: str, backends: Backends):
+    path = os.path.join(SCRIPTS_DIR, f"{name}.py")
+    spec = importlib.util.spec_from_file_location(name.replace("-", "_"), path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(module)
+    if name == "usdt":
+        mocks.redirect(module.tron.provider.sess, "api.trongrid.io", backends.tron.url)
+    return module
+
+
+@contextlib.contextmanager
+def scripted_prompts(answers: List[str]):
+    from rich.prompt import PromptBase
+    original = PromptBase.__dict__["ask"]
+    queue = list(answers)
+
+    def ask(cls, prompt="", *args, default=..., **kwargs):
+        if queue:
+            return queue.pop(0)
+        if default is not ...:
+            return default
+        raise RuntimeError(f"no scripted answer for prompt {prompt!r}")
+
+    PromptBase.ask = classmethod(ask)
+    try:
+        yield
+    finally:
+        PromptBase.ask = original
+
+
+def run_op(module, op: Op) -> tuple:
+    """Returns (seconds, error or None)."""
+    from rich.console import Console
+    out = io.StringIO()
+    module.console = Console(file=out, width=120, color_system=None)
+    if op.setup:
+        op.setup(module)
+    answers = op.answers()
+    call = getattr(module, op.func) if isinstance(op.func, str) else (lambda: op.func(module))
+
+    error = None
+    with scripted_prompts(answers), contextlib.redirect_stdout(out):
+        start = time.perf_counter()
+        try:
+            call()
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        elapsed = time.perf_counter() - start
+    if error is None:
+        for line in out.getvalue().splitlines():
+            if any(marker in line for marker in FAILURE_MARKERS):
+                error = line.strip()
+                break
+    return elapsed, error
+
+
+def run_round(modules: Dict[str, Any], samples: Dict[str, List[float]], errors: Dict[str, str]):
+    import hd_evm
+    import http_cache
+    workdir = tempfile.mkdtemp(prefix="hiderax-bench-")
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    http_cache.clear()
+    # these keep their files next to the scripts rather than in the working directory
+    hd_evm.SEED_DIR = os.path.join(workdir, "wallet_EVM")
+    hd_evm.SEED_PATH = os.path.join(hd_evm.SEED_DIR, "hd_seed.json")
+    try:
+        for name, module in modules.items():
+            if name == "usdt":
+                module.WALLET_DIR = os.path.join(workdir, "wallet_USDT")
+                module.WALLET_FILE = os.path.join(module.WALLET_DIR, "wallet_info.json")
+            for op in SCENARIOS[name]:
+                key = f"{name}.{op.name}"
+                elapsed, error = run_op(module, op)
+                samples.setdefault(key, []).append(elapsed)
+                if error and key not in errors:
+                    errors[key] = error
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ---------- Report ----------
+def percentile(values: Sequence[float], pct: float) -> float:
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+
+def summarize(samples: Dict[str, List[float]]) -> Dict[str, Dict[str, float]]:
+    return {
+        key: {
+            "p50_ms": round(percentile(values, 50) * 1000, 3),
+            "p95_ms": round(percentile(values, 95) * 1000, 3),
+            "p99_ms": round(percentile(values, 99) * 1000, 3),
+            "ops_per_s": round(len(values) / sum(values), 2) if sum(values) else 0.0,
+            "n": len(values),
+        }
+        for key, values in samples.items()
+    }
+
+
+def load_baseline() -> Dict[str, Dict[str, float]]:
+    try:
+        with open(BASELINE_PATH) as f:
+            return json.load(f).get("ops", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def render(summary, baseline, errors, threshold: float, title: str):
+    from rich.table import Table
+    table = Table(title=title, header_style="bold magenta")
+    for col in ("Operation", "p50 ms", "p95 ms", "p99 ms", "ops/s", "vs baseline p50", "Status"):
+        left = col in ("Operation", "Status")
+        table.add_column(col, justify="left" if left else "right", no_wrap=col == "Operation")
+
+    regressions = []
+    for key, stats in summary.items():
+        base = baseline.get(key)
+        delta = ""
+        status = "[green]ok[/green]"
+        if base and base.get("p50_ms"):
+            change = stats["p50_ms"] / base["p50_ms"] - 1
+            delta = f"{change:+.0%}"
+            if change > threshold:
+                regressions.append(key)
+                status = "[yellow]regressed[/yellow]"
+                delta = f"[yellow]{delta}[/yellow]"
+        if key in errors:
+            status = "[red]failed[/red]"
+        table.add_row(key, f"{stats['p50_ms']:,.2f}", f"{stats['p95_ms']:,.2f}", f"{stats['p99_ms']:,.2f}",
+                      f"{stats['ops_per_s']:,.1f}", delta or "-", status)
+    return table, regressions
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the wallet scripts against local mock backends.")
+    parser.add_argument("--rounds", type=int, default=DEFAULT_ROUNDS)
+    parser.add_argument("--only", default="", help="comma-separated scripts, e.g. btc,eth,usdt")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every mocked backend call")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="p50 slowdown vs baseline flagged as a regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    from rich.console import Console
+    console = Console()
+    names = [n.strip() for n in args.only.split(",") if n.strip()] or list(SCENARIOS)
+    unknown = [n for n in names if n not in SCENARIOS]
+    if unknown:
+        console.print(f"[red]❌ Unknown script(s): {', '.join(unknown)}. Choose from {', '.join(SCENARIOS)}[/red]")
+        return 2
+
+    cache_dir = tempfile.mkdtemp(prefix="hiderax-bench-cache-")
+    backends = start_backends(args.latency, cache_dir)
+    started = time.perf_counter()
+    try:
+        modules = {}
+        for name in names:
+            start = time.perf_counter()
+            modules[name] = load_script(name, backends)
+            console.print(f"[dim]loaded {name}.py in {(time.perf_counter() - start) * 1000:,.0f} ms[/dim]")
+
+        samples: Dict[str, List[float]] = {}
+        errors: Dict[str, str] = {}
+        for i in range(args.rounds):
+            run_round(modules, samples, errors)
+            console.print(f"[dim]round {i + 1}/{args.rounds} done[/dim]")
+    finally:
+        for server in backends:
+            server.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    wall = time.perf_counter() - started
+
+    summary = summarize(samples)
+    baseline = {} if args.save_baseline else load_baseline()
+    title = (f"⏱ HideraX benchmark: {args.rounds} rounds, {args.latency * 1000:g} ms mock latency, "
+             f"{sum(s['n'] for s in summary.values())} ops in {wall:,.1f}s")
+    table, regressions = render(summary, baseline, errors, args.threshold, title)
+    console.print(table)
+    for key, error in errors.items():
+        console.print(f"[red]❌ {key}:[/red] {error}")
+    for key in regressions:
+        console.print(f"[yellow]⚠️ {key}: p50 {summary[key]['p50_ms']:.2f} ms vs "
+                      f"baseline {baseline[key]['p50_ms']:.2f} ms[/yellow]")
+
+    with open(REPORT_PATH, "w") as f:
+        report = Console(file=f, width=120, color_system=None)
+        report.print(table)
+        for key, error in errors.items():
+            report.print(f"FAILED {key}: {error}")
+        for key in regressions:
+            report.print(f"REGRESSED {key}")
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump({
+                "meta": {"rounds": args.rounds, "latency": args.latency, "python": platform.python_version(),
+                         "machine": platform.machine(), "created": time.strftime("%Y-%m-%dT%H:%M:%S")},
+                "ops": summary,
+            }, f, indent=2)
+        console.print(f"[green]✅ Baseline saved to {os.path.relpath(BASELINE_PATH, ROOT_DIR)}[/green]")
+
+    return 1 if errors or regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,16 @@
+import contextlib
+import io
 import os
 import platform
-import shutil
 import sys
+from functools import lru_cache
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.resolve() / "scripts"))
+import profiler  # --profile / HIDERAX_PROFILE=1, inherited by every wallet script
+import balances
+import registry
+
 from rgbprint import gradient_print
 from rich.console import Console
 from rich.panel import Panel
@@ -29,8 +36,10 @@ logo = """
 """
 
 
-def clear_console():
-    os.system('cls' if os.name == 'nt' else 'clear')
+CLEAR = "\033[H\033[2J\033[3J"  # cursor home, clear screen, clear scrollback
+
+if os.name == "nt":
+    os.system("")  # switches the Windows console into ANSI escape mode
 
 
 def execute_script(script_name):
@@ -43,65 +52,71 @@ def execute_script(script_name):
 
     try:
         command = f'py -3 "{full_path}"' if platform.system() == "Windows" else f'python3 "{full_path}"'
-        os.system(command)
+        with profiler.span(f"run:{script_name}"):
+            os.system(command)
     except Exception as e:
         console.print(f"[bold red]✖ Execution failed:[/bold red] {e}")
 
 
-def print_banner():
-    term_width = shutil.get_terminal_size().columns
+# Menu output is rendered to ANSI strings once per terminal width (and, for the
+# table, per set of balance cells); redrawing the menu is then one write.
+@lru_cache(maxsize=8)
+def render_banner(width):
     lines = logo.strip("\n").splitlines()
-    centered_logo = "\n".join(line.center(term_width) for line in lines)
-    gradient_print(centered_logo, start_color="#8e44ad", end_color="#1abc9c")
-
-
-def print_menu(script_map):
-    clear_console()
-    print()
-    print_banner()
-    console.print("[bold white]Powered by [bold magenta]Hiderox Technologies[/bold magenta][/bold white]",
-                  justify="center")
-    console.print("[bold blue underline]www.hiderox.com[/bold blue underline]\n", justify="center")
-    console.print(Panel.fit(
-        "[bold cyan]🚀 Multi-Crypto Wallet Manager[/bold cyan]",
-        subtitle="Secure • Flexible • Fast",
-        style="bold blue",
-        padding=(1, 4)
-    ))
-
+    centered_logo = "\n".join(line.center(width) for line in lines)
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):  # rgbprint only prints to stdout
+        gradient_print(centered_logo, start_color="#8e44ad", end_color="#1abc9c")
+    return out.getvalue()
+
+
+@lru_cache(maxsize=8)
+def render_header(width):
+    with console.capture() as capture:
+        console.print("[bold white]Powered by [bold magenta]Hiderox Technologies[/bold magenta][/bold white]",
+                      justify="center")
+        console.print("[bold blue underline]www.hiderox.com[/bold blue underline]\n", justify="center")
+        console.print(Panel.fit(
+            "[bold cyan]🚀 Multi-Crypto Wallet Manager[/bold cyan]",
+            subtitle="Secure • Flexible • Fast",
+            style="bold blue",
+            padding=(1, 4)
+        ))
+    return "\n" + render_banner(width) + capture.get()
+
+
+@lru_cache(maxsize=32)
+def render_table(width, rows):
     table = Table(title="Select Wallet Option", box=box.SIMPLE, title_style="bold magenta")
     table.add_column("Option", justify="center", style="bold yellow")
     table.add_column("Wallet", style="bold white")
     table.add_column("Network Info", style="dim")
+    table.add_column("Balance")
 
-    for key, info in sorted(script_map.items(), key=lambda x: x[1]["name"].lower()):
-        table.add_row(key, info["name"], info["network"])
+    for row in rows:
+        table.add_row(*row)
 
-    table.add_row("0", "[bold red]Exit[/bold red]", "Leave application")
-    console.print(table)
+    table.add_row("0", "[bold red]Exit[/bold red]", "Leave application", "")
+    with console.capture() as capture:
+        console.print(table)
+    return capture.get()
+
+
+def print_menu(script_map):
+    width = console.width
+    rows = tuple((key, info["name"], info["network"], balances.describe(info["script"]))
+                 for key, info in sorted(script_map.items(), key=lambda x: x[1]["name"].lower()))
+    sys.stdout.write(CLEAR + render_header(width) + render_table(width, rows))
+    sys.stdout.flush()
 
 
 def main():
-    # Unified wallet mapping
-    script_map = {
-        "1": {"name": "ADA Wallet", "network": "Cardano [Receive-Only]", "script": "ada-atom.py"},
-        "2": {"name": "ATOM Wallet", "network": "Cosmos [Receive-Only]", "script": "ada-atom.py"},
-        "3": {"name": "BCH Wallet", "network": "Bitcoin Cash Network", "script": "bch.py"},
-        "4": {"name": "BNB Wallet", "network": "Binance Smart Chain", "script": "bnb.py"},
-        "5": {"name": "BTC Wallet", "network": "Bitcoin Network", "script": "btc.py"},
-        "6": {"name": "DASH Wallet", "network": "Dash [Receive-Only]", "script": "dash.py"},
-        "7": {"name": "DOGE Wallet", "network": "Dogecoin Network", "script": "doge.py"},
-        "8": {"name": "ETH Wallet", "network": "Ethereum Network", "script": "eth.py"},
-        "9": {"name": "LTC Wallet", "network": "Litecoin Network", "script": "ltc.py"},
-        "10": {"name": "POL Wallet", "network": "Polygon Network", "script": "pol.py"},
-        "11": {"name": "SOL Wallet", "network": "Solana [Receive-Only]", "script": "sol.py"},
-        "12": {"name": "USDT Wallet", "network": "[TRC20] | [ERC20]", "script": "usdt.py"},
-        "13": {"name": "XMR Wallet", "network": "Monero [Receive-Only • Linux]", "script": "xmr.py"},
-        "14": {"name": "ZEC Wallet", "network": "Zcash [Receive-Only]", "script": "zec.py"},
-    }
+    script_map = registry.WALLETS
+
+    # cached balances for the menu, kept fresh in the background
+    balances.start(info["script"] for info in script_map.values())
 
     while True:
-        clear_console()
         print_menu(script_map)
 
         choice = Prompt.ask(
@@ -110,15 +125,16 @@ def main():
             default="0"
         )
 
-        if choice == "0":
+        if choice == registry.EXIT_KEY:
             console.print("\n[bold green]✓ Exiting wallet manager. Have a great day![/bold green]\n")
             sys.exit(0)
         elif choice in script_map:
-            # XMR restriction
-            if script_map[choice]["name"].startswith("XMR") and platform.system() != "Linux":
-                console.print("[bold red]✖ XMR support is currently available for Linux only.[/bold red]")
+            reason = registry.unsupported(script_map[choice])
+            if reason:
+                console.print(f"[bold red]✖ {reason}[/bold red]")
             else:
                 execute_script(script_map[choice]["script"])
+                balances.invalidate(script_map[choice]["script"])  # it may have sent funds
         else:
             console.print("[bold red]✖ Invalid option selected.[/bold red]")
 
@@ -126,5 +142,8 @@ def main():
         input()
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main()
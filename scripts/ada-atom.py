@@ -20,6 +20,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.prompt import Prompt
 
+import profiler
+
 # Paths
 WALLET_DIR = "wallet_Staking"
 INFO_PATH = os.path.join(WALLET_DIR, "wallet_info.json")
@@ -314,5 +316,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
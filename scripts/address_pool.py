@@ -0,0 +1,220 @@
+"""
+Pools of pre-derived deposit addresses, one per HD wallet (BTC, LTC, DOGE, EVM, ATOM, ADA).
+- Each pool keeps up to POOL_SIZE unused addresses derived ahead of time;
+  take() hands the next one out under a lock without deriving anything
+- Once a pool drops below LOW_WATER a background thread derives the shortfall
+- State lives in the wallet's own directory: the unused addresses plus the next
+  index in address_pool_<key>.json (rewritten atomically, bounded by POOL_SIZE),
+  and every address handed out appended to address_pool_<key>_used.jsonl.
+  The used log is written first, so after a crash an address is never handed
+  out twice
+- BTC/LTC/DOGE addresses are created through bitcoinlib (key_for_path), so they
+  are in the wallet database and the wallet sees deposits to them; the others
+  come from watch_only's public-key derivation
+- Pools start after the addresses the wallet scripts already show (EVM index 0,
+  ada-atom.py's first entries, bitcoinlib's existing receive keys)
+- A failed derivation is kept as the pool's error: take() on an empty pool
+  raises it instead of waiting for addresses that are not coming
+
+`python3 address_pool.py [take <key> [label] | fill]` prints pool stats or hands out an address.
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import hd_evm
+import watch_only
+
+POOL_SIZE = int(os.environ.get("HIDERAX_POOL_SIZE", "100"))
+LOW_WATER = int(os.environ.get("HIDERAX_POOL_LOW_WATER", "25"))
+
+_pools: Dict[str, "AddressPool"] = {}
+_pools_lock = threading.Lock()
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_used(path: str) -> List[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+
+
+class AddressPool:
+    def __init__(self, key: str, wallet_dir: str, derive: Callable[[List[int]], List[str]], first_index: int,
+                 size: int = POOL_SIZE, low_water: int = LOW_WATER):
+        self.key = key
+        self.size = size
+        self.low_water = low_water
+        self.state_path = os.path.join(wallet_dir, f"address_pool_{key.lower()}.json")
+        self.used_path = os.path.join(wallet_dir, f"address_pool_{key.lower()}_used.jsonl")
+        self._derive = derive
+        self._lock = threading.Lock()
+        self._refill_lock = threading.Lock()  # one derivation batch at a time
+        self._refilling: Optional[threading.Thread] = None
+        self.error: Optional[Exception] = None  # of the last refill, None once one succeeds
+
+        state = _read_json(self.state_path) or {"next_index": first_index, "unused": []}
+        issued = {entry["address"] for entry in _read_used(self.used_path)}
+        self.next_index: int = state["next_index"]
+        self.unused = deque(e for e in state["unused"] if e[1] not in issued)  # [index, address]
+        self.used_count = len(issued)
+
+    # ---------- Store ----------
+    def _save(self):
+        tmp = self.state_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"next_index": self.next_index, "unused": list(self.unused)}, f)
+        os.replace(tmp, self.state_path)
+
+    # ---------- Handout ----------
+    def take(self, label: str = "") -> Dict[str, Any]:
+        """Hand out the next unused address and record it as used."""
+        while True:
+            with self._lock:
+                if self.unused:
+                    index, address = self.unused.popleft()
+                    entry = {"index": index, "address": address, "label": label, "issued": time.time()}
+                    with open(self.used_path, "a") as f:
+                        f.write(json.dumps(entry) + "\n")
+                    self.used_count += 1
+                    self._save()
+                    low = len(self.unused) < self.low_water
+                    break
+            self.refill(wait=True)  # drained faster than the refill could keep up
+            with self._lock:
+                if not self.unused and self.error is not None:
+                    raise self.error
+        if low:
+            self.refill()
+        return entry
+
+    # ---------- Replenishment ----------
+    def _fill(self):
+        """Derive the pool back up to its size; the handout lock is not held while deriving."""
+        with self._refill_lock:
+            with self._lock:
+                count = self.size - len(self.unused)
+                indexes = list(range(self.next_index, self.next_index + count))
+            if not indexes:
+                return
+            try:
+                addresses = self._derive(indexes)
+            except Exception as e:
+                with self._lock:
+                    self.error = e
+                return
+            with self._lock:
+                self.unused.extend([i, a] for i, a in zip(indexes, addresses))
+                self.next_index = indexes[-1] + 1
+                self.error = None
+                self._save()
+
+    def refill(self, wait: bool = False) -> threading.Thread:
+        """Top the pool up in the background (one refill thread at a time)."""
+        with self._lock:
+            if self._refilling is None or not self._refilling.is_alive():
+                self._refilling = threading.Thread(target=self._fill, name=f"pool-{self.key}", daemon=True)
+                self._refilling.start()
+            thread = self._refilling
+        if wait:
+            thread.join()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            refilling = self._refilling is not None and self._refilling.is_alive()
+            return {"key": self.key, "unused": len(self.unused), "used": self.used_count,
+                    "next_index": self.next_index, "refilling": refilling,
+                    "error": str(self.error) if self.error else ""}
+
+
+# ---------- Per-wallet setup ----------
+def _bitcoinlib_pool(key: str) -> AddressPool:
+    from bitcoinlib.wallets import Wallet
+    module = importlib.import_module(watch_only.UTXO_WALLETS[key][0])
+    if not module.wallet_exists():
+        raise FileNotFoundError(f"{key} wallet not found. Create it first.")
+    db_uri = f"sqlite:///{module.DB_PATH}"
+    shown = [k.address_index for k in Wallet(module.WALLET_NAME, db_uri=db_uri).keys(change=0, depth=5)]
+
+    def derive(indexes: List[int]) -> List[str]:
+        wallet = Wallet(module.WALLET_NAME, db_uri=db_uri)  # own session: this runs on the refill thread
+        return [wallet.key_for_path([0, i]).address for i in indexes]
+
+    return AddressPool(key, module.WALLET_DIR, derive, max(shown, default=-1) + 1)
+
+
+def _public_pool(key: str) -> AddressPool:
+    entry = watch_only.account_key(key)
+    if entry is None:
+        raise FileNotFoundError(f"{key} wallet not found. Create it first.")
+    address_at = watch_only.deriver(key, entry)
+    if key == "EVM":
+        wallet_dir, first_index = hd_evm.SEED_DIR, 1  # index 0 is the ETH/BNB/POL wallet address
+    else:
+        staking = importlib.import_module("ada-atom")
+        wallet_dir = staking.WALLET_DIR
+        first_index = len(staking.safe_load_json(staking.INFO_PATH).get("chains", {}).get(key, []))
+    return AddressPool(key, wallet_dir, lambda indexes: [address_at(i) for i in indexes], first_index)
+
+
+def get_pool(key: str) -> AddressPool:
+    """Process-wide pool for a wallet key (see watch_only.KEYS); starts a refill if it is low."""
+    key = key.upper()
+    if key not in watch_only.KEYS:
+        raise ValueError(f"Unknown pool: {key}. Choose from {', '.join(watch_only.KEYS)}.")
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = _bitcoinlib_pool(key) if key in watch_only.UTXO_WALLETS else _public_pool(key)
+    if len(pool.unused) < pool.low_water:
+        pool.refill()
+    return pool
+
+
+def start(keys=watch_only.KEYS) -> Dict[str, AddressPool]:
+    """Open (and start filling) the pools of every wallet that exists locally."""
+    pools = {}
+    for key in keys:
+        try:
+            pools[key] = get_pool(key)
+        except FileNotFoundError:
+            continue
+    return pools
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    if len(sys.argv) > 2 and sys.argv[1] == "take":
+        entry = get_pool(sys.argv[2]).take(sys.argv[3] if len(sys.argv) > 3 else "")
+        console.print(f"[bold cyan]{sys.argv[2].upper()} #{entry['index']}:[/bold cyan] [green]{entry['address']}[/green]")
+        sys.exit(0)
+
+    pools = start()
+    if len(sys.argv) > 1 and sys.argv[1] == "fill":
+        for pool in pools.values():
+            pool.refill(wait=True)
+    table = Table(title="🏦 Address pools", header_style="bold magenta")
+    for column in ("Key", "Unused", "Used", "Next index", "Refilling"):
+        table.add_column(column, style="cyan" if column == "Key" else None, justify="left" if column == "Key" else "right")
+    for pool in pools.values():
+        s = pool.stats()
+        table.add_row(s["key"], str(s["unused"]), str(s["used"]), str(s["next_index"]), "yes" if s["refilling"] else "")
+    console.print(table)
@@ -0,0 +1,431 @@
+"""
+Local HTTP/JSON API over the wallet scripts.
+- asyncio server on 127.0.0.1:PORT (HIDERAX_API_PORT, default 8765) with
+  HTTP/1.1 keep-alive, so a backend can reuse one connection for many calls
+- Wallet work is blocking (bitcoinlib, web3, requests), so it runs on a pool
+  of CONCURRENCY threads (HIDERAX_API_CONCURRENCY, default 32); at most
+  MAX_PENDING requests wait for a thread, anything beyond that gets 503
+- Chain scripts are imported once at startup and stay warm: their RPC routers,
+  http_cache and net's pooled session (sized to CONCURRENCY) serve every
+  request. Concurrent balance lookups of one wallet share a single refresh
+- Deposit addresses come from address_pool; balances from the balances store
+- Sends are queued in send_queue (idempotent via an Idempotency-Key header
+  or "idempotency_key" field) and the request waits up to SEND_WAIT for the
+  broadcast; tracker follows it to confirmation and fee_bump speeds it up
+  when it is stuck. Sends are refused unless
+  HIDERAX_API_TOKEN is set and sent as "Authorization: Bearer <token>"
+
+Routes (chain: btc ltc doge bch eth bnb pol sol usdt dash zec xmr atom ada):
+  GET  /health, /chains
+  POST /wallets/<chain>                create the wallet
+  POST /wallets/<chain>/addresses      {"label"}: fresh deposit address, or the wallet address
+  GET  /wallets/<chain>/balance        ?max_age=<seconds> (default: balances.MAX_AGE)
+  POST /wallets/<chain>/send           {"to", "amount", "fee"}: fee in sat/vB (UTXO) or gwei (EVM)
+  GET  /sends/<job id>                 job status (queued, signed, broadcast, confirmed, failed), confirmations
+  GET  /wallets/<chain>/history        BTC / LTC / DOGE wallet transactions
+
+`python3 api.py` starts the server.
+"""
+import asyncio
+import contextlib
+import hmac
+import importlib
+import io
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+from http import HTTPStatus
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from requests.adapters import HTTPAdapter
+
+import address_pool
+import balances
+import fee_bump
+import metrics
+import net
+import send_queue
+import tracker
+import watch_only
+
+HOST = "127.0.0.1"
+PORT = int(os.environ.get("HIDERAX_API_PORT", "8765"))
+TOKEN = os.environ.get("HIDERAX_API_TOKEN", "")
+CONCURRENCY = int(os.environ.get("HIDERAX_API_CONCURRENCY", "32"))
+MAX_PENDING = 4 * CONCURRENCY  # requests allowed to wait for a worker thread
+MAX_BODY = 64 * 1024
+IDLE_TIMEOUT = 30.0  # seconds a keep-alive connection may sit idle
+SEND_WAIT = 30.0  # seconds a send request waits for its broadcast before returning the queued job
+
+
+class Chain(NamedTuple):
+    script: str  # scripts/<script>, also the key in the balances store
+    pool: Optional[str] = None  # address_pool key
+    send: Optional[str] = None  # offline.py coin
+    history: bool = False
+
+
+CHAINS: Dict[str, Chain] = {
+    "btc": Chain("btc.py", pool="BTC", send="BTC", history=True),
+    "ltc": Chain("ltc.py", pool="LTC", send="LTC", history=True),
+    "doge": Chain("doge.py", pool="DOGE", send="DOGE", history=True),
+    "bch": Chain("bch.py"),
+    "eth": Chain("eth.py", pool="EVM", send="ETH"),
+    "bnb": Chain("bnb.py", pool="EVM", send="BNB"),
+    "pol": Chain("pol.py", pool="EVM", send="POL"),
+    "sol": Chain("sol.py"),
+    "usdt": Chain("usdt.py"),
+    "dash": Chain("dash.py"),
+    "zec": Chain("zec.py"),
+    "xmr": Chain("xmr.py"),
+    "atom": Chain("ada-atom.py", pool="ATOM"),
+    "ada": Chain("ada-atom.py", pool="ADA"),
+}
+
+_modules: Dict[str, Any] = {}  # script -> imported module
+_unavailable: Dict[str, str] = {}  # script -> import error
+_create_lock = threading.Lock()
+_executor: Optional[ThreadPoolExecutor] = None
+_slots: Optional[asyncio.Semaphore] = None
+_waiting = 0
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Tuple[str, ...] = ()):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+
+# ---------- Warm clients ----------
+def warm():
+    """Import every chain script once (quietly) and open the address pools."""
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=CONCURRENCY)
+    net.session.mount("https://", adapter)
+    net.session.mount("http://", adapter)
+    for script in dict.fromkeys(c.script for c in CHAINS.values()):
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):  # usdt.py prints its banner on import
+                _modules[script] = importlib.import_module(script[:-3])
+        except Exception as e:  # missing SDK (e.g. monero) only disables that chain
+            _unavailable[script] = f"{type(e).__name__}: {e}"
+    address_pool.start()
+    send_queue.start()
+    tracker.start()
+    fee_bump.start()
+
+
+def _module(chain: str):
+    script = CHAINS[chain].script
+    if script not in _modules:
+        raise HTTPError(503, f"{chain} is unavailable: {_unavailable.get(script, 'not loaded')}")
+    return _modules[script]
+
+
+def _wallet_exists(chain: str) -> bool:
+    module = _module(chain)
+    if hasattr(module, "wallet_exists"):
+        return module.wallet_exists()
+    return os.path.exists(module.WALLET_FILE)
+
+
+# ---------- Operations (run on worker threads) ----------
+def wallet_address(chain: str) -> Dict[str, str]:
+    module = _module(chain)
+    if not _wallet_exists(chain):
+        raise FileNotFoundError(f"{chain} wallet not found. Create it first.")
+    if chain in ("btc", "ltc", "doge"):
+        from bitcoinlib.wallets import Wallet
+        return {"address": Wallet(module.WALLET_NAME, db_uri=f"sqlite:///{module.DB_PATH}").get_key().address}
+    if chain == "usdt":
+        wallet = _read_json(module.WALLET_FILE)
+        return {"address": wallet["ethereum"]["address"], "tron_address": wallet["tron"]["address"]}
+    if chain in ("atom", "ada"):
+        key = CHAINS[chain].pool
+        return {"address": watch_only.deriver(key, watch_only.account_key(key))(0)}
+    path = next(getattr(module, a) for a in ("INFO_PATH", "WALLET_FILE", "KEY_PATH") if hasattr(module, a))
+    return {"address": _read_json(path)["address"]}
+
+
+def create(chain: str) -> Dict[str, Any]:
+    with _create_lock:  # scripts print through a module-level console, swapped out here
+        module = _module(chain)
+        if _wallet_exists(chain):
+            raise FileExistsError(f"{chain} wallet already exists.")
+        console, module.console = module.console, type(module.console)(file=io.StringIO())
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                module.create_wallet()
+        finally:
+            module.console = console
+    balances.invalidate(CHAINS[chain].script)
+    return {"chain": chain, **wallet_address(chain)}
+
+
+def new_address(chain: str, label: str) -> Dict[str, Any]:
+    key = CHAINS[chain].pool
+    if key is None:  # single-address wallet
+        return {"chain": chain, **wallet_address(chain)}
+    entry = address_pool.get_pool(key).take(label)
+    return {"chain": chain, "address": entry["address"], "index": entry["index"], "label": label}
+
+
+def _job(job: Dict[str, Any]) -> Dict[str, Any]:
+    seen = tracker.get(job["txid"]) if job["status"] == send_queue.BROADCAST else None
+    return {"id": job["id"], "idempotency_key": job["idempotency_key"], "coin": job["coin"],
+            "to": job["to_address"], "amount": job["amount"], "fee": job["fee"], "status": job["status"],
+            "txid": job["txid"], "attempts": job["attempts"], "error": job["error"],
+            "confirmations": seen["confirmations"] if seen else None}
+
+
+async def _send(chain: str, body: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+    """Queue the payout and wait up to SEND_WAIT for it to be broadcast."""
+    to = body.get("to")
+    if not isinstance(to, str) or not to:
+        raise HTTPError(400, "'to' must be an address.")
+    amount, fee = _decimal(body, "amount"), _decimal(body, "fee", required=False)
+    key = headers.get("idempotency-key") or body.get("idempotency_key")
+    job = await _run(send_queue.enqueue, CHAINS[chain].send, to, amount, fee, key)
+    deadline = time.monotonic() + SEND_WAIT
+    while job["status"] in (send_queue.QUEUED, send_queue.SIGNED) and time.monotonic() < deadline:
+        await asyncio.sleep(0.05)
+        job = send_queue.get(job["id"])
+    if job["status"] == send_queue.BROADCAST:
+        balances.invalidate(CHAINS[chain].script)
+    return _job(job)
+
+
+def history(chain: str) -> Dict[str, Any]:
+    from bitcoinlib.wallets import Wallet
+    module = _module(chain)
+    if not _wallet_exists(chain):
+        raise FileNotFoundError(f"{chain} wallet not found. Create it first.")
+    w = Wallet(module.WALLET_NAME, db_uri=f"sqlite:///{module.DB_PATH}")
+    w.transactions_update()
+    txs = [{"txid": t.txid, "status": t.status, "confirmations": t.confirmations, "date": t.date,
+            "fee": t.fee, "block_height": t.block_height} for t in w.transactions()]
+    return {"chain": chain, "transactions": txs}
+
+
+# ---------- Request handling ----------
+async def _run(func, *args):
+    """Run blocking wallet work on the worker pool, shedding load past MAX_PENDING."""
+    global _waiting
+    if _slots.locked() and _waiting >= MAX_PENDING:
+        raise HTTPError(503, "Server busy, retry shortly.", ("Retry-After: 1",))
+    _waiting += 1
+    try:
+        await _slots.acquire()
+    finally:
+        _waiting -= 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
+    finally:
+        _slots.release()
+
+
+def _authorize(headers: Dict[str, str]):
+    if not TOKEN:
+        raise HTTPError(403, "Sends are disabled. Set HIDERAX_API_TOKEN to enable them.")
+    if not hmac.compare_digest(headers.get("authorization", ""), f"Bearer {TOKEN}"):
+        raise HTTPError(401, "Missing or wrong bearer token.")
+
+
+def _decimal(body: Dict[str, Any], field: str, required: bool = True) -> Optional[Decimal]:
+    if body.get(field) is None and not required:
+        return None
+    try:
+        value = Decimal(str(body[field]))
+    except (KeyError, InvalidOperation):
+        raise HTTPError(400, f"'{field}' must be a number.")
+    if not value.is_finite():  # NaN can't even be compared
+        raise HTTPError(400, f"'{field}' must be a finite number.")
+    if value <= 0:
+        raise HTTPError(400, f"'{field}' must be positive.")
+    return value
+
+
+async def _balance(chain: str, query: Dict[str, str]) -> Dict[str, Any]:
+    script = CHAINS[chain].script
+    if script not in balances.FETCHERS:
+        raise HTTPError(501, f"No balance backend for {chain}.")
+    _module(chain)
+    max_age = float(query.get("max_age", balances.MAX_AGE))
+    snapshot = balances.load().get(script)
+    if balances.is_stale(snapshot, max_age):
+        refresh = _inflight.get(script)
+        if refresh is None:  # one refresh per wallet, however many requests are waiting for it
+            refresh = _inflight[script] = asyncio.ensure_future(_run(balances.refresh, script))
+            refresh.add_done_callback(lambda _: _inflight.pop(script, None))
+        await asyncio.shield(refresh)
+        snapshot = balances.load().get(script) or {}
+    if snapshot.get("balance") is None:
+        if snapshot.get("error"):
+            raise HTTPError(502, snapshot["error"])
+        raise FileNotFoundError(f"{chain} wallet not found. Create it first.")
+    return {"chain": chain, "balance": snapshot["balance"], "updated": snapshot.get("updated"),
+            "error": snapshot.get("error")}
+
+
+def _chains() -> Dict[str, Any]:
+    out = {}
+    for chain, spec in CHAINS.items():
+        out[chain] = {"script": spec.script, "available": spec.script in _modules,
+                      "wallet": spec.script in _modules and _wallet_exists(chain),
+                      "address_pool": spec.pool, "balance": spec.script in balances.FETCHERS,
+                      "send": spec.send is not None, "history": spec.history}
+    return out
+
+
+async def dispatch(method: str, target: str, headers: Dict[str, str], raw: bytes) -> Tuple[str, Any]:
+    """Route one request; returns (route label, JSON payload) or raises."""
+    url = urlsplit(target)
+    parts = [p for p in url.path.split("/") if p]
+    query = dict(parse_qsl(url.query))
+    try:
+        body = json.loads(raw) if raw else {}
+    except ValueError:
+        raise HTTPError(400, "Body must be JSON.")
+    if not isinstance(body, dict):
+        raise HTTPError(400, "Body must be a JSON object.")
+
+    if parts == ["health"] and method == "GET":
+        return "health", {"status": "ok", "busy": _waiting}
+    if parts == ["chains"] and method == "GET":
+        return "chains", _chains()
+    if len(parts) == 2 and parts[0] == "sends" and method == "GET":
+        _authorize(headers)
+        job = send_queue.get(int(parts[1])) if parts[1].isdigit() else None
+        if job is None:
+            raise HTTPError(404, "No such send job.")
+        return "sends", _job(job)
+    if len(parts) not in (2, 3) or parts[0] != "wallets":
+        raise HTTPError(404, "Not found.")
+    chain = parts[1].lower()
+    if chain not in CHAINS:
+        raise HTTPError(404, f"Unknown chain: {chain}.")
+    action = parts[2] if len(parts) == 3 else ""
+    route = action or "create"
+
+    if (method, action) == ("POST", ""):
+        return route, await _run(create, chain)
+    if (method, action) == ("POST", "addresses"):
+        return route, await _run(new_address, chain, str(body.get("label", "")))
+    if (method, action) == ("GET", "balance"):
+        return route, await _balance(chain, query)
+    if (method, action) == ("POST", "send"):
+        _authorize(headers)
+        if CHAINS[chain].send is None:
+            raise HTTPError(501, f"Sending {chain} is not supported over the API.")
+        return route, await _send(chain, body, headers)
+    if (method, action) == ("GET", "history"):
+        if not CHAINS[chain].history:
+            raise HTTPError(501, f"No history backend for {chain}.")
+        return route, await _run(history, chain)
+    raise HTTPError(405 if action in ("", "addresses", "balance", "send", "history") else 404, "Not allowed.")
+
+
+def _status_for(e: Exception) -> int:
+    if isinstance(e, HTTPError):
+        return e.status
+    if isinstance(e, FileNotFoundError):
+        return 404
+    if isinstance(e, FileExistsError):
+        return 409
+    if isinstance(e, ValueError):
+        return 400
+    return 502  # backend, network or library failure
+
+
+def _response(status: int, payload: Any, keep_alive: bool, extra: Tuple[str, ...] = ()) -> bytes:
+    body = json.dumps(payload, default=str).encode()
+    head = [f"HTTP/1.1 {status} {HTTPStatus(status).phrase}", "Content-Type: application/json",
+            f"Content-Length: {len(body)}", f"Connection: {'keep-alive' if keep_alive else 'close'}", *extra]
+    return ("\r\n".join(head) + "\r\n\r\n").encode() + body
+
+
+async def _serve_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    try:
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+            except asyncio.TimeoutError:
+                break
+            if not line.strip():
+                break
+            headers: Dict[str, str] = {}
+            while True:
+                header = await reader.readline()
+                if header in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = header.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            start, extra, route = time.perf_counter(), (), "error"
+            try:
+                method, target, version = line.decode("latin-1").split()
+            except ValueError:
+                writer.write(_response(400, {"error": "Malformed request line."}, False))
+                break
+            keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+            try:
+                length = int(headers.get("content-length") or 0)
+                if length < 0:
+                    raise ValueError
+            except ValueError:  # the body can't be framed, so the connection can't be reused
+                writer.write(_response(400, {"error": "Invalid Content-Length."}, False))
+                break
+            if length > MAX_BODY:
+                writer.write(_response(413, {"error": "Body too large."}, False))
+                break
+            raw = await reader.readexactly(length) if length else b""
+            try:
+                route, payload = await dispatch(method.upper(), target, headers, raw)
+                status = 200
+            except Exception as e:
+                status, payload = _status_for(e), {"error": str(e) or type(e).__name__}
+                extra = getattr(e, "headers", ())
+            metrics.api_duration.observe(time.perf_counter() - start, route, str(status))
+            writer.write(_response(status, payload, keep_alive, extra))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host: str = HOST, port: int = PORT):
+    global _executor, _slots
+    _executor = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="api")
+    _slots = asyncio.Semaphore(CONCURRENCY)
+    server = await asyncio.start_server(_serve_connection, host, port, backlog=1024)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.panel import Panel
+
+    warm()
+    Console().print(Panel.fit(
+        f"[bold cyan]Listening on[/bold cyan] http://{HOST}:{PORT}\n"
+        f"[bold cyan]Chains:[/bold cyan] {', '.join(c for c, s in CHAINS.items() if s.script in _modules)}\n"
+        f"[bold cyan]Sends:[/bold cyan] {'enabled (bearer token)' if TOKEN else 'disabled (set HIDERAX_API_TOKEN)'}",
+        title="🌐 HideraX API"))
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
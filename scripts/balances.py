@@ -0,0 +1,229 @@
+"""
+Balance snapshots for the main menu.
+- Balances live in one JSON store (SNAPSHOT_PATH) keyed by wallet script, so
+  drawing the menu is a file read, never a network call
+- A daemon thread refreshes snapshots older than MAX_AGE seconds
+  (HIDERAX_BALANCE_MAX_AGE, default 300); failed lookups are retried after
+  RETRY_AFTER and keep showing the last good balance
+- invalidate(script) marks one wallet stale, e.g. after the user ran it
+- Only wallets that exist locally are looked up; receive-only wallets without
+  a balance backend (ADA/ATOM, XMR) are left out. DASH and ZEC go through
+  utxo_explorer
+
+Lookups reuse each script's own network setup (rpc_router, http_cache,
+bitcoinlib services), so they share its providers, caching and rate limits.
+"""
+import importlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.path.join(SCRIPTS_DIR, ".hiderax_cache", "balances.json")
+MAX_AGE = float(os.environ.get("HIDERAX_BALANCE_MAX_AGE", "300"))
+RETRY_AFTER = 60.0
+POLL_INTERVAL = 5.0  # how often the refresher looks for stale snapshots
+WORKERS = 4
+
+USDT_WALLET_FILE = os.path.join(SCRIPTS_DIR, "wallet_USDT", "wallet_info.json")
+USDT_ERC20_CONTRACT = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
+USDT_TRC20_CONTRACT = "TXLAQ63Xg1NAzckPwKHvzw7CSEmLMEqcdj"
+TRONGRID_ACCOUNT = "https://api.trongrid.io/v1/accounts/{}"
+
+_lock = threading.Lock()
+_wake = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+# ---------- Lookups ----------
+def _script(name: str):
+    return importlib.import_module(name)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _utxo_balance(script: str, network: str, symbol: str) -> Callable[[], Optional[str]]:
+    def fetch():
+        module = _script(script)
+        if not module.wallet_exists():
+            return None
+        from bitcoinlib.services.services import Service
+        from bitcoinlib.wallets import Wallet
+        addresses = Wallet(module.WALLET_NAME, db_uri=f"sqlite:///{module.DB_PATH}").addresslist()
+        sats = Service(network=network).getbalance(addresses)
+        return f"{sats / 1e8:.8f} {symbol}"
+    return fetch
+
+
+def _evm_balance(script: str, path_attr: str, web3_attr: str, symbol: str) -> Callable[[], Optional[str]]:
+    def fetch():
+        module = _script(script)
+        wallet = _read_json(getattr(module, path_attr))
+        if not wallet:
+            return None
+        web3 = getattr(module, web3_attr)
+        return f"{web3.from_wei(web3.eth.get_balance(wallet['address']), 'ether'):.6f} {symbol}"
+    return fetch
+
+
+def _bch_balance() -> Optional[str]:
+    bch = _script("bch")
+    if not bch.wallet_exists():
+        return None
+    return f"{bch.load_wallet_key().get_balance('bch')} BCH"
+
+
+def _sol_balance() -> Optional[str]:
+    sol = _script("sol")
+    wallet = _read_json(sol.INFO_PATH)
+    if not wallet:
+        return None
+    return f"{sol.get_sol_balance(wallet['address']):.6f} SOL"
+
+
+def _explorer_balance(script: str, path_attr: str, symbol: str) -> Callable[[], Optional[str]]:
+    def fetch():
+        import utxo_explorer
+        wallet = _read_json(getattr(_script(script), path_attr))
+        if not wallet:
+            return None
+        return f"{utxo_explorer.get(symbol).balance([wallet['address']]) / 1e8:.8f} {symbol}"
+    return fetch
+
+
+def _usdt_balance() -> Optional[str]:
+    # usdt.py prints its banner on import, so talk to the backends directly
+    import net
+    import rpc_router
+    wallet = _read_json(USDT_WALLET_FILE)
+    if not wallet:
+        return None
+    owner = wallet["ethereum"]["address"][2:].lower().rjust(64, "0")
+    call = {"to": USDT_ERC20_CONTRACT, "data": "0x70a08231" + owner}  # balanceOf(address)
+    erc20 = int(rpc_router.get_router("eth").call("eth_call", [call, "latest"]), 16) / 1e6
+
+    account = net.get_json(TRONGRID_ACCOUNT.format(wallet["tron"]["address"])).get("data") or [{}]
+    tokens = {k: v for entry in account[0].get("trc20", []) for k, v in entry.items()}
+    trc20 = int(tokens.get(USDT_TRC20_CONTRACT, 0)) / 1e6
+    return f"{erc20:,.2f} ERC20 • {trc20:,.2f} TRC20 USDT"
+
+
+# script -> lookup returning a display string, or None when there's no wallet yet
+FETCHERS: Dict[str, Callable[[], Optional[str]]] = {
+    "btc.py": _utxo_balance("btc", "bitcoin", "BTC"),
+    "ltc.py": _utxo_balance("ltc", "litecoin", "LTC"),
+    "doge.py": _utxo_balance("doge", "dogecoin", "DOGE"),
+    "bch.py": _bch_balance,
+    "eth.py": _evm_balance("eth", "INFO_PATH", "web3", "ETH"),
+    "bnb.py": _evm_balance("bnb", "INFO_PATH", "web3", "BNB"),
+    "pol.py": _evm_balance("pol", "WALLET_FILE", "w3", "POL"),
+    "sol.py": _sol_balance,
+    "dash.py": _explorer_balance("dash", "KEY_PATH", "DASH"),
+    "zec.py": _explorer_balance("zec", "INFO_PATH", "ZEC"),
+    "usdt.py": _usdt_balance,
+}
+
+
+# ---------- Store ----------
+def load() -> Dict[str, Dict[str, Any]]:
+    with _lock:
+        return _read_json(SNAPSHOT_PATH) or {}
+
+
+def _update(script: str, **fields):
+    with _lock:
+        snapshots = _read_json(SNAPSHOT_PATH) or {}
+        snapshots[script] = {**snapshots.get(script, {}), **fields}
+        os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+        tmp = SNAPSHOT_PATH + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(snapshots, f, indent=2)
+        os.replace(tmp, SNAPSHOT_PATH)
+
+
+def refresh(script: str):
+    """Look one wallet's balance up now and record the outcome."""
+    now = time.time()
+    try:
+        balance = FETCHERS[script]()
+    except Exception as e:  # any backend or library failure; keep the last good value
+        _update(script, checked=now, error=str(e) or type(e).__name__)
+        return
+    _update(script, balance=balance, updated=now, checked=now, error=None)
+
+
+def is_stale(snapshot: Optional[Dict[str, Any]], max_age: float = MAX_AGE, now: Optional[float] = None) -> bool:
+    if not snapshot:
+        return True
+    now = now or time.time()
+    if snapshot.get("error"):
+        return now - snapshot.get("checked", 0) >= RETRY_AFTER
+    return now - snapshot.get("checked", 0) >= max_age
+
+
+def invalidate(script: str):
+    if script in FETCHERS:
+        _update(script, checked=0)
+        _wake.set()
+
+
+def describe(script: str, now: Optional[float] = None) -> str:
+    """Menu cell for a wallet: cached balance plus its age, never blocking."""
+    if script not in FETCHERS:
+        return ""
+    snapshot = load().get(script)
+    if not snapshot or "balance" not in snapshot:
+        return "[dim]…[/dim]" if not (snapshot and snapshot.get("error")) else "[red]unavailable[/red]"
+    if snapshot["balance"] is None:
+        return "[dim]no wallet[/dim]"
+    age = (now or time.time()) - snapshot.get("updated", 0)
+    # coarse ages keep the cell text stable, so main.py's rendered menu stays cached
+    ago = "<1m" if age < 60 else f"{age / 60:.0f}m" if age < 3600 else f"{age / 3600:.0f}h"
+    style = "yellow" if age >= MAX_AGE or snapshot.get("error") else "green"
+    return f"[{style}]{snapshot['balance']}[/{style}] [dim]{ago} ago[/dim]"
+
+
+# ---------- Background refresh ----------
+def _run(scripts: Iterable[str]):
+    scripts = [s for s in dict.fromkeys(scripts) if s in FETCHERS]
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="balances") as pool:
+        while True:
+            snapshots = load()
+            stale = [s for s in scripts if is_stale(snapshots.get(s))]
+            list(pool.map(refresh, stale))
+            _wake.wait(POLL_INTERVAL)
+            _wake.clear()
+
+
+def start(scripts: Iterable[str]) -> threading.Thread:
+    """Keep the given wallets' snapshots fresh from a daemon thread (idempotent)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=_run, args=(list(scripts),), name="balances", daemon=True)
+        _thread.start()
+    return _thread
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    for name in FETCHERS:
+        refresh(name)
+    table = Table(title="💰 Balance snapshots", header_style="bold magenta")
+    table.add_column("Wallet", style="cyan")
+    table.add_column("Balance")
+    table.add_column("Error", style="red")
+    snapshots = load()
+    for name in FETCHERS:
+        table.add_row(name, describe(name), snapshots.get(name, {}).get("error") or "")
+    Console().print(table)
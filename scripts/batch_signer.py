@@ -0,0 +1,167 @@
+"""
+Multi-core signer for EVM and Tron payout batches.
+- ECDSA signing is CPU-bound, so batches are spread over a process pool
+- The private key is loaded once per worker process (pool initializer)
+- Work goes out in chunks; results come back in submission order
+- Every run reports signatures/second
+
+Usage:
+    with BatchSigner("evm", private_key) as signer:
+        signed, stats = signer.sign(tx_dicts)        # [(tx_hash, raw_tx_hex), ...]
+    sign_tron_transactions(tronpy_txns, private_key)  # attaches signatures in place
+
+`python3 batch_signer.py [count]` benchmarks 1 worker against all cores.
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
+
+import profiler
+
+DEFAULT_CHUNK = 256
+MIN_PARALLEL = 64  # below this the pool start-up costs more than it saves
+
+_worker_key: Any = None
+
+
+class SignStats(NamedTuple):
+    count: int
+    seconds: float
+    workers: int
+
+    @property
+    def per_second(self) -> float:
+        return self.count / self.seconds if self.seconds else float("inf")
+
+
+# ---------- Worker side ----------
+def _init_evm(private_key: str):
+    global _worker_key
+    from eth_account import Account
+    _worker_key = Account.from_key(private_key)
+
+
+def _init_tron(private_key: str):
+    global _worker_key
+    from tronpy.keys import PrivateKey
+    _worker_key = PrivateKey(bytes.fromhex(private_key.removeprefix("0x")))
+
+
+def _hex(b: bytes) -> str:
+    h = b.hex()
+    return h if h.startswith("0x") else "0x" + h
+
+
+def _sign_evm_chunk(txs: Sequence[dict]) -> List[Tuple[str, str]]:
+    out = []
+    for tx in txs:
+        signed = _worker_key.sign_transaction(tx)
+        raw = getattr(signed, "raw_transaction", None) or signed.rawTransaction
+        out.append((_hex(signed.hash), _hex(raw)))
+    return out
+
+
+def _sign_tron_chunk(txids: Sequence[str]) -> List[str]:
+    return [_worker_key.sign_msg_hash(bytes.fromhex(txid)).hex() for txid in txids]
+
+
+INITIALIZERS = {"evm": _init_evm, "tron": _init_tron}
+SIGNERS = {"evm": _sign_evm_chunk, "tron": _sign_tron_chunk}
+
+
+# ---------- Caller side ----------
+class BatchSigner:
+    def __init__(self, chain: str, private_key: str, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK):
+        if chain not in SIGNERS:
+            raise ValueError(f"Unsupported chain for batch signing: {chain}")
+        self.chain = chain
+        self.private_key = private_key
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                             initializer=INITIALIZERS[self.chain],
+                                             initargs=(self.private_key,))
+        return self._pool
+
+    def sign(self, items: Sequence[Any]) -> Tuple[List[Any], SignStats]:
+        """
+        EVM: items are tx dicts, results are (tx_hash, raw_tx) hex pairs.
+        Tron: items are txid hex strings, results are signature hex strings.
+        """
+        with profiler.span(f"sign:{self.chain}", category="sign", count=len(items)):
+            return self._sign(items)
+
+    def _sign(self, items: Sequence[Any]) -> Tuple[List[Any], SignStats]:
+        start = time.perf_counter()
+        if self.workers == 1 or len(items) < MIN_PARALLEL:
+            INITIALIZERS[self.chain](self.private_key)
+            results = SIGNERS[self.chain](items)
+            workers = 1
+        else:
+            # Chunks small enough that every worker gets several, large enough to amortise IPC
+            size = max(1, min(self.chunk_size, -(-len(items) // (self.workers * 4))))
+            chunks = [items[i:i + size] for i in range(0, len(items), size)]
+            results = [r for chunk in self._get_pool().map(SIGNERS[self.chain], chunks) for r in chunk]
+            workers = self.workers
+        return results, SignStats(len(items), time.perf_counter() - start, workers)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def sign_tron_transactions(txns: Sequence[Any], private_key: str, workers: Optional[int] = None,
+                           signer: Optional[BatchSigner] = None) -> SignStats:
+    """
+    Sign built tronpy Transactions in parallel; signatures are attached like Transaction.sign does.
+    Pass an open "tron" BatchSigner to sign several chunks on one process pool.
+    """
+    if signer is None:
+        with BatchSigner("tron", private_key, workers) as signer:
+            return sign_tron_transactions(txns, private_key, signer=signer)
+    signatures, stats = signer.sign([t.txid for t in txns])
+    for txn, sig in zip(txns, signatures):
+        txn._signature.append(sig)
+    return stats
+
+
+def benchmark(count: int = 5000):
+    from eth_account import Account
+    from rich.console import Console
+    from rich.table import Table
+    from tronpy.keys import PrivateKey
+
+    evm_key = Account.create().key.hex()
+    evm_txs = [{"to": "0x" + "11" * 20, "value": 1, "gas": 21000, "gasPrice": 10 ** 9,
+                "nonce": i, "chainId": 1} for i in range(count)]
+    tron_key = PrivateKey.random().hex()
+    tron_txids = [os.urandom(32).hex() for _ in range(count)]
+
+    table = Table(title=f"✍️ Batch Signing ({count} tx)", header_style="bold magenta")
+    table.add_column("Chain", style="cyan")
+    table.add_column("Workers", justify="right")
+    table.add_column("Signatures / sec", style="green", justify="right")
+    for chain, key, items in (("evm", evm_key, evm_txs), ("tron", tron_key, tron_txids)):
+        for workers in sorted({1, os.cpu_count() or 1}):
+            with BatchSigner(chain, key, workers) as signer:
+                _, stats = signer.sign(items)
+            table.add_row(chain.upper(), str(stats.workers), f"{stats.per_second:,.0f}")
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
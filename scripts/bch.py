@@ -7,7 +7,7 @@ Stores wallet info in wallet_BCH/wallet_info.json
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.prompt import Prompt
+from rich.prompt import Confirm, Prompt
 from rich.table import Table
 import qrcode
 import os
@@ -17,6 +17,9 @@ from decimal import Decimal, ROUND_DOWN
 # bitcash for BCH operations
 from bitcash import Key
 from bitcash.network import NetworkAPI
+import coin_select
+import metrics
+import profiler
 
 # ====== Config ======
 console = Console()
@@ -24,6 +27,8 @@ COIN_TAG = "BCH"
 WALLET_DIR = "wallet_BCH"
 WALLET_NAME = "CyOX2_Wallet_BCH"
 INFO_PATH = os.path.join(WALLET_DIR, "wallet_info.json")
+DEFAULT_FEE_RATE = 1  # sat/byte, same default as bitcash
+MAX_FEE_RATE = 50  # sat/byte; anything above is confirmed first (likely a total typed as a rate)
 
 # ====== Helpers ======
 def satoshis_to_bch(sats: int) -> Decimal:
@@ -155,15 +160,20 @@ def send_bch():
         # Convert to float for bitcash (bitcash expects decimal string or float)
         amount_for_send = float(amount_bch)
 
-        # Fee input: allow empty to use default dynamic fee
-        fee_input = Prompt.ask("[bold cyan]Enter desired fee in SATOSHIS (leave blank for auto)[/bold cyan]", default="")
+        # Fee rate input (sat/byte; this prompt used to take a total fee in sats); empty uses DEFAULT_FEE_RATE
+        fee_input = Prompt.ask("[bold cyan]Enter fee RATE in satoshis per byte, not a total fee "
+                               f"(leave blank for {DEFAULT_FEE_RATE} sat/byte)[/bold cyan]", default="")
         fee_arg = None
         if fee_input.strip() != "":
             try:
                 fee_sats = int(fee_input)
                 if fee_sats < 0:
                     raise ValueError("Fee must be >= 0")
-                # bitcash accepts fee in satoshis via 'fee' kw param
+                if fee_sats > MAX_FEE_RATE and not Confirm.ask(
+                        f"[yellow]{fee_sats} sat/byte is a very high rate (the fee is rate x size). Continue?[/yellow]",
+                        default=False):
+                    return
+                # bitcash's 'fee' kw param is a rate in satoshis per byte
                 fee_arg = fee_sats
             except Exception as e:
                 console.print(f"[red]❌ Invalid fee input: {e}[/red]")
@@ -176,19 +186,26 @@ def send_bch():
         f"""[bold cyan]Debug Info[/bold cyan]
 [blue]Recipient:[/blue] {to_addr}
 [blue]Amount (BCH):[/blue] {amount_bch}
-[blue]Fee (SATS - if set):[/blue] {fee_input or 'auto'}
+[blue]Fee rate (sat/byte):[/blue] {fee_input or f'{DEFAULT_FEE_RATE} (default)'}
 """, title="🔍 Debug", border_style="yellow"))
 
     try:
         # Prepare outputs list for bitcash: (address, amount, 'bch')
         outputs = [(to_addr, amount_for_send, 'bch')]
 
-        # If fee_arg is None, don't pass fee kwarg and let bitcash decide
-        if fee_arg is None:
-            txid = key.send(outputs)
-        else:
-            # bitcash's Key.send supports fee kw param (satoshis)
-            txid = key.send(outputs, fee=fee_arg)
+        # Pick inputs ourselves: bitcash would otherwise spend every UTXO (combine=True)
+        fee_rate = fee_arg if fee_arg is not None else DEFAULT_FEE_RATE
+        spendable = [u for u in key.get_unspents() if not u.has_cashtoken]
+        selection = coin_select.select(
+            coin_select.from_bitcash(spendable),
+            int(amount_bch * Decimal(1e8)),
+            coin_select.fee_model("legacy", fee_rate),
+        )
+        console.print(f"[blue]Inputs:[/blue] {len(selection.utxos)} of {len(spendable)} UTXOs "
+                      f"({selection.algorithm}), est. fee {selection.fee} sats")
+
+        txid = key.send(outputs, fee=fee_rate, unspents=[u.ref for u in selection.utxos])
+        metrics.count_send("bch", True)
 
         console.print(Panel.fit(
             f"[green]✅ Transaction Sent![/green]\n[bold cyan]TXID:[/bold cyan] {txid}",
@@ -196,6 +213,7 @@ def send_bch():
         ))
 
     except Exception as e:
+        metrics.count_send("bch", False)
         console.print(f"[bold red]❌ Error sending {COIN_TAG}:[/bold red] {e}")
 
 def main_menu():
@@ -228,5 +246,7 @@ def main_menu():
             console.print("[bold red]Goodbye![/bold red]")
             break
 
+profiler.instrument(globals())
+
 if __name__ == "__main__":
     main_menu()
@@ -4,16 +4,20 @@ from rich.panel import Panel
 from rich.prompt import Prompt
 from rich.table import Table
 from web3 import Web3
-from eth_account import Account
 import os
 import json
-import requests
+import hd_evm
+import http_cache
+import net
+import profiler
+import rpc_router
+import tracker
 
 console = Console()
 
 # Use a public RPC or your own BSC node
 BSC_RPC = "https://bsc-dataseed.binance.org/"
-web3 = Web3(Web3.HTTPProvider(BSC_RPC))
+web3 = Web3(rpc_router.web3_provider("bsc", BSC_RPC))
 
 WALLET_DIR = "wallet_BNB"
 WALLET_NAME = "CyOX2_BNB"
@@ -29,20 +33,21 @@ def create_wallet():
         console.print("[yellow]⚠️ Wallet already exists. Use 'View Wallet' instead.[/yellow]\n")
         return
 
-    acct = Account.create()
+    mnemonic = hd_evm.ensure_seed()
+    if mnemonic:
+        console.print(Panel.fit(f"[bold yellow]Write this down and store offline[/bold yellow]\n\n{mnemonic}",
+                                title="🧠 EVM Recovery Phrase (ETH • BNB • POL • USDT)", border_style="green"))
     os.makedirs(WALLET_DIR, exist_ok=True)
 
-    wallet_info = {
-        "address": acct.address,
-        "private_key": acct.key.hex()
-    }
+    # index 0 of the shared EVM seed; the key is derived on load, not stored
+    wallet_info = hd_evm.wallet_info(0)
 
     with open(INFO_PATH, "w") as f:
         json.dump(wallet_info, f, indent=4)
 
     console.print(Panel.fit(f"[green]✅ BNB Wallet Created![/green]\n"
-                            f"[bold cyan]Address:[/bold cyan] {acct.address}\n"
-                            f"[bold cyan]Private Key:[/bold cyan] {acct.key.hex()}",
+                            f"[bold cyan]Address:[/bold cyan] {wallet_info['address']}\n"
+                            f"[bold cyan]Derivation:[/bold cyan] {wallet_info['derivation']}",
                             title="New BNB Wallet"))
 
 
@@ -50,7 +55,7 @@ def load_wallet():
     if not wallet_exists():
         return None
     with open(INFO_PATH, "r") as f:
-        return json.load(f)
+        return hd_evm.unlock(json.load(f))
 
 
 def view_wallet():
@@ -92,9 +97,9 @@ def receive_bnb():
 
 def get_bnb_price_usdt():
     try:
-        res = requests.get("https://api.coinbase.com/v2/prices/BNB-USDT/spot")
-        return float(res.json()['data']['amount'])
-    except:
+        res = http_cache.get_json("https://api.coinbase.com/v2/prices/BNB-USDT/spot")
+        return float(res['data']['amount'])
+    except (net.RequestFailed, KeyError, TypeError, ValueError):
         return None
 
 
@@ -128,9 +133,10 @@ def send_bnb():
         }
 
         signed_tx = web3.eth.account.sign_transaction(tx, private_key=wallet['private_key'])
-        tx_hash = web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = web3.eth.send_raw_transaction(getattr(signed_tx, "raw_transaction", None) or signed_tx.rawTransaction)
 
         console.print(Panel.fit(f"[green]✅ Transaction Sent[/green]\n[bold cyan]TX Hash:[/bold cyan] {tx_hash.hex()}"))
+        tracker.track_sent("BNB", tx_hash.hex())
 
         if fee_usdt < 0.5:
             console.print("[yellow]⚠️ Low fee: May delay confirmation[/yellow]")
@@ -172,5 +178,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
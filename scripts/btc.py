@@ -9,9 +9,14 @@ import json
 from bitcoinlib.wallets import Wallet
 from bitcoinlib.services.services import Service
 from bitcoinlib.transactions import Transaction
-import requests
+import coin_select
+import http_cache
+import net
+import profiler
+import tracker
 
 console = Console()
+http_cache.install_bitcoinlib()  # explorer lookups via the on-disk HTTP cache
 WALLET_DIR = "wallet_BTC"
 WALLET_NAME = "CyOX2_Wallet"
 DB_PATH = os.path.join(WALLET_DIR, f"{WALLET_NAME}.db")
@@ -103,10 +108,9 @@ def receive_btc():
 
 def get_btc_price_usdt():
     try:
-        res = requests.get("https://api.coinbase.com/v2/prices/BTC-USDT/spot")
-        data = res.json()
-        return float(data['data']['amount'])
-    except:
+        res = http_cache.get_json("https://api.coinbase.com/v2/prices/BTC-USDT/spot")
+        return float(res['data']['amount'])
+    except (net.RequestFailed, KeyError, TypeError, ValueError):
         return None
 
 
@@ -140,15 +144,23 @@ def send_btc():
 """, title="🔍 Debug", border_style="yellow"))
 
     try:
+        # Fee is absolute here, so select at rate 0 for amount + fee; change takes the rest
+        utxos = w.utxos(min_confirms=1)
+        selection = coin_select.select(coin_select.from_bitcoinlib(utxos), amount_sats + fee_sats,
+                                       coin_select.FeeModel())
+        console.print(f"[blue]Inputs:[/blue] {len(selection.utxos)} of {len(utxos)} UTXOs ({selection.algorithm})")
+
         # Finally send using output_arr (correct param name!)
         tx = w.send(
             output_arr=[(to_addr, amount_sats)],
+            input_arr=[(u.txid, u.output_n, u.ref["key_id"], u.value) for u in selection.utxos],
             fee=fee_sats,
             replace_by_fee=True,
             broadcast=True  # Set to True to broadcast immediately
         )
 
         console.print(Panel.fit(f"[green]✅ Transaction Sent![/green]\n[bold cyan]TXID:[/bold cyan] {tx.txid}"))
+        tracker.track_sent("BTC", tx.txid)
 
         if fee_sats < 300:
             console.print("[yellow]⚠️ Low fee: May take hours to confirm.[/yellow]")
@@ -195,5 +207,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
@@ -0,0 +1,310 @@
+"""
+UTXO coin selection for wallets with very large UTXO sets.
+- UtxoIndex keeps UTXOs sorted by value with lazy prefix sums, so range
+  lookups and "is there enough?" checks are O(log n) instead of O(n)
+- Strategies: branch_and_bound (changeless), knapsack, largest_first;
+  select() tries them in that order
+- Fees are modelled per input / output (FeeModel), so each UTXO is judged by
+  its effective value (value minus the fee to spend it) and dust is skipped
+
+`python3 coin_select.py [count]` benchmarks every strategy on a synthetic set.
+"""
+import math
+import random
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from typing import Any, Iterable, List, NamedTuple, Optional
+
+BNB_MAX_TRIES = 1000
+BNB_MAX_CANDIDATES = 256  # largest UTXOs below the target window that BnB explores
+KNAPSACK_CANDIDATES = 64
+KNAPSACK_PASSES = 8
+DUST = 546
+
+
+class Utxo(NamedTuple):
+    value: int
+    txid: str
+    output_n: int
+    address: str = ""
+    ref: Any = None  # the wallet library's own UTXO object / dict
+
+
+class FeeModel(NamedTuple):
+    rate: float = 0.0  # sat/vbyte; 0 means the caller pays an absolute fee
+    input_size: int = 68
+    output_size: int = 31
+    overhead: int = 11
+
+    @property
+    def input_fee(self) -> int:
+        return math.ceil(self.rate * self.input_size)
+
+    def base_fee(self, n_outputs: int) -> int:
+        return math.ceil(self.rate * (self.overhead + n_outputs * self.output_size))
+
+    @property
+    def cost_of_change(self) -> int:
+        # adding a change output now plus spending it later
+        return math.ceil(self.rate * (self.output_size + self.input_size))
+
+
+def fee_model(witness_type: str, rate: float) -> FeeModel:
+    if witness_type == "legacy":
+        return FeeModel(rate, 148, 34, 10)
+    return FeeModel(rate)
+
+
+class Selection(NamedTuple):
+    utxos: List[Utxo]
+    fee: int
+    change: int
+    algorithm: str
+
+    @property
+    def total(self) -> int:
+        return sum(u.value for u in self.utxos)
+
+
+class UtxoIndex:
+    """UTXOs sorted ascending by value, with prefix sums for O(1) range totals."""
+
+    def __init__(self, utxos: Iterable[Utxo] = ()):
+        self._utxos = sorted(utxos, key=lambda u: u.value)
+        self._values = [u.value for u in self._utxos]
+        self._prefix: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    @property
+    def prefix(self) -> List[int]:
+        if self._prefix is None:
+            self._prefix = [0, *accumulate(self._values)]
+        return self._prefix
+
+    def sum_range(self, lo: int, hi: int) -> int:
+        return self.prefix[hi] - self.prefix[lo]
+
+    def add(self, utxo: Utxo):
+        i = bisect_right(self._values, utxo.value)
+        self._values.insert(i, utxo.value)
+        self._utxos.insert(i, utxo)
+        self._prefix = None
+
+    def remove(self, utxo: Utxo):
+        i = bisect_left(self._values, utxo.value)
+        while i < len(self._values) and self._values[i] == utxo.value:
+            u = self._utxos[i]
+            if u.txid == utxo.txid and u.output_n == utxo.output_n:
+                del self._values[i], self._utxos[i]
+                self._prefix = None
+                return
+            i += 1
+        raise KeyError(f"{utxo.txid}:{utxo.output_n} not in index")
+
+    def spendable_from(self, fees: FeeModel) -> int:
+        """Index of the first UTXO worth more than the fee to spend it."""
+        return bisect_right(self._values, fees.input_fee)
+
+    def first_at_least(self, value: int) -> int:
+        return bisect_left(self._values, value)
+
+    def __getitem__(self, i: int) -> Utxo:
+        return self._utxos[i]
+
+    def values(self) -> List[int]:
+        return self._values
+
+
+def _finish(picked: List[Utxo], amount: int, fees: FeeModel, n_outputs: int, algorithm: str) -> Selection:
+    total = sum(u.value for u in picked)
+    fee = fees.base_fee(n_outputs) + len(picked) * fees.input_fee
+    change = total - amount - fee
+    change_fee = math.ceil(fees.rate * fees.output_size)
+    if change - change_fee >= DUST:
+        return Selection(picked, fee + change_fee, change - change_fee, algorithm)
+    return Selection(picked, fee + change, 0, algorithm)  # leftover below dust goes to the miner
+
+
+# ---------- Strategies ----------
+def largest_first(index: UtxoIndex, amount: int, fees: FeeModel, n_outputs: int = 1) -> Optional[Selection]:
+    target = amount + fees.base_fee(n_outputs + 1)
+    lo = index.spendable_from(fees)
+    values = index.values()
+    picked, effective = [], 0
+    for i in range(len(values) - 1, lo - 1, -1):
+        if effective >= target:
+            break
+        picked.append(index[i])
+        effective += values[i] - fees.input_fee
+    if effective < target:
+        return None
+    return _finish(picked, amount, fees, n_outputs, "largest_first")
+
+
+def branch_and_bound(index: UtxoIndex, amount: int, fees: FeeModel, n_outputs: int = 1,
+                     max_tries: int = BNB_MAX_TRIES) -> Optional[Selection]:
+    """Look for an input set that needs no change output (Bitcoin Core's BnB, bounded)."""
+    input_fee = fees.input_fee
+    target = amount + fees.base_fee(n_outputs)
+    upper = target + fees.cost_of_change
+    values = index.values()
+    lo = index.spendable_from(fees)
+    hi = bisect_right(values, upper + input_fee)
+
+    # A single UTXO inside the window is already the best changeless answer
+    single = max(lo, bisect_left(values, target + input_fee))
+    if single < hi:
+        return _finish([index[single]], amount, fees, n_outputs, "branch_and_bound")
+
+    start = max(lo, hi - BNB_MAX_CANDIDATES)
+    if index.sum_range(lo, hi) - (hi - lo) * input_fee < target:
+        return None
+    pool = [values[i] - input_fee for i in range(hi - 1, start - 1, -1)]  # descending
+    available = sum(pool)
+    if available < target:
+        return None
+
+    value, selected, idx = 0, [], 0
+    best, best_waste = None, None
+    for _ in range(max_tries):
+        backtrack = False
+        if value + available < target or value > upper:
+            backtrack = True
+        elif value >= target:
+            waste = value - target
+            if best_waste is None or waste < best_waste:
+                best, best_waste = list(selected), waste
+                if waste == 0:
+                    break
+            backtrack = True
+
+        if backtrack:
+            if not selected:
+                break
+            idx -= 1
+            while idx > selected[-1]:
+                available += pool[idx]
+                idx -= 1
+            value -= pool[idx]
+            selected.pop()
+        else:
+            v = pool[idx]
+            available -= v
+            # skip a UTXO equal to one we just omitted: same subsets, already explored
+            if not selected or idx - 1 == selected[-1] or v != pool[idx - 1]:
+                selected.append(idx)
+                value += v
+        idx += 1
+
+    if best is None:
+        return None
+    return _finish([index[hi - 1 - i] for i in best], amount, fees, n_outputs, "branch_and_bound")
+
+
+def knapsack(index: UtxoIndex, amount: int, fees: FeeModel, n_outputs: int = 1,
+             rng: Optional[random.Random] = None) -> Optional[Selection]:
+    """
+    Smallest single UTXO that covers the payment plus change, or a randomized
+    subset of the largest smaller UTXOs if that wastes less.
+    """
+    rng = rng or random.Random(amount)
+    input_fee = fees.input_fee
+    target = amount + fees.base_fee(n_outputs + 1) + DUST
+    values = index.values()
+    lo = index.spendable_from(fees)
+    split = max(lo, index.first_at_least(target + input_fee))
+
+    larger = index[split] if split < len(values) else None
+    if index.sum_range(lo, split) - (split - lo) * input_fee < target:
+        return _finish([larger], amount, fees, n_outputs, "knapsack") if larger else None
+
+    start = max(lo, split - KNAPSACK_CANDIDATES)
+    pool = [values[i] - input_fee for i in range(split - 1, start - 1, -1)]
+    best, best_value = None, None
+    for attempt in range(KNAPSACK_PASSES):
+        picked, total = [], 0
+        for i, v in enumerate(pool):
+            # first pass is greedy; later passes skip UTXOs at random
+            if attempt and rng.random() < 0.5:
+                continue
+            picked.append(i)
+            total += v
+            if total >= target:
+                break
+        if total >= target and (best_value is None or total < best_value):
+            best, best_value = picked, total
+
+    if best is None or (larger is not None and larger.value - input_fee <= best_value):
+        return _finish([larger], amount, fees, n_outputs, "knapsack") if larger else None
+    return _finish([index[split - 1 - i] for i in best], amount, fees, n_outputs, "knapsack")
+
+
+STRATEGIES = {
+    "branch_and_bound": branch_and_bound,
+    "knapsack": knapsack,
+    "largest_first": largest_first,
+}
+
+
+def select(index: UtxoIndex, amount: int, fees: FeeModel, n_outputs: int = 1,
+           strategy: str = "auto") -> Selection:
+    """Pick inputs for `amount` sats; raises ValueError when the wallet can't cover it."""
+    order = list(STRATEGIES) if strategy == "auto" else [strategy]
+    for name in order:
+        selection = STRATEGIES[name](index, amount, fees, n_outputs)
+        if selection is not None:
+            return selection
+    raise ValueError("Insufficient funds: not enough spendable UTXOs for this amount.")
+
+
+# ---------- Adapters ----------
+def from_bitcoinlib(utxos: Iterable[dict]) -> UtxoIndex:
+    return UtxoIndex(Utxo(u["value"], u["txid"], u["output_n"], u["address"], u) for u in utxos)
+
+
+def from_bitcash(unspents: Iterable[Any]) -> UtxoIndex:
+    return UtxoIndex(Utxo(u.amount, u.txid, u.txindex, "", u) for u in unspents)
+
+
+# ---------- Benchmark ----------
+def benchmark(count: int = 100_000, rounds: int = 200):
+    from rich.console import Console
+    from rich.table import Table
+
+    rng = random.Random(42)
+    utxos = [Utxo(int(rng.lognormvariate(10, 2)) + 1, f"{i:064x}", 0) for i in range(count)]
+    start = time.perf_counter()
+    index = UtxoIndex(utxos)
+    _ = index.prefix
+    build_ms = (time.perf_counter() - start) * 1000
+    fees = FeeModel(rate=5)
+    targets = [int(rng.lognormvariate(13, 1.5)) for _ in range(rounds)]
+
+    table = Table(title=f"🪙 Coin Selection ({count:,} UTXOs, index built in {build_ms:.0f} ms)",
+                  header_style="bold magenta")
+    for col in ("Strategy", "Found", "Mean (ms)", "p99 (ms)", "Avg inputs"):
+        table.add_column(col, justify="right" if col != "Strategy" else "left")
+    for name in [*STRATEGIES, "auto"]:
+        timings, found, inputs = [], 0, 0
+        for amount in targets:
+            t0 = time.perf_counter()
+            try:
+                sel = select(index, amount, fees, strategy=name)
+            except ValueError:
+                sel = None
+            timings.append((time.perf_counter() - t0) * 1000)
+            if sel:
+                found += 1
+                inputs += len(sel.utxos)
+        timings.sort()
+        table.add_row(name, f"{found}/{rounds}", f"{sum(timings) / rounds:.3f}",
+                      f"{timings[int(rounds * 0.99) - 1]:.3f}", f"{inputs / max(found, 1):.1f}")
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,297 @@
+"""
+UTXO consolidation for BTC / LTC / DOGE / BCH.
+- Fee rates are snapshotted to SNAPSHOT_PATH; a snapshot younger than
+  SNAPSHOT_MAX_AGE is reused, so watching costs no extra requests
+- When a coin's rate is at or below its FEE_THRESHOLDS entry, small UTXOs
+  (below SMALL_UTXO) are merged back into the wallet in batches of up to
+  MAX_INPUTS_PER_TX inputs, at most MAX_BATCHES_PER_RUN transactions per run
+- UTXOs worth less than the fee to spend them are left alone
+- plan() and execute() are separate steps: the menu broadcasts exactly the
+  batches (inputs, fee rate) it showed and the user confirmed
+- Consolidation transactions are registered with tracker like any other send
+
+`python3 consolidate.py watch [minutes]` runs the scheduler without the menu.
+"""
+import json
+import math
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.prompt import Confirm, Prompt
+from rich.table import Table
+
+import coin_select
+import http_cache
+import metrics
+import profiler
+import tracker
+
+console = Console()
+http_cache.install_bitcoinlib()
+
+# coin -> (script module, bitcoinlib network; None = bitcash)
+COINS = {
+    "BTC": ("btc", "bitcoin"),
+    "LTC": ("ltc", "litecoin"),
+    "DOGE": ("doge", "dogecoin"),
+    "BCH": ("bch", None),
+}
+
+# sat/vbyte at or below which consolidation runs
+FEE_THRESHOLDS = {"BTC": 4, "LTC": 4, "DOGE": 1000, "BCH": 1}
+# UTXOs below this many sats are consolidation candidates
+SMALL_UTXO = {"BTC": 100_000, "LTC": 1_000_000, "DOGE": 1_000_000_000, "BCH": 100_000}
+
+MIN_INPUTS = 10  # fewer small UTXOs than this isn't worth a transaction
+MAX_INPUTS_PER_TX = 200
+MAX_BATCHES_PER_RUN = 5
+FEE_TARGET_BLOCKS = 25  # consolidation is never urgent
+WATCH_INTERVAL = 15 * 60
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_PATH = os.path.join(BASE_DIR, ".hiderax_cache", "fee_snapshots.json")
+SNAPSHOT_MAX_AGE = 300
+SNAPSHOT_HISTORY = 288  # per coin; a day of 5-minute snapshots
+
+
+# ---------- Fee snapshots ----------
+def load_snapshots() -> Dict[str, List[Dict[str, float]]]:
+    try:
+        with open(SNAPSHOT_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_snapshots(snapshots: Dict[str, List[Dict[str, float]]]):
+    os.makedirs(os.path.dirname(SNAPSHOT_PATH), exist_ok=True)
+    tmp = SNAPSHOT_PATH + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshots, f)
+    os.replace(tmp, SNAPSHOT_PATH)
+
+
+def fetch_fee_rate(coin: str) -> float:
+    """Current sat/vbyte estimate for the coin."""
+    network = COINS[coin][1]
+    if network is None:
+        import bch
+        return bch.DEFAULT_FEE_RATE  # BCH blocks are rarely full; bitcash uses a flat rate too
+    from bitcoinlib.services.services import Service
+    return Service(network=network).estimatefee(blocks=FEE_TARGET_BLOCKS) / 1000  # sat/kB -> sat/byte
+
+
+def fee_rate(coin: str, max_age: float = SNAPSHOT_MAX_AGE) -> float:
+    """Latest snapshot if it's fresh enough, otherwise a new one (which is recorded)."""
+    snapshots = load_snapshots()
+    history = snapshots.get(coin, [])
+    if history and time.time() - history[-1]["ts"] < max_age:
+        return history[-1]["rate"]
+    rate = fetch_fee_rate(coin)
+    snapshots[coin] = (history + [{"ts": time.time(), "rate": rate}])[-SNAPSHOT_HISTORY:]
+    save_snapshots(snapshots)
+    return rate
+
+
+# ---------- Planning ----------
+def plan_batches(index: coin_select.UtxoIndex, fees: coin_select.FeeModel, small: int,
+                 max_inputs: int = MAX_INPUTS_PER_TX, max_batches: int = MAX_BATCHES_PER_RUN) -> List[List[coin_select.Utxo]]:
+    """Smallest spendable UTXOs first, chunked into transactions with one output each."""
+    lo, hi = index.spendable_from(fees), index.first_at_least(small)
+    batches = []
+    for start in range(lo, hi, max_inputs):
+        batch = [index[i] for i in range(start, min(start + max_inputs, hi))]
+        if len(batch) < MIN_INPUTS or len(batches) == max_batches:
+            break
+        if sum(u.value for u in batch) - batch_fee(fees, len(batch)) < coin_select.DUST:
+            continue
+        batches.append(batch)
+    return batches
+
+
+def batch_fee(fees: coin_select.FeeModel, n_inputs: int) -> int:
+    return fees.base_fee(1) + n_inputs * fees.input_fee
+
+
+# ---------- Wallet access ----------
+def coin_module(coin: str):
+    return __import__(COINS[coin][0])
+
+
+def open_wallet(coin: str):
+    mod = coin_module(coin)
+    if not mod.wallet_exists():
+        raise FileNotFoundError(f"{coin} wallet not found.")
+    if COINS[coin][1] is None:
+        return mod.load_wallet_key()
+    from bitcoinlib.wallets import Wallet
+    return Wallet(mod.WALLET_NAME, db_uri=f"sqlite:///{mod.DB_PATH}")
+
+
+def load_index(coin: str, wallet) -> coin_select.UtxoIndex:
+    if COINS[coin][1] is None:
+        return coin_select.from_bitcash(u for u in wallet.get_unspents() if not u.has_cashtoken)
+    wallet.utxos_update()
+    return coin_select.from_bitcoinlib(wallet.utxos(min_confirms=1))
+
+
+def wallet_fee_model(coin: str, wallet, rate: float) -> coin_select.FeeModel:
+    witness_type = "legacy" if COINS[coin][1] is None else wallet.witness_type
+    return coin_select.fee_model(witness_type, math.ceil(rate))
+
+
+def send_batch(coin: str, wallet, batch: List[coin_select.Utxo], fees: coin_select.FeeModel) -> str:
+    if COINS[coin][1] is None:
+        # no outputs: bitcash sends everything minus the fee back to the wallet address
+        txid = wallet.send([], fee=int(fees.rate), unspents=[u.ref for u in batch])
+        metrics.count_send("bch", True)
+        return txid
+    fee = batch_fee(fees, len(batch))
+    to_addr = wallet.get_key(change=1).address
+    tx = wallet.send([(to_addr, sum(u.value for u in batch) - fee)],
+                     input_arr=[(u.txid, u.output_n, u.ref["key_id"], u.value) for u in batch],
+                     fee=fee, broadcast=True)
+    if tx.error:
+        raise RuntimeError(tx.error)
+    tracker.track_sent(coin, tx.txid)
+    return tx.txid
+
+
+# ---------- Runs ----------
+def plan(coin: str, force: bool = False) -> Dict[str, Any]:
+    """What one pass for a coin would send; execute() broadcasts exactly that."""
+    rate = fee_rate(coin)
+    result = {"coin": coin, "rate": rate, "threshold": FEE_THRESHOLDS[coin], "batches": [], "txids": []}
+    if rate > FEE_THRESHOLDS[coin] and not force:
+        result["skipped"] = "fees above threshold"
+        return result
+
+    wallet = open_wallet(coin)
+    fees = wallet_fee_model(coin, wallet, rate)
+    index = load_index(coin, wallet)
+    batches = plan_batches(index, fees, SMALL_UTXO[coin])
+    result["utxos"] = len(index)
+    result["batches"] = [(len(b), sum(u.value for u in b), batch_fee(fees, len(b))) for b in batches]
+    result["plan"] = (wallet, fees, batches)
+    if not batches:
+        result["skipped"] = "nothing to consolidate"
+    return result
+
+
+def execute(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Broadcast a plan() result's batches as planned; returns it with the txids filled in."""
+    if result.get("skipped") or result.get("error") or "plan" not in result:
+        return result
+    wallet, fees, batches = result["plan"]
+    try:
+        for batch in batches[len(result["txids"]):]:
+            result["txids"].append(send_batch(result["coin"], wallet, batch, fees))
+    except Exception as e:
+        result["error"] = f"[red]{e}[/red]"
+    return result
+
+
+def consolidate(coin: str, dry_run: bool = False, force: bool = False) -> Dict[str, Any]:
+    """One pass for a coin. Returns what was (or would be) done."""
+    result = plan(coin, force)
+    return result if dry_run else execute(result)
+
+
+def render(results: List[Dict[str, Any]], title: str):
+    table = Table(title=title, header_style="bold magenta")
+    for col in ("Coin", "Fee (sat/vB)", "Threshold", "UTXOs", "Batches", "Inputs", "Fees (sats)", "Status"):
+        table.add_column(col)
+    for r in results:
+        batches = r["batches"]
+        status = ", ".join(r["txids"] + [r[k] for k in ("error", "skipped") if r.get(k)]) or "[yellow]ready[/yellow]"
+        table.add_row(r["coin"], f"{r['rate']:g}" if r.get("rate") is not None else "-", str(r["threshold"]),
+                      str(r.get("utxos", "-")), str(len(batches)), str(sum(b[0] for b in batches)),
+                      str(sum(b[2] for b in batches)), status)
+    console.print(table)
+
+
+def run_all(dry_run: bool) -> List[Dict[str, Any]]:
+    results = []
+    for coin in COINS:
+        if not coin_module(coin).wallet_exists():
+            continue
+        try:
+            results.append(consolidate(coin, dry_run=dry_run))
+        except Exception as e:
+            results.append({"coin": coin, "rate": None, "threshold": FEE_THRESHOLDS[coin],
+                            "batches": [], "txids": [], "error": f"[red]{e}[/red]"})
+    return results
+
+
+def watch(interval: float = WATCH_INTERVAL):
+    console.print(f"[cyan]Watching fees every {interval / 60:g} min — Ctrl+C to stop.[/cyan]")
+    try:
+        while True:
+            render(run_all(dry_run=False), f"🧹 Consolidation run {time.strftime('%H:%M:%S')}")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        console.print("[yellow]Stopped watching.[/yellow]")
+
+
+# ---------- CLI ----------
+def snapshots_cli():
+    table = Table(title="⛽ Fee Snapshots (sat/vbyte)", header_style="bold magenta")
+    for col in ("Coin", "Latest", "Low (24h)", "Median (24h)", "Threshold", "Age"):
+        table.add_column(col)
+    for coin in COINS:
+        try:
+            fee_rate(coin)
+        except Exception as e:
+            console.print(f"[red]❌ {coin}: {e}[/red]")
+        history = load_snapshots().get(coin)
+        if not history:
+            continue
+        rates = sorted(s["rate"] for s in history)
+        table.add_row(coin, f"{history[-1]['rate']:g}", f"{rates[0]:g}", f"{rates[len(rates) // 2]:g}",
+                      str(FEE_THRESHOLDS[coin]), f"{time.time() - history[-1]['ts']:.0f}s")
+    console.print(table)
+
+
+def consolidate_cli():
+    results = run_all(dry_run=True)
+    render(results, "🧹 Consolidation Plan")
+    if not any(r["batches"] and not r.get("skipped") for r in results):
+        return
+    if Confirm.ask("[bold cyan]Broadcast these consolidation transactions?[/bold cyan]", default=False):
+        render([execute(r) for r in results], "🧹 Consolidation Result")  # the plan shown, not a new one
+
+
+def main_menu():
+    while True:
+        console.print(Panel("[bold yellow]UTXO Consolidation[/bold yellow]",
+                            subtitle="🧹 Merge small UTXOs while fees are low", expand=False))
+        console.print("[bold blue]1.[/bold blue] Fee snapshots")
+        console.print("[bold blue]2.[/bold blue] Plan & consolidate now")
+        console.print("[bold blue]3.[/bold blue] Watch fees and consolidate automatically")
+        console.print("[bold blue]4.[/bold blue] Exit")
+
+        choice = Prompt.ask("\n[bold green]Select an option[/bold green]", choices=["1", "2", "3", "4"])
+        if choice == "1":
+            snapshots_cli()
+        elif choice == "2":
+            consolidate_cli()
+        elif choice == "3":
+            minutes = Prompt.ask("[bold cyan]Check every N minutes[/bold cyan]", default=str(WATCH_INTERVAL // 60))
+            watch(float(minutes) * 60)
+        else:
+            console.print("[bold green]Goodbye![/bold green] 👋")
+            break
+
+
+profiler.instrument(globals())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "watch":
+        watch(float(sys.argv[2]) * 60 if len(sys.argv) > 2 else WATCH_INTERVAL)
+    else:
+        main_menu()
@@ -6,7 +6,9 @@ from rich.table import Table
 import qrcode
 import os
 import json
-import requests
+import profiler
+import rpc_router
+import utxo_explorer
 
 console = Console()
 
@@ -56,16 +58,14 @@ def view_wallet():
     address = info['address']
     wif = info['wif']
 
-    # NOTE: DASH balance check API
     try:
-        res = requests.get(f"https://api.blockcypher.com/v1/dash/main/addrs/{address}/balance")
-        balance_sats = res.json().get("balance", 0)
-    except:
-        balance_sats = 0
+        balance_sats = utxo_explorer.get("DASH").balance([address])
+        balance = f"{satoshis_to_dash(balance_sats):.8f} DASH"
+    except (rpc_router.RouterError, ValueError) as e:
+        balance = f"[red]unavailable ({e})[/red]"
 
-    balance_dash = satoshis_to_dash(balance_sats)
     console.print(Panel.fit(f"[bold cyan]Wallet Address:[/bold cyan] {address}\n"
-                            f"[bold cyan]Balance:[/bold cyan] {balance_dash:.8f} DASH\n"
+                            f"[bold cyan]Balance:[/bold cyan] {balance}\n"
                             f"[bold cyan]Private Key:[/bold cyan] {wif}",
                             title="[green]Wallet Info[/green]"))
 
@@ -117,5 +117,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
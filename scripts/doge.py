@@ -6,9 +6,13 @@ import qrcode
 import os
 import json
 from bitcoinlib.wallets import Wallet
-import requests
+import http_cache
+import net
+import profiler
+import tracker
 
 console = Console()
+http_cache.install_bitcoinlib()  # explorer lookups via the on-disk HTTP cache
 WALLET_DIR = "wallet_DOGE"
 WALLET_NAME = "CyOX2_DOGE_Wallet"
 DB_PATH = os.path.join(WALLET_DIR, f"{WALLET_NAME}.db")
@@ -75,9 +79,9 @@ def receive_doge():
 
 def get_doge_price_usdt():
     try:
-        res = requests.get("https://api.coinbase.com/v2/prices/DOGE-USDT/spot")
-        return float(res.json()['data']['amount'])
-    except:
+        res = http_cache.get_json("https://api.coinbase.com/v2/prices/DOGE-USDT/spot")
+        return float(res['data']['amount'])
+    except (net.RequestFailed, KeyError, TypeError, ValueError):
         return None
 
 
@@ -95,8 +99,9 @@ def send_doge():
     fee_sats = int(fee_doge * 1e8)
 
     try:
-        tx = w.send_to(to_addr, amount, fee=fee_sats, offline=False, replace_by_fee=True)
+        tx = w.send_to(to_addr, int(round(amount * 1e8)), fee=fee_sats, broadcast=True, replace_by_fee=True)
         console.print(Panel.fit(f"[green]✅ Sent![/green]\n[cyan]TXID:[/cyan] {tx.txid}"))
+        tracker.track_sent("DOGE", tx.txid)
         console.print()
     except Exception as e:
         console.print(f"[red]❌ Error sending DOGE: {e}[/red]\n")
@@ -120,5 +125,8 @@ def main_menu():
             console.print("[bold red]Goodbye![/bold red]"); break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
@@ -0,0 +1,256 @@
+"""
+Fee bumping for transactions stuck past their target time.
+- Candidates come from the tracker: the newest version of a pending, unmined
+  transaction older than BUMP_AFTER[coin], bumped at most MAX_BUMPS times
+- BTC / LTC: replace-by-fee. The transaction (from the wallet database, the send
+  queue or the network) is rebuilt with the same inputs and payouts, the higher
+  fee coming out of the change, and signed like offline.py signs batches
+- ETH / BNB / POL / USDT-ERC20: the same nonce again at a higher gas price.
+  Stuck transactions of a chain are fetched in one eth_getTransactionByHash
+  batch, signed together through batch_signer and sent in one
+  eth_sendRawTransaction batch
+- The new fee is at least BUMP_FACTOR times the old one and at least the
+  current network rate, which also clears the nodes' replacement rules
+  (BIP 125 / geth's +10%)
+- Replacements are registered with tracker.replace(), so whichever version is
+  mined settles the payout and send queue jobs follow it
+
+`python3 fee_bump.py [run [--once] | list]`
+"""
+import contextlib
+import importlib
+import io
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import offline
+import send_queue
+import tracker
+
+INTERVAL = float(os.environ.get("HIDERAX_BUMP_INTERVAL", "60"))  # seconds between checks
+BUMP_FACTOR = 1.25
+MAX_BUMPS = 3
+
+# coin -> seconds unconfirmed before the fee is bumped
+BUMP_AFTER: Dict[str, int] = {
+    "BTC": 3600,
+    "LTC": 1200,
+    "ETH": 300,
+    "BNB": 120,
+    "POL": 120,
+    "USDT-ERC20": 300,
+}
+UTXO_NETWORKS = {"BTC": "bitcoin", "LTC": "litecoin"}
+EVM_CHAIN_IDS = {"ETH": 1, "BNB": 56, "POL": 137, "USDT-ERC20": 1}
+
+_wake = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+# ---------- Candidates ----------
+def stuck(now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Newest version of every unmined transaction past its coin's BUMP_AFTER."""
+    now = now or time.time()
+    rows = tracker.db().execute(
+        f"SELECT * FROM tracked WHERE status = ? AND block IS NULL AND coin IN ({','.join('?' * len(BUMP_AFTER))})",
+        [tracker.PENDING, *BUMP_AFTER]).fetchall()
+    candidates = []
+    for row in map(dict, rows):
+        if now - row["submitted"] < BUMP_AFTER[row["coin"]]:
+            continue
+        versions = tracker.family(row)
+        if versions[-1]["txid"] == row["txid"] and len(versions) <= MAX_BUMPS:
+            candidates.append(row)
+    return candidates
+
+
+def _result(row: Dict[str, Any], new_txid: Optional[str] = None, error: Optional[str] = None) -> Dict[str, Any]:
+    return {"coin": row["coin"], "txid": row["txid"], "new_txid": new_txid, "error": error}
+
+
+# ---------- BTC / LTC: replace-by-fee ----------
+def _source_tx(w, coin: str, txid: str):
+    """The stuck transaction with input values: wallet database, send queue raw, or the network."""
+    tx = w.transaction(txid)
+    if tx is not None:
+        return tx
+    raw = send_queue.db().execute("SELECT raw FROM jobs WHERE txid = ? AND raw IS NOT NULL LIMIT 1",
+                                  (txid,)).fetchone()
+    if raw is None:
+        from bitcoinlib.services.services import Service
+        raw = [Service(network=UTXO_NETWORKS[coin]).getrawtransaction(txid)]
+    return w.transaction_import_raw(raw[0])
+
+
+def _rbf(coin: str, row: Dict[str, Any], w, fee_rate: int) -> Dict[str, Any]:
+    old = _source_tx(w, coin, row["txid"])
+    change = {k.address for k in w.keys(change=1)}
+    payouts = [(o.address, o.value) for o in old.outputs if o.address not in change]
+    old_fee = old.fee or sum(i.value for i in old.inputs) - sum(o.value for o in old.outputs)
+    # BIP 125: the replacement pays more in total and at least 1 sat/vB more for its own size
+    fee = max(math.ceil(old_fee * BUMP_FACTOR), old_fee + old.vsize, old.vsize * fee_rate)
+    t = w.transaction_create(
+        payouts, input_arr=[(i.prev_txid.hex(), i.output_n_int, None, i.value, None, b"", i.address)
+                            for i in old.inputs],
+        fee=fee, locktime=old.locktime, replace_by_fee=True)
+    t.sign()
+    if not t.verify():
+        raise ValueError("Signature check failed")
+    raw = t.raw_hex()
+    new_txid = offline.broadcast_utxo(coin, raw)
+    tracker.replace(row["txid"], new_txid, raw)
+    return _result(row, new_txid)
+
+
+def bump_utxo(coin: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    w = offline.open_utxo_wallet(coin)
+    w.anti_fee_sniping = False  # keep the original locktime
+    fee_rate = int(send_queue.default_fee(coin))
+    results = []
+    for row in rows:  # one bitcoinlib session: wallet objects aren't thread-safe
+        try:
+            results.append(_rbf(coin, row, w, fee_rate))
+        except Exception as e:
+            results.append(_result(row, error=str(e)))
+    return results
+
+
+# ---------- EVM: same nonce, higher gas price ----------
+def _evm_keys(coins: List[str]) -> Dict[str, str]:
+    """address (lowercase) -> private key of every local EVM wallet among `coins`."""
+    keys = {}
+    for coin in coins:
+        try:
+            if coin == "USDT-ERC20":
+                with contextlib.redirect_stdout(io.StringIO()):  # usdt.py prints its banner on import
+                    wallet = (importlib.import_module("usdt").load_wallet() or {}).get("ethereum")
+            else:
+                wallet = offline.load_evm_wallet(coin)
+        except FileNotFoundError:
+            continue
+        if wallet:
+            keys[wallet["address"].lower()] = wallet["private_key"]
+    return keys
+
+
+def _bumped(tx: Dict[str, Any], gas_price: int, chain_id: int) -> Dict[str, Any]:
+    from web3 import Web3
+    new = {"to": Web3.to_checksum_address(tx["to"]), "value": int(tx["value"], 16), "gas": int(tx["gas"], 16),
+           "data": tx.get("input", "0x"), "nonce": int(tx["nonce"], 16), "chainId": chain_id}
+    if tx.get("maxFeePerGas"):
+        tip = math.ceil(int(tx["maxPriorityFeePerGas"], 16) * BUMP_FACTOR)
+        new.update(maxPriorityFeePerGas=tip,
+                   maxFeePerGas=max(math.ceil(int(tx["maxFeePerGas"], 16) * BUMP_FACTOR), gas_price + tip))
+    else:
+        new["gasPrice"] = max(math.ceil(int(tx["gasPrice"], 16) * BUMP_FACTOR), gas_price)
+    return new
+
+
+def bump_evm(router_chain: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    import rpc_router
+    from batch_signer import BatchSigner
+    router = rpc_router.get_router(router_chain)
+    reply = router.post_json(
+        [{"jsonrpc": "2.0", "id": 0, "method": "eth_gasPrice", "params": []}] +
+        [{"jsonrpc": "2.0", "id": n, "method": "eth_getTransactionByHash", "params": [r["txid"]]}
+         for n, r in enumerate(rows, 1)])
+    by_id = {r.get("id"): r.get("result") for r in reply}
+    gas_price = int(by_id[0], 16)
+    keys = _evm_keys(sorted({r["coin"] for r in rows}))
+
+    results, by_sender = [], {}
+    for n, row in enumerate(rows, 1):
+        tx = by_id.get(n)
+        if not tx:
+            results.append(_result(row, error="not known to the node (dropped?)"))
+        elif tx.get("blockNumber"):
+            continue  # mined since the tracker last looked
+        elif tx["from"].lower() not in keys:
+            results.append(_result(row, error=f"no local key for {tx['from']}"))
+        else:
+            by_sender.setdefault(tx["from"].lower(), []).append(
+                (row, _bumped(tx, gas_price, EVM_CHAIN_IDS[row["coin"]])))
+
+    for sender, items in by_sender.items():
+        with BatchSigner("evm", keys[sender]) as signer:
+            signed, _ = signer.sign([tx for _, tx in items])
+        sent = router.post_json([{"jsonrpc": "2.0", "id": n, "method": "eth_sendRawTransaction", "params": [raw]}
+                                 for n, (_, raw) in enumerate(signed)])
+        errors = {r.get("id"): r["error"].get("message", str(r["error"])) for r in sent if "error" in r}
+        for n, ((row, _), (new_txid, raw)) in enumerate(zip(items, signed)):
+            if n in errors:
+                results.append(_result(row, error=errors[n]))
+            else:
+                tracker.replace(row["txid"], new_txid, raw)
+                results.append(_result(row, new_txid))
+    return results
+
+
+# ---------- Runner ----------
+def bump(now: Optional[float] = None) -> List[Dict[str, Any]]:
+    """Bump every stuck transaction, chains in parallel; returns one result per attempt."""
+    groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for row in stuck(now):
+        kind, backend, _ = tracker.CHAINS[row["coin"]]
+        groups.setdefault((kind, row["coin"] if kind == "utxo" else backend), []).append(row)
+    if not groups:
+        return []
+
+    def one(item):
+        (kind, target), rows = item
+        try:
+            return bump_utxo(target, rows) if kind == "utxo" else bump_evm(target, rows)
+        except Exception as e:  # provider trouble: try again next round
+            return [_result(row, error=str(e)) for row in rows]
+
+    with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="fee-bump") as pool:
+        return [r for results in pool.map(one, groups.items()) for r in results]
+
+
+def run(interval: float = INTERVAL, once: bool = False):
+    while True:
+        bump()
+        if once:
+            return
+        _wake.wait(interval)
+        _wake.clear()
+
+
+def start(interval: float = INTERVAL) -> threading.Thread:
+    """Check for stuck transactions from a daemon thread (idempotent)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=run, args=(interval,), name="fee-bump", daemon=True)
+        _thread.start()
+    return _thread
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "run" and "--once" not in sys.argv:
+        run()
+    elif command == "run":
+        table = Table(title="⛽ Fee bumps", header_style="bold magenta")
+        for column in ("Coin", "Stuck TXID", "Replacement / Error"):
+            table.add_column(column, overflow="fold")
+        for r in bump():
+            table.add_row(r["coin"], r["txid"], f"[green]{r['new_txid']}[/green]" if r["new_txid"]
+                          else f"[red]{r['error']}[/red]")
+        console.print(table)
+    else:
+        table = Table(title="⛽ Stuck transactions", header_style="bold magenta")
+        for column in ("Coin", "TXID", "Age", "Bumps"):
+            table.add_column(column, overflow="fold")
+        for row in stuck():
+            table.add_row(row["coin"], row["txid"], f"{time.time() - row['submitted']:.0f}s",
+                          str(len(tracker.family(row)) - 1))
+        console.print(table)
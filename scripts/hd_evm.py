@@ -0,0 +1,121 @@
+"""
+HD wallets for the EVM chains: ETH, BNB, POL and USDT (ERC20) share one seed.
+- One BIP39 mnemonic in SEED_PATH backs every EVM wallet
+- Addresses follow BIP44 m/44'/60'/0'/0/i (MetaMask / Ledger Live layout),
+  so index i is the same address on every EVM chain
+- The external-chain node m/44'/60'/0'/0 is derived once and cached in the
+  seed file as an xprv (and xpub for watch-only use); address i is then one
+  non-hardened child step (~0.1 ms), so any of millions of deposit addresses
+  can be derived on demand instead of being stored
+- Wallet files keep only the address and its index; unlock() derives the
+  private key when a script loads the wallet. Older files that carry a
+  random private_key keep working unchanged.
+
+`python3 hd_evm.py [start] [count]` prints derived addresses.
+"""
+import json
+import os
+import sys
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from bip_utils import (Bip32Secp256k1, Bip39MnemonicGenerator, Bip39MnemonicValidator, Bip39SeedGenerator,
+                       Bip39WordsNum, Bip44, Bip44Changes, Bip44Coins, EthAddrEncoder)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+SEED_DIR = os.path.join(BASE_DIR, "wallet_EVM")
+SEED_PATH = os.path.join(SEED_DIR, "hd_seed.json")
+ACCOUNT_PATH = "m/44'/60'/0'/0"  # external chain of account 0; children are addresses
+
+
+class Derived(NamedTuple):
+    index: int
+    address: str
+    private_key: Optional[str]  # None when derived from an xpub
+
+
+def seed_exists() -> bool:
+    return os.path.exists(SEED_PATH)
+
+
+def create_seed(mnemonic: Optional[str] = None) -> str:
+    """Write a new (or restored) seed file with the cached account keys; returns the mnemonic."""
+    if seed_exists():
+        raise FileExistsError(f"{SEED_PATH} already exists")
+    mnemonic = mnemonic or str(Bip39MnemonicGenerator().FromWordsNumber(Bip39WordsNum.WORDS_NUM_24))
+    if not Bip39MnemonicValidator().IsValid(mnemonic):
+        raise ValueError("Invalid BIP39 mnemonic.")
+    seed = Bip39SeedGenerator(mnemonic).Generate()
+    chain = Bip44.FromSeed(seed, Bip44Coins.ETHEREUM).Purpose().Coin().Account(0).Change(Bip44Changes.CHAIN_EXT)
+
+    os.makedirs(SEED_DIR, exist_ok=True)
+    with open(SEED_PATH, "w") as f:
+        json.dump({
+            "mnemonic": mnemonic,
+            "path": ACCOUNT_PATH,
+            "xprv": chain.PrivateKey().ToExtended(),
+            "xpub": chain.PublicKey().ToExtended(),
+            "note": "Backs every EVM wallet (ETH, BNB, POL, USDT ERC20). Keep it offline.",
+        }, f, indent=4)
+    return mnemonic
+
+
+def ensure_seed() -> Optional[str]:
+    """Create the shared seed if there is none yet; returns the new mnemonic, or None."""
+    return None if seed_exists() else create_seed()
+
+
+def load_seed() -> Dict[str, Any]:
+    if not seed_exists():
+        raise FileNotFoundError("EVM seed not found. Create a wallet first.")
+    with open(SEED_PATH) as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=4)
+def _node(extended_key: str) -> Bip32Secp256k1:
+    return Bip32Secp256k1.FromExtendedKey(extended_key)
+
+
+@lru_cache(maxsize=4096)
+def _derive(extended_key: str, index: int) -> Derived:
+    child = _node(extended_key).ChildKey(index)
+    address = EthAddrEncoder.EncodeKey(child.PublicKey().KeyObject())
+    private_key = None if child.IsPublicOnly() else "0x" + child.PrivateKey().Raw().ToHex()
+    return Derived(index, address, private_key)
+
+
+def derive(index: int, extended_key: Optional[str] = None) -> Derived:
+    """Address (and key, unless extended_key is an xpub) at m/44'/60'/0'/0/index."""
+    return _derive(extended_key or load_seed()["xprv"], index)
+
+
+def addresses(start: int = 0, count: int = 1, extended_key: Optional[str] = None) -> List[str]:
+    extended_key = extended_key or load_seed()["xprv"]
+    return [_derive(extended_key, i).address for i in range(start, start + count)]
+
+
+def wallet_info(index: int = 0) -> Dict[str, Any]:
+    """What a script stores for an HD wallet: no key, just where to find it."""
+    return {"address": derive(index).address, "hd_index": index, "derivation": f"{ACCOUNT_PATH}/{index}"}
+
+
+def unlock(wallet: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Fill in private_key for an HD wallet entry (legacy entries already have one)."""
+    if wallet and "private_key" not in wallet and "hd_index" in wallet:
+        wallet = {**wallet, "private_key": derive(wallet["hd_index"]).private_key}
+    return wallet
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    start = int(sys.argv[1]) if len(sys.argv) > 1 else 0
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    table = Table(title=f"🔑 EVM HD addresses ({ACCOUNT_PATH}/i)", header_style="bold magenta")
+    table.add_column("Index", style="cyan", justify="right")
+    table.add_column("Address", style="green")
+    for i, address in enumerate(addresses(start, count), start):
+        table.add_row(str(i), address)
+    Console().print(table)
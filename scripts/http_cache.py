@@ -0,0 +1,197 @@
+"""
+On-disk HTTP response cache for explorer endpoints (balances, UTXOs, tx lists).
+- Bodies stored under CACHE_DIR (scripts/.hiderax_cache/http, whatever the
+  working directory), one file per URL (sha256 of the URL)
+- Fresh entries (younger than their TTL) are served locally without any request
+- Stale entries are revalidated with If-None-Match / If-Modified-Since; a 304
+  refreshes the entry and reuses the stored body
+- TTLs are per URL substring (TTL_RULES), DEFAULT_TTL otherwise,
+  HIDERAX_CACHE_TTL overrides the default, HIDERAX_CACHE_DIR the location.
+  Transactions are only kept CONFIRMED_TX_TTL once the reply shows them in a
+  block; an unconfirmed one expires quickly, so confirmation tracking and fee
+  bumping never act on a stale "still pending"
+- install_bitcoinlib() routes bitcoinlib's service clients through the cache
+  and meters their broadcasts
+- Lookups are counted per kind (TTL_RULES) and result in metrics
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+import metrics
+import net
+import profiler
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("HIDERAX_CACHE_DIR", os.path.join(BASE_DIR, ".hiderax_cache", "http"))
+DEFAULT_TTL = float(os.environ.get("HIDERAX_CACHE_TTL", "30"))
+
+# (URL substring, seconds, kind for metrics) — first match wins
+TTL_RULES: List[Tuple[str, float, str]] = [
+    ("/prices/", 10, "price"),
+    ("/balance", 30, "balance"),
+    ("/api/v2/address/", 30, "balance"),  # Blockbook
+    ("/utxo", 30, "utxo"),
+    ("/unspent", 30, "utxo"),
+    ("blockcount", 15, "blockcount"),
+    ("/block/", 3600, "block"),
+    ("/tx/", 15, "tx"),  # unconfirmed; see CONFIRMED_TX_TTL
+]
+CONFIRMED_TX_TTL = 600.0
+
+VALIDATOR_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+stats = {"hits": 0, "revalidated": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(key: str, url: str):
+    with _stats_lock:
+        stats[key] += 1
+    metrics.cache_requests.inc(1, _rule(url)[1], key)
+
+
+def _rule(url: str) -> Tuple[float, str]:
+    for pattern, ttl, kind in TTL_RULES:
+        if pattern in url:
+            return ttl, kind
+    return DEFAULT_TTL, "other"
+
+
+def ttl_for(url: str) -> float:
+    return _rule(url)[0]
+
+
+def _confirmed(body: str) -> bool:
+    """Whether a transaction reply (Esplora, Insight, BlockCypher, ... layouts) shows it in a block."""
+    try:
+        tx = json.loads(body)
+    except ValueError:
+        return False
+    if not isinstance(tx, dict):
+        return False
+    if isinstance(tx.get("status"), dict) and tx["status"].get("confirmed"):
+        return True
+    if isinstance(tx.get("confirmations"), int) and tx["confirmations"] > 0:
+        return True
+    return any(isinstance(tx.get(k), int) and tx[k] > 0 for k in ("block_height", "blockheight", "blockHeight"))
+
+
+def _path(url: str) -> str:
+    return os.path.join(CACHE_DIR, hashlib.sha256(url.encode()).hexdigest() + ".json")
+
+
+def _load(url: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_path(url)) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("url") == url else None
+
+
+def _store(url: str, entry: Dict[str, Any]):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    path = _path(url)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)  # atomic: concurrent readers never see half a file
+
+
+def _as_response(url: str, entry: Dict[str, Any]) -> requests.Response:
+    res = requests.Response()
+    res.url = url
+    res.status_code = 200
+    res.headers.update(entry.get("headers", {}))
+    res.encoding = "utf-8"
+    res._content = entry["body"].encode("utf-8")
+    return res
+
+
+def fetch(url: str, ttl: Optional[float] = None, headers: Optional[Dict[str, str]] = None,
+          **kwargs) -> requests.Response:
+    """GET through the cache. Non-200 responses are returned as-is and never stored."""
+    with profiler.span("http_cache", category="cache", url=url):
+        return _fetch(url, ttl, headers, **kwargs)
+
+
+def _fetch(url: str, ttl: Optional[float], headers: Optional[Dict[str, str]], **kwargs) -> requests.Response:
+    entry = _load(url)
+    if ttl is None:
+        ttl = entry.get("ttl", ttl_for(url)) if entry else ttl_for(url)
+    if entry and time.time() - entry["fetched_at"] < ttl:
+        _count("hits", url)
+        return _as_response(url, entry)
+
+    headers = dict(headers or {})
+    if entry:
+        if "ETag" in entry["headers"]:
+            headers["If-None-Match"] = entry["headers"]["ETag"]
+        if "Last-Modified" in entry["headers"]:
+            headers["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+
+    res = net.request("GET", url, headers=headers, **kwargs)
+    if res.status_code == 304 and entry:
+        _count("revalidated", url)
+        entry["fetched_at"] = time.time()
+        _store(url, entry)
+        return _as_response(url, entry)
+
+    _count("misses", url)
+    if res.status_code == 200:
+        entry = {
+            "url": url,
+            "fetched_at": time.time(),
+            "headers": {h: res.headers[h] for h in VALIDATOR_HEADERS if h in res.headers},
+            "body": res.text,
+        }
+        if _rule(url)[1] == "tx" and _confirmed(res.text):
+            entry["ttl"] = CONFIRMED_TX_TTL
+        _store(url, entry)
+    return res
+
+
+def get_json(url: str, ttl: Optional[float] = None, **kwargs) -> Any:
+    res = fetch(url, ttl=ttl, **kwargs)
+    if res.status_code != 200:
+        raise net.RequestFailed(f"GET {url} -> HTTP {res.status_code}: {res.text[:200]}", res.status_code)
+    try:
+        return res.json()
+    except ValueError as e:
+        raise net.RequestFailed(f"GET {url} returned invalid JSON") from e
+
+
+def clear():
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".json"):
+            os.remove(os.path.join(CACHE_DIR, name))
+
+
+class _CachedRequests:
+    """Stand-in for the `requests` module inside bitcoinlib's service clients."""
+
+    def get(self, url, **kwargs):
+        return fetch(url, **kwargs)
+
+    def post(self, url, **kwargs):
+        # broadcasts and other writes: paced, but never cached or retried
+        return net.request("POST", url, retries=0, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+
+def install_bitcoinlib():
+    """Make bitcoinlib's Service providers (utxos_update, balances, ...) use the cache."""
+    from bitcoinlib.services import baseclient
+    if not isinstance(baseclient.requests, _CachedRequests):
+        baseclient.requests = _CachedRequests()
+    metrics.instrument_bitcoinlib()
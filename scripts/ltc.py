@@ -7,9 +7,13 @@ import os
 import json
 from bitcoinlib.wallets import Wallet
 from bitcoinlib.transactions import Transaction
-import requests
+import http_cache
+import net
+import profiler
+import tracker
 
 console = Console()
+http_cache.install_bitcoinlib()  # explorer lookups via the on-disk HTTP cache
 WALLET_DIR = "wallet_LTC"
 WALLET_NAME = "CyOX2_LTC_Wallet"
 DB_PATH = os.path.join(WALLET_DIR, f"{WALLET_NAME}.db")
@@ -100,10 +104,9 @@ def receive_ltc():
 
 def get_ltc_price_usdt():
     try:
-        res = requests.get("https://api.coinbase.com/v2/prices/LTC-USDT/spot")
-        data = res.json()
-        return float(data['data']['amount'])
-    except:
+        res = http_cache.get_json("https://api.coinbase.com/v2/prices/LTC-USDT/spot")
+        return float(res['data']['amount'])
+    except (net.RequestFailed, KeyError, TypeError, ValueError):
         return None
 
 
@@ -127,8 +130,9 @@ def send_ltc():
     fee_litoshis = int(fee_ltc * 1e8)
 
     try:
-        tx = w.send_to(to_addr, amount_ltc, fee=fee_litoshis, offline=False, replace_by_fee=True)
+        tx = w.send_to(to_addr, int(round(amount_ltc * 1e8)), fee=fee_litoshis, broadcast=True, replace_by_fee=True)
         console.print(Panel.fit(f"[green]✅ Transaction Sent![/green]\n[bold cyan]TXID:[/bold cyan] {tx.txid}"))
+        tracker.track_sent("LTC", tx.txid)
 
         if fee_usdt < 0.1:
             console.print("[yellow]⚠️ Low fee: May take longer to confirm.[/yellow]")
@@ -172,5 +176,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
@@ -0,0 +1,272 @@
+"""
+In-process metrics in the Prometheus text format.
+- Counter / Gauge / Histogram with positional label values; each update is
+  one dict lookup under a lock (a few microseconds)
+- Values that already live somewhere else (router provider health, token
+  bucket queues, cache totals) are read by collectors at scrape time, so
+  they cost nothing in the hot path
+- Set HIDERAX_METRICS_PORT to serve GET /metrics on 127.0.0.1 from any
+  wallet script or service process; serve() starts it explicitly
+
+Fed by net (all HTTP), rpc_router (web3 providers, Solana RPC, explorers),
+http_cache (hit ratios), instrument_session() (tronpy's requests session) and
+instrument_bitcoinlib() (broadcasts).
+
+`python3 metrics.py bench` measures the per-update overhead.
+"""
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+PORT_ENV = "HIDERAX_METRICS_PORT"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# (name, type, help, [(labels, value), ...])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [f"{self.name}{_labels(self.labels, k)} {_number(v)}" for k, v in items]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, help, labels)
+
+    def observe(self, value: float, *labels: str):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][i] += 1
+            state[1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, (list(counts), total)) for k, (counts, total) in self._values.items()]
+        lines = self._header()
+        for key, (counts, total) in items:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = f'le="{_number(bound)}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {running}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {running}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[Metric] = []
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric):
+        with self._lock:
+            self._metrics.append(metric)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics, collectors = list(self._metrics), list(self._collectors)
+        lines: List[str] = []
+        for metric in metrics:
+            lines += metric.render()
+        for collector in collectors:
+            for name, kind, help, samples in collector():
+                lines += [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+                lines += [f"{name}{_labels(list(l), list(l.values()))} {_number(v)}" for l, v in samples]
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# ---------- Standard metrics ----------
+http_duration = Histogram("hiderax_http_request_duration_seconds",
+                          "HTTP request latency by host, method and status (status=error: no response)",
+                          ("host", "method", "status"))
+rpc_duration = Histogram("hiderax_rpc_call_duration_seconds",
+                         "Routed RPC call latency including hedging and failover", ("chain", "method"))
+rpc_provider_duration = Histogram("hiderax_rpc_provider_duration_seconds",
+                                  "Latency of each provider attempt", ("chain", "provider", "result"))
+cache_requests = Counter("hiderax_cache_requests_total",
+                         "HTTP cache lookups by kind and result (hits, revalidated, misses)", ("kind", "result"))
+sends = Counter("hiderax_sends_total", "Transactions broadcast by chain ticker and result", ("chain", "result"))
+api_duration = Histogram("hiderax_api_request_duration_seconds",
+                         "Local API (api.py) latency by route and status", ("route", "status"))
+
+
+# names senders know their chain by (rpc_router chains, bitcoinlib networks) -> ticker label
+TICKERS = {"bitcoin": "btc", "litecoin": "ltc", "dogecoin": "doge", "bitcoincash": "bch",
+           "bsc": "bnb", "polygon": "pol", "tron": "trx"}
+
+
+def count_send(chain: str, ok: bool):
+    """One broadcast in hiderax_sends_total, labelled by ticker (btc, eth, bnb, ...) whoever sent it."""
+    chain = chain.lower()
+    sends.inc(1, TICKERS.get(chain, chain), "ok" if ok else "error")
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]):
+    registry.register_collector(collector)
+
+
+def instrument_session(session, chain: str):
+    """Record latency for a third-party requests.Session (e.g. tronpy's provider.sess)."""
+    def hook(response, *args, **kwargs):
+        from urllib.parse import urlsplit
+        http_duration.observe(response.elapsed.total_seconds(), urlsplit(response.url).netloc,
+                              response.request.method, str(response.status_code))
+        if response.url.endswith("/broadcasttransaction"):
+            ok = response.ok and '"result":true' in response.text.replace(" ", "")
+            count_send(chain, ok)
+    if not getattr(session, "_hiderax_metered", False):
+        session.hooks["response"].append(hook)
+        session._hiderax_metered = True
+
+
+def instrument_bitcoinlib():
+    """Count broadcasts made through bitcoinlib's Service (wallet sends and raw pushes)."""
+    from bitcoinlib.services.services import Service
+    original = Service.sendrawtransaction
+    if getattr(original, "__metered__", False):
+        return
+
+    def sendrawtransaction(self, rawtx):
+        res = original(self, rawtx)
+        count_send(self.network.name, bool(res and res.get("txid")))
+        return res
+
+    sendrawtransaction.__metered__ = True
+    Service.sendrawtransaction = sendrawtransaction
+
+
+# ---------- Endpoint ----------
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = registry.render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+_server: Optional[ThreadingHTTPServer] = None
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    global _server
+    if _server is None:
+        _server = ThreadingHTTPServer((host, port), _Handler)
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _server
+
+
+if os.environ.get(PORT_ENV):
+    try:
+        serve(int(os.environ[PORT_ENV]))
+    except OSError as e:  # another wallet process already owns the port
+        print(f"metrics endpoint not started: {e}", file=sys.stderr)
+
+
+# ---------- Benchmark ----------
+def benchmark(n: int = 200_000):
+    from rich.console import Console
+    from rich.table import Table
+
+    counter = Counter("bench_total", "bench", ("chain", "result"))
+    histogram = Histogram("bench_seconds", "bench", ("host", "method", "status"))
+    table = Table(title=f"📈 Metrics overhead ({n:,} updates)", header_style="bold magenta")
+    for col in ("Operation", "ns / update", "% of a 10 ms RPC"):
+        table.add_column(col)
+    for label, op in (("Counter.inc", lambda: counter.inc(1, "eth", "ok")),
+                      ("Histogram.observe", lambda: histogram.observe(0.042, "rpc.example", "POST", "200"))):
+        start = time.perf_counter()
+        for _ in range(n):
+            op()
+        per_op = (time.perf_counter() - start) / n
+        table.add_row(label, f"{per_op * 1e9:,.0f}", f"{per_op / 0.010 * 100:.4f}%")
+    start = time.perf_counter()
+    registry.render()
+    table.add_row("scrape (render all)", f"{(time.perf_counter() - start) * 1e9:,.0f}", "-")
+    Console().print(table)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark()
+    else:
+        print(__doc__)
@@ -0,0 +1,83 @@
+"""
+Shared HTTP client for explorer / price / RPC calls.
+- One pooled requests.Session
+- Every request is paced by the provider's token bucket (rate_limit)
+- 429 and 5xx are retried with backoff, honouring Retry-After
+- Anything that still fails raises RequestFailed; callers never get a silent default
+"""
+import time
+from typing import Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import metrics
+import profiler
+import rate_limit
+
+TIMEOUT = 15.0
+MAX_RETRIES = 3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_maxsize=16))
+session.mount("http://", HTTPAdapter(pool_maxsize=16))
+
+
+class RequestFailed(Exception):
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+def retry_after(res: requests.Response, attempt: int) -> float:
+    """Seconds a throttled reply asks us to wait: its Retry-After, else exponential back-off."""
+    value = res.headers.get("Retry-After", "")
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return float(2 ** attempt)
+
+
+def request(method: str, url: str, retries: int = MAX_RETRIES,
+            http: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+    """
+    Rate-limited request with retries. Returns the final response (any status);
+    raises RequestFailed only for connection errors that outlive the retries.
+    """
+    http = http or session
+    kwargs.setdefault("timeout", TIMEOUT)
+    bucket = rate_limit.bucket_for(url)
+    host = rate_limit.host_of(url)
+
+    with profiler.span(f"http {method} {host}", category="rpc"):
+        for attempt in range(retries + 1):
+            bucket.acquire()
+            start = time.perf_counter()
+            try:
+                res = http.request(method, url, **kwargs)
+            except requests.RequestException as e:
+                metrics.http_duration.observe(time.perf_counter() - start, host, method, "error")
+                if attempt < retries:
+                    time.sleep(2 ** attempt)
+                    continue
+                raise RequestFailed(f"{method} {url} failed: {e}") from e
+            metrics.http_duration.observe(time.perf_counter() - start, host, method, str(res.status_code))
+
+            if res.status_code == 429:
+                bucket.pause(retry_after(res, attempt))
+            if res.status_code in RETRY_STATUSES and attempt < retries:
+                if res.status_code != 429:
+                    time.sleep(2 ** attempt)
+                continue
+            return res
+
+
+def get_json(url: str, **kwargs) -> Any:
+    res = request("GET", url, **kwargs)
+    if res.status_code != 200:
+        raise RequestFailed(f"GET {url} -> HTTP {res.status_code}: {res.text[:200]}", res.status_code)
+    try:
+        return res.json()
+    except ValueError as e:
+        raise RequestFailed(f"GET {url} returned invalid JSON") from e
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Air-gapped batch signing for BTC / LTC / DOGE and EVM chains (ETH / BNB / POL).
+1. Online:  build a batch file of unsigned transactions (UTXOs, nonces and fees resolved)
+2. Offline: sign the whole batch file in one pass, no network access needed
+3. Online:  broadcast every signed transaction concurrently
+Batch files are plain JSON so they can be carried over USB.
+Payout lists are CSV files with one "address,amount" per line.
+"""
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Tuple
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.prompt import Prompt
+from rich.table import Table
+
+import coin_select
+import profiler
+import tracker
+
+console = Console()
+
+BATCH_VERSION = 1
+BATCH_DIR = "batches"
+MAX_OUTPUTS_PER_TX = 100  # UTXO payouts are grouped into multi-output transactions
+BROADCAST_WORKERS = 8
+
+UTXO_COINS = {"BTC": "btc", "LTC": "ltc", "DOGE": "doge"}
+EVM_COINS = {"ETH": ("eth", 1), "BNB": ("bnb", 56), "POL": ("pol", 137)}
+
+
+def coin_module(coin: str):
+    """Lazily import the coin's script so an offline box only needs that coin's SDK."""
+    name = UTXO_COINS.get(coin) or EVM_COINS[coin][0]
+    return __import__(name)
+
+
+# ---------- Batch files ----------
+def write_batch(batch: Dict[str, Any], stage: str) -> str:
+    os.makedirs(BATCH_DIR, exist_ok=True)
+    batch["stage"] = stage
+    path = os.path.join(BATCH_DIR, f"{batch['coin']}_{batch['created']}_{stage}.json")
+    with open(path, "w") as f:
+        json.dump(batch, f, indent=2)
+    return path
+
+
+def read_batch(path: str, stage: str) -> Dict[str, Any]:
+    with open(path) as f:
+        batch = json.load(f)
+    if batch.get("version") != BATCH_VERSION:
+        raise ValueError(f"Unsupported batch version: {batch.get('version')}")
+    if batch.get("stage") != stage:
+        raise ValueError(f"Expected a '{stage}' batch, got '{batch.get('stage')}'")
+    return batch
+
+
+def read_payouts(path: str) -> List[Tuple[str, Decimal]]:
+    payouts = []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if not row or row[0].strip().startswith("#"):
+                continue
+            payouts.append((row[0].strip(), Decimal(row[1].strip())))
+    if not payouts:
+        raise ValueError("Payout file is empty.")
+    return payouts
+
+
+def new_batch(coin: str) -> Dict[str, Any]:
+    return {"version": BATCH_VERSION, "coin": coin, "created": int(time.time()), "items": []}
+
+
+# ---------- UTXO chains (bitcoinlib) ----------
+def open_utxo_wallet(coin: str):
+    from bitcoinlib.wallets import Wallet
+    mod = coin_module(coin)
+    if not mod.wallet_exists():
+        raise FileNotFoundError(f"{coin} wallet not found.")
+    return Wallet(mod.WALLET_NAME, db_uri=f"sqlite:///{mod.DB_PATH}")
+
+
+def build_utxo_batch(coin: str, payouts: List[Tuple[str, Decimal]], fee_rate: int,
+                     exclude: Iterable[Tuple[str, int]] = ()) -> Dict[str, Any]:
+    """Online: pick disjoint inputs for every transaction so the whole batch can be signed offline.
+    `exclude` lists (txid, output_n) already spent by transactions the network may not show yet."""
+    from bitcoinlib.services.services import Service
+    w = open_utxo_wallet(coin)
+    w.utxos_update()
+    exclude = set(map(tuple, exclude))
+    index = coin_select.from_bitcoinlib(u for u in w.utxos(min_confirms=1) if (u["txid"], u["output_n"]) not in exclude)
+    fees = coin_select.fee_model(w.witness_type, fee_rate)
+    locktime = Service(network=w.network.name).blockcount() or 0
+
+    batch = new_batch(coin)
+    for n, start in enumerate(range(0, len(payouts), MAX_OUTPUTS_PER_TX)):
+        outputs = [(addr, int(amount * 100_000_000)) for addr, amount in payouts[start:start + MAX_OUTPUTS_PER_TX]]
+        try:
+            selection = coin_select.select(index, sum(v for _, v in outputs), fees, n_outputs=len(outputs))
+        except ValueError:
+            raise ValueError(f"Not enough confirmed {coin} UTXOs for transaction {n + 1}.")
+        for u in selection.utxos:
+            index.remove(u)  # keep inputs disjoint across the batch
+
+        batch["items"].append({
+            "id": f"{coin}-{n + 1}",
+            "outputs": outputs,
+            "inputs": [[u.txid, u.output_n, u.value, u.address] for u in selection.utxos],
+            "fee": selection.fee,
+            "locktime": locktime,
+        })
+    return batch
+
+
+def sign_utxo_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Offline: rebuild each transaction from the listed inputs and sign it with the wallet keys.
+    Built on bitcoinlib's Transaction rather than Wallet.transaction_create, which opens a
+    Service that asks the providers for the block height even when nothing is left to look up."""
+    from bitcoinlib.transactions import Transaction
+    w = open_utxo_wallet(batch["coin"])
+    for item in batch["items"]:
+        t = Transaction(network=w.network.name, witness_type=w.witness_type, locktime=item["locktime"],
+                        replace_by_fee=True)
+        keys = []
+        for txid, n, value, address in item["inputs"]:
+            keys.append(w.key(address).key())
+            t.add_input(txid, n, keys=keys[-1].public(), value=value, witness_type=w.witness_type)
+        for address, value in item["outputs"]:
+            t.add_output(value, address)
+        change = sum(value for _, _, value, _ in item["inputs"]) - sum(value for _, value in item["outputs"]) - item["fee"]
+        if change < 0:
+            raise ValueError(f"Inputs of {item['id']} don't cover its outputs and fee")
+        if change:  # coin_select leaves either nothing or at least DUST
+            t.add_output(change, w.get_key(change=1).address)
+        t.shuffle()  # like transaction_create: the change output's position gives nothing away
+        t.sign(keys)
+        t.txid = t.signature_hash()[::-1].hex()
+        if not t.verify():
+            raise ValueError(f"Signature check failed for {item['id']}")
+        item["txid"] = t.txid
+        item["raw"] = t.raw_hex()
+    return batch
+
+
+def broadcast_utxo(coin: str, raw: str) -> str:
+    from bitcoinlib.services.services import Service
+    network = {"BTC": "bitcoin", "LTC": "litecoin", "DOGE": "dogecoin"}[coin]
+    res = Service(network=network).sendrawtransaction(raw)
+    if not res or not res.get("txid"):
+        raise RuntimeError(f"Broadcast rejected: {res}")
+    return res["txid"]
+
+
+# ---------- EVM chains ----------
+def load_evm_wallet(coin: str) -> Dict[str, str]:
+    mod = coin_module(coin)
+    wallet = mod.load_wallet()
+    if not wallet:
+        raise FileNotFoundError(f"{coin} wallet not found.")
+    return wallet
+
+
+def evm_web3(coin: str):
+    mod = coin_module(coin)
+    return getattr(mod, "web3", None) or mod.w3
+
+
+def build_evm_batch(coin: str, payouts: List[Tuple[str, Decimal]], gas_price_gwei: Decimal,
+                    min_nonce: int = 0) -> Dict[str, Any]:
+    """Online: assign consecutive nonces so every transaction can be signed without the node.
+    `min_nonce` skips nonces already used by signed transactions the node hasn't seen yet."""
+    from web3 import Web3
+    w3 = evm_web3(coin)
+    _, chain_id = EVM_COINS[coin]
+    sender = load_evm_wallet(coin)["address"]
+    nonce = max(w3.eth.get_transaction_count(sender, "pending"), min_nonce)
+    gas_price = Web3.to_wei(gas_price_gwei, "gwei")
+
+    batch = new_batch(coin)
+    batch["sender"] = sender
+    for i, (to, amount) in enumerate(payouts):
+        batch["items"].append({
+            "id": f"{coin}-{i + 1}",
+            "tx": {
+                "to": Web3.to_checksum_address(to),
+                "value": Web3.to_wei(amount, "ether"),
+                "gas": 21000,
+                "gasPrice": gas_price,
+                "nonce": nonce + i,
+                "chainId": chain_id,
+            },
+        })
+    return batch
+
+
+def sign_evm_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+    """Offline: sign on every core via batch_signer; results keep the nonce order."""
+    from batch_signer import BatchSigner
+    wallet = load_evm_wallet(batch["coin"])
+    if wallet["address"].lower() != batch["sender"].lower():
+        raise ValueError("Batch was built for a different sender address.")
+    with BatchSigner("evm", wallet["private_key"]) as signer:
+        signed, _ = signer.sign([item["tx"] for item in batch["items"]])
+    for item, (tx_hash, raw) in zip(batch["items"], signed):
+        item["txid"] = tx_hash
+        item["raw"] = raw
+    return batch
+
+
+def broadcast_evm(coin: str, raw: str) -> str:
+    return "0x" + evm_web3(coin).eth.send_raw_transaction(raw).hex().removeprefix("0x")
+
+
+# ---------- Pipeline ----------
+def build_batch(coin: str, payouts, fee: Decimal, **kwargs) -> Dict[str, Any]:
+    if coin in UTXO_COINS:
+        return build_utxo_batch(coin, payouts, int(fee), **kwargs)
+    return build_evm_batch(coin, payouts, fee, **kwargs)
+
+
+def sign_batch(batch: Dict[str, Any]) -> Dict[str, Any]:
+    return sign_utxo_batch(batch) if batch["coin"] in UTXO_COINS else sign_evm_batch(batch)
+
+
+def broadcast_batch(batch: Dict[str, Any]) -> List[Tuple[str, str, str]]:
+    """Broadcast all signed items concurrently; returns (id, status, txid or error)."""
+    coin = batch["coin"]
+    send = broadcast_utxo if coin in UTXO_COINS else broadcast_evm
+
+    def one(item):
+        try:
+            return item["id"], "sent", send(coin, item["raw"])
+        except Exception as e:
+            return item["id"], "failed", str(e)
+
+    with ThreadPoolExecutor(max_workers=BROADCAST_WORKERS) as pool:
+        return list(pool.map(one, batch["items"]))
+
+
+# ---------- Benchmark ----------
+def bench_evm(n: int) -> float:
+    from eth_account import Account
+    acct = Account.create()
+    tx = {"to": acct.address, "value": 1, "gas": 21000, "gasPrice": 10 ** 9, "nonce": 0, "chainId": 1}
+    start = time.perf_counter()
+    for i in range(n):
+        tx["nonce"] = i
+        acct.sign_transaction(tx)
+    return n / (time.perf_counter() - start)
+
+
+def bench_utxo(network: str, witness_type: str, n: int) -> float:
+    from bitcoinlib.keys import HDKey
+    from bitcoinlib.transactions import Transaction
+    key = HDKey(network=network, witness_type=witness_type)
+    start = time.perf_counter()
+    for i in range(n):
+        t = Transaction(network=network, witness_type=witness_type)
+        t.add_input(os.urandom(32), i % 4, keys=key, value=100_000, witness_type=witness_type)
+        t.add_output(90_000, key.address())
+        t.sign(key)
+    return n / (time.perf_counter() - start)
+
+
+def benchmark(n: int = 200):
+    results = [
+        ("BTC", bench_utxo("bitcoin", "segwit", n)),
+        ("LTC", bench_utxo("litecoin", "segwit", n)),
+        ("DOGE", bench_utxo("dogecoin", "legacy", n)),
+        ("EVM (ETH/BNB/POL)", bench_evm(n)),
+    ]
+    table = Table(title=f"✍️ Signing Throughput ({n} tx each)", header_style="bold magenta")
+    table.add_column("Chain", style="cyan")
+    table.add_column("Signatures / sec", style="green", justify="right")
+    for chain, rate in results:
+        table.add_row(chain, f"{rate:,.0f}")
+    console.print(table)
+
+
+# ---------- CLI ----------
+ALL_COINS = list(UTXO_COINS) + list(EVM_COINS)
+
+
+def build_cli():
+    coin = Prompt.ask("[bold cyan]Coin[/bold cyan]", choices=ALL_COINS)
+    path = Prompt.ask("[bold cyan]Payout CSV (address,amount per line)[/bold cyan]")
+    fee_label = "Fee rate (sat/vbyte)" if coin in UTXO_COINS else "Gas price (Gwei)"
+    try:
+        fee = Decimal(Prompt.ask(f"[bold cyan]{fee_label}[/bold cyan]"))
+        batch = build_batch(coin, read_payouts(path), fee)
+    except Exception as e:
+        console.print(f"[red]❌ Could not build batch: {e}[/red]")
+        return
+    out = write_batch(batch, "unsigned")
+    console.print(Panel.fit(f"[green]✅ {len(batch['items'])} unsigned {coin} transaction(s)[/green]\n"
+                            f"[bold cyan]File:[/bold cyan] {out}\n"
+                            "Move this file to the offline machine and sign it there.",
+                            title="📦 Unsigned Batch"))
+
+
+def sign_cli():
+    path = Prompt.ask("[bold cyan]Unsigned batch file[/bold cyan]")
+    try:
+        batch = read_batch(path, "unsigned")
+        start = time.perf_counter()
+        sign_batch(batch)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        console.print(f"[red]❌ Signing failed: {e}[/red]")
+        return
+    out = write_batch(batch, "signed")
+    console.print(Panel.fit(f"[green]✅ Signed {len(batch['items'])} {batch['coin']} transaction(s) "
+                            f"in {elapsed:.2f}s[/green]\n[bold cyan]File:[/bold cyan] {out}",
+                            title="✍️ Signed Batch"))
+
+
+def broadcast_cli():
+    path = Prompt.ask("[bold cyan]Signed batch file[/bold cyan]")
+    try:
+        batch = read_batch(path, "signed")
+    except Exception as e:
+        console.print(f"[red]❌ {e}[/red]")
+        return
+    table = Table(title=f"📡 Broadcast {batch['coin']}", header_style="bold magenta")
+    table.add_column("Item", style="cyan")
+    table.add_column("Status")
+    table.add_column("TXID / Error", style="green", overflow="fold")
+    for item_id, status, detail in broadcast_batch(batch):
+        if status == "sent":
+            tracker.track_sent(batch["coin"], detail)
+        table.add_row(item_id, "[green]sent[/green]" if status == "sent" else "[red]failed[/red]", detail)
+    console.print(table)
+
+
+def main_menu():
+    while True:
+        console.print(Panel("[bold yellow]Offline Signing Pipeline[/bold yellow]",
+                            subtitle="📴 Build online • Sign offline • Broadcast online", expand=False))
+        console.print("[bold blue]1.[/bold blue] Build unsigned batch [dim](online)[/dim]")
+        console.print("[bold blue]2.[/bold blue] Sign batch [dim](offline)[/dim]")
+        console.print("[bold blue]3.[/bold blue] Broadcast signed batch [dim](online)[/dim]")
+        console.print("[bold blue]4.[/bold blue] Benchmark signing speed")
+        console.print("[bold blue]5.[/bold blue] Exit")
+
+        choice = Prompt.ask("\n[bold green]Select an option[/bold green]", choices=["1", "2", "3", "4", "5"])
+        if choice == "1":
+            build_cli()
+        elif choice == "2":
+            sign_cli()
+        elif choice == "3":
+            broadcast_cli()
+        elif choice == "4":
+            benchmark()
+        elif choice == "5":
+            console.print("[bold red]Goodbye![/bold red]")
+            break
+
+
+profiler.instrument(globals())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        benchmark(int(sys.argv[2]) if len(sys.argv) > 2 else 200)
+    else:
+        main_menu()
@@ -1,11 +1,15 @@
 import qrcode
-from web3 import Web3, Account
+from web3 import Web3
 from eth_account.messages import encode_defunct
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 import os
 import json
+import hd_evm
+import profiler
+import rpc_router
+import tracker
 
 console = Console()
 
@@ -15,7 +19,7 @@ POLYGON_RPC = f"https://polygon-mainnet.infura.io/v3/{INFURA_PROJECT_ID}"
 WALLET_DIR = "wallet_POL"
 WALLET_FILE = os.path.join(WALLET_DIR, "wallet.json")
 
-w3 = Web3(Web3.HTTPProvider(POLYGON_RPC))
+w3 = Web3(rpc_router.web3_provider("polygon", POLYGON_RPC))
 
 
 def create_wallet():
@@ -23,20 +27,20 @@ def create_wallet():
         console.print("[yellow]Wallet already exists. Use 'View Wallet' instead.[/yellow]")
         return
 
+    mnemonic = hd_evm.ensure_seed()
+    if mnemonic:
+        console.print(Panel.fit(f"[bold yellow]Write this down and store offline[/bold yellow]\n\n{mnemonic}",
+                                title="🧠 EVM Recovery Phrase (ETH • BNB • POL • USDT)", border_style="green"))
     os.makedirs(WALLET_DIR, exist_ok=True)
-    acct = Account.create()
 
-    # Save private key to local JSON file
-    wallet_data = {
-        "address": acct.address,
-        "private_key": acct._private_key.hex()
-    }
+    # index 0 of the shared EVM seed; the key is derived on load, not stored
+    wallet_data = hd_evm.wallet_info(0)
 
     with open(WALLET_FILE, "w") as f:
         json.dump(wallet_data, f, indent=4)
 
     console.print(
-        Panel.fit(f"[green]Wallet Created Successfully![/green]\nAddress: [bold cyan]{acct.address}[/bold cyan]"))
+        Panel.fit(f"[green]Wallet Created Successfully![/green]\nAddress: [bold cyan]{wallet_data['address']}[/bold cyan]"))
 
 
 def load_wallet():
@@ -46,7 +50,7 @@ def load_wallet():
 
     with open(WALLET_FILE, "r") as f:
         data = json.load(f)
-    return data
+    return hd_evm.unlock(data)
 
 
 def view_wallet():
@@ -96,12 +100,12 @@ def send_matic():
     sender_address = wallet['address']
 
     nonce = w3.eth.get_transaction_count(sender_address)
-    gas_price = w3.toWei(gas_price_gwei, 'gwei')
+    gas_price = w3.to_wei(gas_price_gwei, 'gwei')
 
     tx = {
         'nonce': nonce,
         'to': to_address,
-        'value': w3.toWei(amount, 'ether'),
+        'value': w3.to_wei(amount, 'ether'),
         'gas': 21000,
         'gasPrice': gas_price,
         'chainId': 137  # Polygon Mainnet Chain ID
@@ -109,8 +113,9 @@ def send_matic():
 
     signed_tx = w3.eth.account.sign_transaction(tx, private_key)
     try:
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = w3.eth.send_raw_transaction(getattr(signed_tx, "raw_transaction", None) or signed_tx.rawTransaction)
         console.print(Panel.fit(f"[green]Transaction sent![/green]\nTx hash: [bold]{tx_hash.hex()}[/bold]"))
+        tracker.track_sent("POL", tx_hash.hex())
     except Exception as e:
         console.print(f"[red]Error sending transaction:[/red] {e}")
 
@@ -142,5 +147,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
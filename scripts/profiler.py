@@ -0,0 +1,244 @@
+"""
+Timing spans for wallet actions.
+- Off by default and free when off: span() hands back a shared no-op and
+  instrument() leaves functions untouched
+- Turn on with HIDERAX_PROFILE=1 or a --profile flag on any script / main.py
+- Spans nest per call (also across rpc_router worker threads) and carry a
+  category: import, wallet, rpc, sign, render, input (waiting on the user), app
+- On exit each process writes PROFILE_DIR/<script>-<time>-<pid>.json (span tree
+  and per-name / per-category totals) and a matching .folded file of stacks
+  in the folded format used by flamegraph.pl and speedscope
+
+Usage in a script:
+    import profiler                 # with the other local imports; the import span
+                                    # still starts at process start
+    ...
+    profiler.instrument(globals())  # just before `if __name__ == "__main__":`
+
+    with profiler.span("rpc:getBalance", category="rpc", provider=url):
+        ...
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import Any, Callable, Dict, List, Optional
+
+ENV_VAR = "HIDERAX_PROFILE"
+PROFILE_DIR = os.environ.get("HIDERAX_PROFILE_DIR", "profiles")
+
+# function name fragment -> category, first match wins
+CATEGORY_RULES = [
+    ("sign", "sign"),
+    ("load", "wallet"),
+    ("wallet_exists", "wallet"),
+    ("open_", "wallet"),
+    ("save_", "wallet"),
+]
+
+
+def _process_started() -> float:
+    """perf_counter() at process start, so the import span also covers what was imported before us."""
+    try:  # Linux: start time in clock ticks since boot, on the same clock as perf_counter()
+        with open("/proc/self/stat") as f:
+            started = int(f.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        if 0 <= time.perf_counter() - started < 600:
+            return started
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return time.perf_counter() - time.process_time()  # elsewhere: startup is mostly CPU-bound
+
+
+_imported_at = _process_started()
+_started_wall = time.time()
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("hiderax_span", default=None)
+_roots: List["Span"] = []
+_lock = threading.Lock()
+_NOOP = nullcontext()
+
+enabled = False
+
+
+class Span:
+    __slots__ = ("name", "category", "attrs", "start", "duration", "children", "parent", "_token")
+
+    def __init__(self, name: str, category: str, attrs: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.category = category
+        self.attrs = attrs
+        self.parent = parent
+        self.children: List[Span] = []
+        self.start = 0.0
+        self.duration = 0.0
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.duration = time.perf_counter() - self.start
+        _current.reset(self._token)
+        if self.parent is not None:
+            self.parent.children.append(self)
+        else:
+            with _lock:
+                _roots.append(self)
+
+    @property
+    def self_time(self) -> float:
+        # children on other threads can overlap (hedged RPCs), so clamp at zero
+        return max(0.0, self.duration - sum(c.duration for c in self.children))
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "category": self.category,
+            "start_ms": round((self.start - _imported_at) * 1000, 3),
+            "duration_ms": round(self.duration * 1000, 3),
+            **({"attrs": self.attrs} if self.attrs else {}),
+            "children": [c.as_dict() for c in self.children],
+        }
+
+
+def span(name: str, category: str = "app", **attrs):
+    """Context manager timing a block; a shared no-op when profiling is off."""
+    if not enabled:
+        return _NOOP
+    return Span(name, category, attrs, _current.get())
+
+
+def _category_for(name: str) -> str:
+    for fragment, category in CATEGORY_RULES:
+        if fragment in name:
+            return category
+    return "app"
+
+
+def timed(func: Callable, name: Optional[str] = None, category: Optional[str] = None) -> Callable:
+    name = name or func.__name__
+    category = category or _category_for(name)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with Span(name, category, {}, _current.get()):
+            return func(*args, **kwargs)
+
+    wrapper.__profiled__ = True
+    return wrapper
+
+
+def instrument(namespace: Dict[str, Any]):
+    """Wrap every function defined in a script's module (and its console.print) in spans."""
+    if not enabled:
+        return
+    module = namespace.get("__name__")
+    if module == "__main__":
+        script = os.path.splitext(os.path.basename(namespace.get("__file__", "main")))[0]
+        _record("import", "import", _imported_at, time.perf_counter(), script=script)
+
+    for name, obj in list(namespace.items()):
+        if inspect.isfunction(obj) and obj.__module__ == module and not getattr(obj, "__profiled__", False):
+            namespace[name] = timed(obj)
+
+    console = namespace.get("console")
+    if console is not None and not getattr(console.print, "__profiled__", False):
+        console.print = timed(console.print, "render", "render")
+
+
+def _record(name: str, category: str, start: float, end: float, **attrs):
+    s = Span(name, category, attrs, _current.get())
+    s.start, s.duration = start, end - start
+    with _lock:
+        _roots.append(s)
+
+
+# ---------- Reports ----------
+def _walk(spans: List[Span], stack: tuple = ()):
+    for s in spans:
+        path = stack + (s.name,)
+        yield path, s
+        yield from _walk(s.children, path)
+
+
+def report() -> Dict[str, Any]:
+    with _lock:
+        roots = list(_roots)
+    by_name: Dict[str, Dict[str, float]] = defaultdict(lambda: {"count": 0, "total_ms": 0.0, "self_ms": 0.0})
+    by_category: Dict[str, float] = defaultdict(float)
+    for _, s in _walk(roots):
+        entry = by_name[s.name]
+        entry["count"] += 1
+        entry["total_ms"] += s.duration * 1000
+        entry["self_ms"] += s.self_time * 1000
+        by_category[s.category] += s.self_time * 1000
+    return {
+        "script": os.path.basename(sys.argv[0]),
+        "pid": os.getpid(),
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(_started_wall)),
+        "wall_ms": round((time.perf_counter() - _imported_at) * 1000, 3),
+        "categories": {k: round(v, 3) for k, v in sorted(by_category.items(), key=lambda kv: -kv[1])},
+        "spans": {k: {**v, "total_ms": round(v["total_ms"], 3), "self_ms": round(v["self_ms"], 3)}
+                  for k, v in sorted(by_name.items(), key=lambda kv: -kv[1]["total_ms"])},
+        "tree": [s.as_dict() for s in roots],
+    }
+
+
+def folded() -> str:
+    """One "a;b;c <self microseconds>" line per distinct stack."""
+    with _lock:
+        roots = list(_roots)
+    weights: Dict[str, int] = defaultdict(int)
+    for path, s in _walk(roots):
+        weights[";".join(path)] += int(s.self_time * 1_000_000)
+    return "".join(f"{stack} {us}\n" for stack, us in weights.items() if us > 0)
+
+
+def write_profile() -> Optional[str]:
+    if not _roots:
+        return None
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    script = os.path.splitext(os.path.basename(sys.argv[0]))[0] or "python"
+    base = os.path.join(PROFILE_DIR, f"{script}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+    with open(base + ".json", "w") as f:
+        json.dump(report(), f, indent=2)
+    with open(base + ".folded", "w") as f:
+        f.write(folded())
+    return base
+
+
+def _on_exit():
+    path = write_profile()
+    if path:
+        print(f"⏱  profile written to {path}.json (+ .folded)", file=sys.stderr)
+
+
+def _profile_prompts():
+    # time spent waiting for the user shouldn't look like slow code
+    from rich.prompt import PromptBase
+    ask = PromptBase.ask.__func__
+    PromptBase.ask = classmethod(timed(ask, "prompt", "input"))
+
+
+def enable():
+    global enabled
+    if enabled:
+        return
+    enabled = True
+    os.environ[ENV_VAR] = "1"  # child scripts launched from main.py inherit it
+    _profile_prompts()
+    atexit.register(_on_exit)
+
+
+if "--profile" in sys.argv:
+    sys.argv.remove("--profile")
+    enable()
+elif os.environ.get(ENV_VAR, "") not in ("", "0"):
+    enable()
@@ -0,0 +1,98 @@
+"""
+Client-side token-bucket rate limiting, one bucket per provider host.
+Callers reserve a token and sleep until their turn, so concurrent requests
+queue in arrival order and are paced just under the provider's quota.
+A 429 with Retry-After pauses the whole bucket, not just the caller.
+"""
+import threading
+import time
+from typing import Dict, Tuple
+from urllib.parse import urlsplit
+
+import metrics
+
+# host -> (requests per second, burst)
+QUOTAS: Dict[str, Tuple[float, int]] = {
+    "api.blockcypher.com": (3, 3),  # free tier: 3 req/s, 100 req/h
+    "api.coinbase.com": (10, 10),
+    "api.mainnet-beta.solana.com": (4, 8),
+    "bsc-dataseed.binance.org": (8, 16),
+    "mainnet.infura.io": (10, 20),
+    "polygon-mainnet.infura.io": (10, 20),
+}
+DEFAULT_QUOTA = (10, 20)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _reserve(self, tokens: float) -> float:
+        """Take tokens (possibly going into debt) and return how long the caller must wait."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            self._tokens = min(self.burst, self._tokens + (start - self._updated) * self.rate)
+            self._updated = start
+            self._tokens -= tokens
+            wait = start - now
+            if self._tokens < 0:
+                wait += -self._tokens / self.rate
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until the request may be sent; returns the time spent waiting."""
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float):
+        """Provider told us to back off (429 / Retry-After): hold every caller."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+    @property
+    def queued(self) -> float:
+        """Roughly how many reserved requests are still waiting for a token."""
+        with self._lock:
+            return max(0.0, -self._tokens)
+
+
+_buckets: Dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def set_quota(host: str, rate: float, burst: int):
+    with _buckets_lock:
+        QUOTAS[host] = (rate, burst)
+        _buckets.pop(host, None)
+
+
+def bucket_for(url: str) -> TokenBucket:
+    host = host_of(url)
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(*QUOTAS.get(host, DEFAULT_QUOTA))
+        return bucket
+
+
+def _collect():
+    with _buckets_lock:
+        buckets = list(_buckets.items())
+    yield ("hiderax_rate_limit_queued", "gauge", "Requests waiting for a token, per provider host",
+           [({"host": host}, bucket.queued) for host, bucket in buckets])
+
+
+metrics.register_collector(_collect)
@@ -0,0 +1,39 @@
+"""
+Wallet registry shared by the launchers (main.py, test.py).
+Menu key -> display name, network label and the script to run.
+"""
+import platform
+from typing import Dict, List, Optional, Tuple
+
+WALLETS: Dict[str, Dict[str, str]] = {
+    "1": {"name": "ADA Wallet", "network": "Cardano [Receive-Only]", "script": "ada-atom.py"},
+    "2": {"name": "ATOM Wallet", "network": "Cosmos [Receive-Only]", "script": "ada-atom.py"},
+    "3": {"name": "BCH Wallet", "network": "Bitcoin Cash Network", "script": "bch.py"},
+    "4": {"name": "BNB Wallet", "network": "Binance Smart Chain", "script": "bnb.py"},
+    "5": {"name": "BTC Wallet", "network": "Bitcoin Network", "script": "btc.py"},
+    "6": {"name": "DASH Wallet", "network": "Dash [Receive-Only]", "script": "dash.py"},
+    "7": {"name": "DOGE Wallet", "network": "Dogecoin Network", "script": "doge.py"},
+    "8": {"name": "ETH Wallet", "network": "Ethereum Network", "script": "eth.py"},
+    "9": {"name": "LTC Wallet", "network": "Litecoin Network", "script": "ltc.py"},
+    "10": {"name": "POL Wallet", "network": "Polygon Network", "script": "pol.py"},
+    "11": {"name": "SOL Wallet", "network": "Solana Network", "script": "sol.py"},
+    "12": {"name": "USDT Wallet", "network": "[TRC20] | [ERC20]", "script": "usdt.py"},
+    "13": {"name": "XMR Wallet", "network": "Monero [Receive-Only • Linux]", "script": "xmr.py"},
+    "14": {"name": "ZEC Wallet", "network": "Zcash [Receive-Only]", "script": "zec.py"},
+    "15": {"name": "Offline Signing", "network": "Air-gapped batch pipeline", "script": "offline.py"},
+    "16": {"name": "UTXO Consolidation", "network": "BTC • LTC • DOGE • BCH", "script": "consolidate.py"},
+}
+
+EXIT_KEY = "0"
+
+
+def menu_entries() -> List[Tuple[str, Dict[str, str]]]:
+    """Wallets in menu order (by name)."""
+    return sorted(WALLETS.items(), key=lambda x: x[1]["name"].lower())
+
+
+def unsupported(info: Dict[str, str]) -> Optional[str]:
+    """Why a wallet can't run on this platform, or None."""
+    if info["name"].startswith("XMR") and platform.system() != "Linux":
+        return "XMR support is currently available for Linux only."
+    return None
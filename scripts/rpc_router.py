@@ -0,0 +1,326 @@
+"""
+Multi-provider RPC router.
+- One router per chain over a configurable provider list
+- Tracks per-provider latency (EWMA) and error rate
+- Routes to the fastest healthy provider, hedges slow requests to the next one
+  and fails over on errors; failing providers cool down for a while
+- Requests are paced per provider host by rate_limit (via net)
+- Metrics via router.metrics() / all_metrics(), or `python3 rpc_router.py`
+
+Provider lists come from, in order:
+  HIDERAX_RPC_<CHAIN>   comma-separated URLs (e.g. HIDERAX_RPC_ETH)
+  HIDERAX_RPC_CONFIG    path to a JSON file {"eth": ["https://..."], ...}
+  the script's own URL followed by PUBLIC_PROVIDERS[chain]
+"""
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import http_cache
+import metrics
+import net
+import profiler
+
+PUBLIC_PROVIDERS: Dict[str, List[str]] = {
+    "eth": ["https://ethereum-rpc.publicnode.com", "https://cloudflare-eth.com"],
+    "bsc": ["https://bsc-dataseed1.defibit.io/", "https://bsc-rpc.publicnode.com"],
+    "polygon": ["https://polygon-rpc.com", "https://polygon-bor-rpc.publicnode.com"],
+    "sol": ["https://solana-rpc.publicnode.com"],
+    "dash": [],
+}
+
+HEDGE_AFTER = 1.5  # seconds before a slow request is also sent to the next provider
+TIMEOUT = 15.0
+COOLDOWN = 30.0  # seconds a provider is skipped after repeated failures
+FAILS_BEFORE_COOLDOWN = 3
+EWMA_ALPHA = 0.3
+SEND_METHODS = {"eth_sendRawTransaction", "sendTransaction"}  # counted in metrics.sends
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="rpc-router")
+
+
+class RouterError(Exception):
+    pass
+
+
+class ProviderStats:
+    def __init__(self, url: str):
+        self.url = url
+        self.latency: Optional[float] = None  # EWMA seconds, None until first success
+        self.requests = 0
+        self.errors = 0
+        self.hedges = 0
+        self.consecutive_errors = 0
+        self.down_until = 0.0
+        self.last_error = ""
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    @property
+    def error_rate(self) -> float:
+        return self.errors / self.requests if self.requests else 0.0
+
+    def score(self) -> float:
+        # Unmeasured providers score 0 so each one gets tried early
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1 + 4 * self.error_rate)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": round(self.error_rate, 4),
+            "hedges": self.hedges,
+            "last_error": self.last_error,
+        }
+
+
+class RPCRouter:
+    def __init__(self, chain: str, providers: Sequence[str], hedge_after: float = HEDGE_AFTER,
+                 timeout: float = TIMEOUT, cooldown: float = COOLDOWN):
+        if not providers:
+            raise ValueError(f"No RPC providers configured for {chain}")
+        self.chain = chain
+        self.hedge_after = hedge_after
+        self.timeout = timeout
+        self.cooldown = cooldown
+        self.providers = [ProviderStats(url) for url in providers]
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    # ---------- Stats ----------
+    def _record(self, stats: ProviderStats, elapsed: float, error: Optional[Exception]):
+        metrics.rpc_provider_duration.observe(elapsed, self.chain, stats.url, "error" if error else "ok")
+        with self._lock:
+            stats.requests += 1
+            if error is None:
+                stats.latency = elapsed if stats.latency is None else \
+                    EWMA_ALPHA * elapsed + (1 - EWMA_ALPHA) * stats.latency
+                stats.consecutive_errors = 0
+                return
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            stats.last_error = str(error)[:200]
+            if stats.consecutive_errors >= FAILS_BEFORE_COOLDOWN:
+                stats.down_until = time.monotonic() + self.cooldown
+
+    def ranked(self) -> List[ProviderStats]:
+        with self._lock:
+            healthy = [p for p in self.providers if p.healthy]
+            pool = healthy or list(self.providers)  # all down: still try, best first
+            return sorted(pool, key=lambda p: p.score())
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"chain": self.chain, "providers": [p.as_dict() for p in self.providers]}
+
+    # ---------- Execution ----------
+    def _timed(self, stats: ProviderStats, op: Callable[[str], Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            with profiler.span("provider", category="rpc", url=stats.url):
+                result = op(stats.url)
+        except Exception as e:
+            self._record(stats, time.perf_counter() - start, e)
+            raise
+        self._record(stats, time.perf_counter() - start, None)
+        return result
+
+    def execute(self, op: Callable[[str], Any]) -> Any:
+        """
+        Run op(provider_url) on the best provider. If it hasn't answered after
+        hedge_after seconds the next provider is raced against it; errors fail over.
+        """
+        candidates = self.ranked()
+        pending = {}
+        last_error: Optional[Exception] = None
+
+        def launch():
+            stats = candidates.pop(0)
+            # copy the context so provider spans nest under the caller's span
+            pending[_executor.submit(contextvars.copy_context().run, self._timed, stats, op)] = stats
+            return stats
+
+        current = launch()
+        while pending:
+            done, _ = wait(pending, timeout=self.hedge_after if candidates else None,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                # Slow provider: rank it down now instead of after its reply arrives
+                with self._lock:
+                    current.hedges += 1
+                    current.latency = max(current.latency or 0.0, self.hedge_after)
+                current = launch()
+                continue
+            for future in done:
+                pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    last_error = e
+                    if candidates:
+                        current = launch()
+        raise RouterError(f"All {self.chain} providers failed: {last_error}") from last_error
+
+    # ---------- HTTP helpers ----------
+    def request(self, method: str, path: str = "", cached: bool = False, label: str = "", **kwargs) -> Any:
+        """
+        HTTP request against <provider><path>; non-2xx counts as a provider error.
+        cached=True serves GETs from / revalidates them against http_cache.
+        label names the profiler span (e.g. the JSON-RPC method).
+        """
+        def op(base_url: str):
+            # no retries here: a throttled or failing provider is handled by failover
+            if cached and method == "GET":
+                res = http_cache.fetch(base_url + path, retries=0, timeout=self.timeout, **kwargs)
+            else:
+                res = net.request(method, base_url + path, retries=0, timeout=self.timeout, **kwargs)
+            res.raise_for_status()
+            return res.json()
+        name = label or method
+        start = time.perf_counter()
+        try:
+            with profiler.span(f"rpc:{self.chain} {label or method + ' ' + path}".rstrip(), category="rpc"):
+                reply = self.execute(op)
+        except RouterError:
+            if name in SEND_METHODS:
+                metrics.count_send(self.chain, False)
+            raise
+        finally:
+            metrics.rpc_duration.observe(time.perf_counter() - start, self.chain, name)
+        if name in SEND_METHODS:
+            metrics.count_send(self.chain, not (isinstance(reply, dict) and "error" in reply))
+        return reply
+
+    def get_json(self, path: str = "", **kwargs) -> Any:
+        return self.request("GET", path, **kwargs)
+
+    def post_json(self, payload: Any, path: str = "") -> Any:
+        label = payload.get("method", "") if isinstance(payload, dict) else f"batch[{len(payload)}]"
+        return self.request("POST", path, label=label, json=payload)
+
+    def call(self, method: str, params: Optional[list] = None) -> Any:
+        """Single JSON-RPC call; JSON-RPC errors are raised, not treated as provider faults."""
+        reply = self.post_json({"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params or []})
+        if "error" in reply:
+            raise RouterError(f"{method}: {reply['error']}")
+        return reply["result"]
+
+
+# ---------- Registry ----------
+_routers: Dict[str, RPCRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def configured_providers(chain: str, primary: Optional[str] = None) -> List[str]:
+    env = os.environ.get(f"HIDERAX_RPC_{chain.upper()}")
+    if env:
+        return [u.strip() for u in env.split(",") if u.strip()]
+
+    config_path = os.environ.get("HIDERAX_RPC_CONFIG")
+    if config_path and os.path.exists(config_path):
+        with open(config_path) as f:
+            urls = json.load(f).get(chain)
+        if urls:
+            return list(urls)
+
+    urls = ([primary] if primary else []) + PUBLIC_PROVIDERS.get(chain, [])
+    return list(dict.fromkeys(urls))
+
+
+def get_router(chain: str, primary: Optional[str] = None) -> RPCRouter:
+    """Process-wide router for a chain; `primary` is the script's own default URL."""
+    with _routers_lock:
+        router = _routers.get(chain)
+        if router is None:
+            router = _routers[chain] = RPCRouter(chain, configured_providers(chain, primary))
+        return router
+
+
+def all_metrics() -> List[Dict[str, Any]]:
+    with _routers_lock:
+        routers = list(_routers.values())
+    return [r.metrics() for r in routers]
+
+
+def _collect():
+    with _routers_lock:
+        routers = list(_routers.values())
+    up, latency, hedges = [], [], []
+    for router in routers:
+        with router._lock:
+            for p in router.providers:
+                labels = {"chain": router.chain, "provider": p.url}
+                up.append((labels, 1 if p.healthy else 0))
+                hedges.append((labels, p.hedges))
+                if p.latency is not None:
+                    latency.append((labels, p.latency))
+    yield "hiderax_rpc_provider_up", "gauge", "1 if the provider is not cooling down", up
+    yield "hiderax_rpc_provider_latency_seconds", "gauge", "EWMA latency used for routing", latency
+    yield "hiderax_rpc_provider_hedges_total", "counter", "Requests hedged away from the provider", hedges
+
+
+metrics.register_collector(_collect)
+
+
+def web3_provider(chain: str, primary: Optional[str] = None):
+    """A web3.py provider that sends every request through the chain's router."""
+    from web3.providers.base import JSONBaseProvider
+
+    class RouterProvider(JSONBaseProvider):
+        def __init__(self, router: RPCRouter):
+            super().__init__()
+            self.router = router
+
+        def _post(self, body: bytes, label: str):
+            return self.router.request("POST", data=body, label=label,
+                                       headers={"Content-Type": "application/json"})
+
+        def make_request(self, method, params):
+            return self._post(self.encode_rpc_request(method, params), method)
+
+        def make_batch_request(self, requests_):
+            return self._post(self.encode_batch_rpc_request(requests_), f"batch[{len(requests_)}]")
+
+    return RouterProvider(get_router(chain, primary))
+
+
+PROBES = {
+    "eth": ("eth_blockNumber", []),
+    "bsc": ("eth_blockNumber", []),
+    "polygon": ("eth_blockNumber", []),
+    "sol": ("getHealth", []),
+}
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    for chain, (method, params) in PROBES.items():
+        router = get_router(chain)
+        for _ in range(len(router.providers) * 2):
+            try:
+                router.call(method, params)
+            except RouterError:
+                pass
+
+    table = Table(title="RPC Providers", header_style="bold magenta")
+    for col in ("Chain", "Provider", "Healthy", "Latency (ms)", "Requests", "Errors", "Hedges"):
+        table.add_column(col)
+    for m in all_metrics():
+        for p in m["providers"]:
+            table.add_row(m["chain"], p["url"], "✅" if p["healthy"] else "❌", str(p["latency_ms"]),
+                          str(p["requests"]), str(p["errors"]), str(p["hedges"]))
+    Console().print(table)
@@ -0,0 +1,350 @@
+"""
+Persistent send queue for BTC / LTC / DOGE and EVM chains (ETH / BNB / POL).
+- Jobs live in SQLite (WAL) at DB_PATH (scripts/sends/, next to the wallets
+  whatever the working directory; HIDERAX_SEND_DB overrides it) and move
+  queued -> signed -> broadcast -> confirmed, or end as failed with the last
+  error kept
+- Every job has an idempotency key: enqueueing the same key again returns the
+  existing job instead of paying twice (a different payout under a used key is
+  refused)
+- A worker per coin takes up to BATCH_SIZE queued jobs, builds and signs them
+  in one pass through offline.py (consecutive EVM nonces, disjoint UTXO inputs
+  or one multi-output UTXO transaction) and stores the raw transactions before
+  broadcasting them, WORKERS at a time
+- Nonces and UTXO inputs used by the queue's own unconfirmed transactions are
+  never handed out again, even when the node doesn't show them yet
+- A failed broadcast is retried with backoff by re-sending the stored raw
+  transaction, so a retry can never spend twice. New jobs of a coin are not
+  signed while any of its signed jobs is still unsent (nonces, inputs)
+- "nonce too low" only says some transaction used the nonce: the job counts as
+  broadcast once the node returns our own transaction by hash; otherwise it is
+  retried and finally fails with the collision as its error
+- Confirmations come from tracker.py through mark_confirmed / mark_failed,
+  fee bumps through replace_tx
+
+`python3 send_queue.py add <coin> <to> <amount> [fee] [key] | run [--once] | list [status]`
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional
+
+import offline
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("HIDERAX_SEND_DB", os.path.join(BASE_DIR, "sends", "send_queue.db"))
+BATCH_SIZE = 50  # jobs signed per pass
+WORKERS = int(os.environ.get("HIDERAX_SEND_WORKERS", "4"))  # concurrent broadcasts per coin
+MAX_ATTEMPTS = 8
+BACKOFF = 5.0  # seconds, doubled per attempt
+POLL_INTERVAL = 2.0
+
+QUEUED, SIGNED, BROADCAST, CONFIRMED, FAILED = "queued", "signed", "broadcast", "confirmed", "failed"
+UTXO_NETWORKS = {"BTC": "bitcoin", "LTC": "litecoin", "DOGE": "dogecoin"}
+# offline.UTXO_COINS + offline.EVM_COINS, spelled out: offline imports tracker, which imports
+# this module, so nothing here may read offline's attributes at import time
+COINS = list(UTXO_NETWORKS) + ["ETH", "BNB", "POL"]
+
+# node replies meaning our exact transaction is already in the mempool or a block
+ALREADY_SENT = ("already known", "known transaction", "already in block chain", "txn-already-known",
+                "txn-already-in-mempool", "transaction already exists")
+NONCE_USED = "nonce too low"  # ours, or another transaction with the same nonce
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    coin TEXT NOT NULL,
+    to_address TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    fee TEXT,
+    status TEXT NOT NULL,
+    txid TEXT,
+    raw TEXT,
+    sender TEXT,
+    nonce INTEGER,
+    inputs TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL DEFAULT 0,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (coin, status, next_attempt);
+CREATE INDEX IF NOT EXISTS jobs_by_txid ON jobs (txid);
+"""
+
+_local = threading.local()
+_wake = threading.Event()
+_thread: Optional[threading.Thread] = None
+
+
+# ---------- Store ----------
+def db() -> sqlite3.Connection:
+    """This thread's connection (WAL: readers never block the writer)."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        os.makedirs(os.path.dirname(DB_PATH) or ".", exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        _local.conn = conn
+    return conn
+
+
+@contextlib.contextmanager
+def _transaction():
+    conn = db()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+def _update(job_ids: Iterable[int], **fields):
+    ids = list(job_ids)
+    if not ids:
+        return
+    fields["updated"] = time.time()
+    columns = ", ".join(f"{name} = ?" for name in fields)
+    db().execute(f"UPDATE jobs SET {columns} WHERE id IN ({','.join('?' * len(ids))})", [*fields.values(), *ids])
+
+
+def get(job_id: int) -> Optional[Dict[str, Any]]:
+    row = db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+    return dict(row) if row else None
+
+
+def jobs(status: Optional[str] = None, coin: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    query, args = "SELECT * FROM jobs WHERE 1=1", []
+    if status:
+        query, args = query + " AND status = ?", args + [status]
+    if coin:
+        query, args = query + " AND coin = ?", args + [coin]
+    return [dict(r) for r in db().execute(query + " ORDER BY id DESC LIMIT ?", args + [limit])]
+
+
+def validate_address(coin: str, address: str):
+    """Reject a recipient up front, so one bad address can't hold up a signing batch."""
+    if coin in offline.UTXO_COINS:
+        from bitcoinlib.keys import Address
+        network = UTXO_NETWORKS[coin]
+        try:
+            parsed = Address.parse(address).network.name
+        except Exception as e:
+            raise ValueError(f"Invalid {coin} address: {e}")
+        if parsed != network:
+            raise ValueError(f"{address} is a {parsed} address, not {network}.")
+    else:
+        from web3 import Web3
+        if not Web3.is_address(address):
+            raise ValueError(f"Invalid {coin} address: {address}")
+
+
+def enqueue(coin: str, to: str, amount: Decimal, fee: Optional[Decimal] = None,
+            key: Optional[str] = None) -> Dict[str, Any]:
+    """Queue a payout; the same idempotency key always maps to the same job."""
+    coin = coin.upper()
+    if coin not in COINS:
+        raise ValueError(f"Unsupported coin: {coin}. Choose from {', '.join(COINS)}.")
+    if Decimal(amount) <= 0:
+        raise ValueError("Amount must be positive.")
+    validate_address(coin, to)
+    key = key or uuid.uuid4().hex
+    now = time.time()
+    conn = db()
+    conn.execute("INSERT OR IGNORE INTO jobs (idempotency_key, coin, to_address, amount, fee, status, created, updated)"
+                 " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                 (key, coin, to, str(amount), None if fee is None else str(fee), QUEUED, now, now))
+    job = dict(conn.execute("SELECT * FROM jobs WHERE idempotency_key = ?", (key,)).fetchone())
+    if (job["coin"], job["to_address"], Decimal(job["amount"])) != (coin, to, Decimal(amount)):
+        raise ValueError(f"Idempotency key {key!r} was already used for a different payout (job {job['id']}).")
+    _wake.set()
+    return job
+
+
+def mark_confirmed(txid: str):
+    _update([r["id"] for r in db().execute("SELECT id FROM jobs WHERE txid = ? AND status = ?", (txid, BROADCAST))],
+            status=CONFIRMED, error=None)
+
+
+def replace_tx(old_txid: str, new_txid: str, raw: Optional[str] = None):
+    """A broadcast transaction was replaced (fee bump), or a replaced version got mined instead."""
+    fields = {"txid": new_txid} if raw is None else {"txid": new_txid, "raw": raw}
+    _update([r["id"] for r in db().execute("SELECT id FROM jobs WHERE txid = ? AND status = ?",
+                                           (old_txid, BROADCAST))], **fields)
+
+
+def mark_failed(txid: str, error: str):
+    """The chain rejected a broadcast transaction (e.g. reverted); its jobs are not retried."""
+    _update([r["id"] for r in db().execute("SELECT id FROM jobs WHERE txid = ? AND status = ?", (txid, BROADCAST))],
+            status=FAILED, error=error)
+
+
+# ---------- Worker ----------
+def default_fee(coin: str) -> Decimal:
+    """Network estimate: sat/vB for UTXO coins, gwei for EVM."""
+    if coin in offline.UTXO_COINS:
+        from bitcoinlib.services.services import Service
+        return Decimal(max(1, Service(network=UTXO_NETWORKS[coin]).estimatefee(blocks=3) // 1000))
+    return Decimal(offline.evm_web3(coin).eth.gas_price) / Decimal(10 ** 9)
+
+
+def _retry(job_ids: List[int], attempts: int, error: str, status: str):
+    """Back off, or give up after MAX_ATTEMPTS."""
+    if attempts >= MAX_ATTEMPTS:
+        _update(job_ids, status=FAILED, attempts=attempts, error=error)
+    else:
+        _update(job_ids, status=status, attempts=attempts, error=error,
+                next_attempt=time.time() + BACKOFF * 2 ** (attempts - 1))
+
+
+def _spent_by_queue(coin: str) -> Dict[str, Any]:
+    """What our own unconfirmed transactions already use; a lagging node may not show it yet."""
+    if coin in offline.UTXO_COINS:
+        rows = db().execute("SELECT DISTINCT inputs FROM jobs WHERE coin = ? AND status IN (?, ?)",
+                            (coin, SIGNED, BROADCAST))
+        return {"exclude": [(txid, n) for r in rows for txid, n, *_ in json.loads(r["inputs"] or "[]")]}
+    sender = offline.load_evm_wallet(coin)["address"]
+    last = db().execute("SELECT MAX(nonce) FROM jobs WHERE coin = ? AND sender = ? AND status IN (?, ?, ?)",
+                        (coin, sender, SIGNED, BROADCAST, CONFIRMED)).fetchone()[0]
+    return {"min_nonce": 0 if last is None else last + 1}
+
+
+def _sign(coin: str) -> int:
+    """Sign the next batch of queued jobs of one coin (all sharing one fee); returns how many."""
+    rows = db().execute("SELECT * FROM jobs WHERE coin = ? AND status = ? AND next_attempt <= ? ORDER BY id LIMIT ?",
+                        (coin, QUEUED, time.time(), BATCH_SIZE)).fetchall()
+    rows = [r for r in rows if r["fee"] == rows[0]["fee"]] if rows else []
+    if not rows:
+        return 0
+    ids = [r["id"] for r in rows]
+    try:
+        fee = Decimal(rows[0]["fee"]) if rows[0]["fee"] is not None else default_fee(coin)
+        batch = offline.build_batch(coin, [(r["to_address"], Decimal(r["amount"])) for r in rows], fee,
+                                    **_spent_by_queue(coin))
+        offline.sign_batch(batch)
+    except Exception as e:  # provider trouble, or funds still unconfirmed; gives up after MAX_ATTEMPTS
+        _retry(ids, rows[0]["attempts"] + 1, f"sign: {e}", QUEUED)
+        return len(ids)
+
+    with _transaction():  # one transaction: all raw transactions are on disk before any is broadcast
+        if coin in offline.UTXO_COINS:
+            # each item is one multi-output transaction paying its slice of jobs
+            for item, start in zip(batch["items"], range(0, len(rows), offline.MAX_OUTPUTS_PER_TX)):
+                _update(ids[start:start + offline.MAX_OUTPUTS_PER_TX], status=SIGNED, txid=item["txid"],
+                        raw=item["raw"], inputs=json.dumps(item["inputs"]), fee=str(fee),
+                        attempts=0, next_attempt=0, error=None)
+        else:
+            for job_id, item in zip(ids, batch["items"]):
+                _update([job_id], status=SIGNED, txid=item["txid"], raw=item["raw"], sender=batch["sender"],
+                        nonce=item["tx"]["nonce"], fee=str(fee), attempts=0, next_attempt=0, error=None)
+    return len(ids)
+
+
+def _known_to_node(coin: str, txid: str) -> bool:
+    """Whether the node returns our transaction (pending or mined) by hash."""
+    try:
+        return offline.evm_web3(coin).eth.get_transaction(txid) is not None
+    except Exception:  # TransactionNotFound, or provider trouble: look again on the next attempt
+        return False
+
+
+def _broadcast(coin: str) -> int:
+    """(Re)send stored raw transactions of one coin that are due; returns how many were tried."""
+    rows = db().execute("SELECT * FROM jobs WHERE coin = ? AND status = ? AND next_attempt <= ? ORDER BY id",
+                        (coin, SIGNED, time.time())).fetchall()
+    by_raw: Dict[str, List[sqlite3.Row]] = {}
+    for r in rows:
+        by_raw.setdefault(r["raw"], []).append(r)
+    send = offline.broadcast_utxo if coin in offline.UTXO_COINS else offline.broadcast_evm
+
+    def one(raw: str):
+        jobs_ = by_raw[raw]
+        ids = [r["id"] for r in jobs_]
+        try:
+            send(coin, raw)
+        except Exception as e:
+            error = str(e).lower()
+            if NONCE_USED in error and coin in offline.EVM_COINS:
+                if not _known_to_node(coin, jobs_[0]["txid"]):
+                    _retry(ids, jobs_[0]["attempts"] + 1, f"broadcast: nonce {jobs_[0]['nonce']} was used by "
+                           f"another transaction, {jobs_[0]['txid']} is not on the node ({e})", SIGNED)
+                    return
+            elif not any(marker in error for marker in ALREADY_SENT):
+                _retry(ids, jobs_[0]["attempts"] + 1, f"broadcast: {e}", SIGNED)
+                return
+        _update(ids, status=BROADCAST, error=None)
+
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix=f"send-{coin}") as pool:
+        list(pool.map(one, by_raw))
+    return len(by_raw)
+
+
+def process(coin: str) -> int:
+    """One worker pass for a coin; returns how many jobs or transactions it touched."""
+    touched = _broadcast(coin)
+    unsent = db().execute("SELECT COUNT(*) FROM jobs WHERE coin = ? AND status = ?", (coin, SIGNED)).fetchone()[0]
+    if unsent:
+        return touched  # signing now could reuse a nonce or an input of the unsent transactions
+    signed = _sign(coin)
+    if signed:
+        touched += signed + _broadcast(coin)
+    return touched
+
+
+def run(coins: Iterable[str] = COINS, once: bool = False):
+    """Work the queue: every coin in parallel, each coin's jobs in order."""
+    coins = list(coins)
+    with ThreadPoolExecutor(max_workers=len(coins), thread_name_prefix="send-queue") as pool:
+        while True:
+            touched = sum(pool.map(process, coins))
+            if once and not touched:
+                return
+            if not touched:
+                _wake.wait(POLL_INTERVAL)
+                _wake.clear()
+
+
+def start(coins: Iterable[str] = COINS) -> threading.Thread:
+    """Run the queue from a daemon thread (idempotent)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=run, args=(list(coins),), name="send-queue", daemon=True)
+        _thread.start()
+    _wake.set()
+    return _thread
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "add" and len(sys.argv) > 4:
+        fee = Decimal(sys.argv[5]) if len(sys.argv) > 5 else None
+        job = enqueue(sys.argv[2], sys.argv[3], Decimal(sys.argv[4]), fee, sys.argv[6] if len(sys.argv) > 6 else None)
+        console.print(f"[green]✅ Job {job['id']} ({job['status']})[/green] key [cyan]{job['idempotency_key']}[/cyan]")
+    elif command == "run":
+        run(once="--once" in sys.argv)
+    else:
+        table = Table(title=f"📤 Send queue ({DB_PATH})", header_style="bold magenta")
+        for column in ("ID", "Coin", "To", "Amount", "Status", "Attempts", "TXID / Error"):
+            table.add_column(column, overflow="fold")
+        for job in jobs(sys.argv[2] if len(sys.argv) > 2 else None):
+            table.add_row(str(job["id"]), job["coin"], job["to_address"], job["amount"], job["status"],
+                          str(job["attempts"]), job["txid"] or job["error"] or "")
+        console.print(table)
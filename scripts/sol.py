@@ -3,6 +3,10 @@ import json
 import base58
 import requests
 import qrcode
+import asyncio
+import profiler
+import sol_rpc
+import sol_tx
 from nacl import signing
 from rich.console import Console
 from rich.panel import Panel
@@ -15,6 +19,7 @@ WALLET_DIR = "wallet_SOL"
 WALLET_NAME = "CyOX2_SOL"
 INFO_PATH = os.path.join(WALLET_DIR, "wallet_info.json")
 RPC_URL = "https://api.mainnet-beta.solana.com"
+COMMITMENT = "confirmed"
 
 def wallet_exists():
     return os.path.exists(INFO_PATH)
@@ -54,19 +59,11 @@ def load_wallet():
         return json.load(f)
 
 def get_sol_balance(address):
-    headers = {"Content-Type": "application/json"}
-    body = {
-        "jsonrpc": "2.0",
-        "id": 1,
-        "method": "getBalance",
-        "params": [address]
-    }
-    res = requests.post(RPC_URL, headers=headers, json=body)
-    try:
-        lamports = res.json()["result"]["value"]
-        return lamports / 1e9
-    except:
-        return None
+    return get_sol_balances([address])[address]
+
+def get_sol_balances(addresses):
+    """Balances for many addresses, 100 per getMultipleAccounts call."""
+    return sol_rpc.get_balances(addresses, url=RPC_URL, commitment=COMMITMENT)
 
 def view_wallet():
     wallet = load_wallet()
@@ -74,9 +71,13 @@ def view_wallet():
         console.print("[red]❌ Wallet not found.[/red]\n")
         return
 
-    balance = get_sol_balance(wallet["address"])
+    try:
+        balance = f"{get_sol_balance(wallet['address']):.6f} SOL"
+    except (sol_rpc.SolanaRPCError, requests.RequestException) as e:
+        balance = f"[red]unavailable ({e})[/red]"
+
     console.print(Panel.fit(f"[bold cyan]Address:[/bold cyan] {wallet['address']}\n"
-                            f"[bold cyan]Balance:[/bold cyan] {balance:.6f} SOL\n"
+                            f"[bold cyan]Balance:[/bold cyan] {balance}\n"
                             f"[bold cyan]Private Key:[/bold cyan] {wallet['private_key']}",
                             title="[green]Solana Wallet Info[/green]"))
 
@@ -99,6 +100,48 @@ def receive_sol():
     qr.make(fit=True)
     qr.print_ascii(invert=True)
 
+def send_sol_batch(transfers):
+    """
+    Sign [(to_address, amount_sol), ...] from the stored key and submit them together.
+    Returns one signature or SolanaRPCError per transfer.
+    """
+    wallet = load_wallet()
+    if not wallet:
+        raise FileNotFoundError("Wallet not found. Create wallet first.")
+    key = sol_tx.load_signing_key(wallet["private_key"])
+    lamport_transfers = [(to, sol_tx.sol_to_lamports(amount)) for to, amount in transfers]
+
+    async def _run():
+        rpc = sol_rpc.SolanaRPC(RPC_URL, commitment=COMMITMENT)
+        return await sol_tx.send_transfers(rpc, key, lamport_transfers)
+
+    return asyncio.run(_run())
+
+def send_sol():
+    wallet = load_wallet()
+    if not wallet:
+        console.print("[red]❌ Wallet not found.[/red]\n")
+        return
+
+    to_address = Prompt.ask("[bold cyan]Enter recipient SOL address[/bold cyan]")
+    try:
+        amount = float(Prompt.ask("[bold cyan]Enter amount in SOL[/bold cyan]"))
+        sol_tx.decode_pubkey(to_address)
+    except ValueError as e:
+        console.print(f"[red]❌ Invalid input. Reason: {e}[/red]\n")
+        return
+
+    try:
+        result = send_sol_batch([(to_address, amount)])[0]
+    except (ValueError, sol_rpc.SolanaRPCError, requests.RequestException) as e:
+        console.print(f"[red]❌ Error sending SOL:[/red] {e}")
+        return
+
+    if isinstance(result, sol_rpc.SolanaRPCError):
+        console.print(f"[red]❌ Error sending SOL:[/red] {result}")
+    else:
+        console.print(Panel.fit(f"[green]✅ Transaction Sent[/green]\n[bold cyan]Signature:[/bold cyan] {result}"))
+
 def main_menu():
     while True:
         console.print(Panel("[bold yellow]Welcome to your SOL Wallet CLI[/bold yellow]",
@@ -110,9 +153,10 @@ def main_menu():
             console.print("[bold blue]1.[/bold blue] Create Wallet")
 
         console.print("[bold blue]2.[/bold blue] Receive SOL")
-        console.print("[bold blue]3.[/bold blue] Exit")
+        console.print("[bold blue]3.[/bold blue] Send SOL")
+        console.print("[bold blue]4.[/bold blue] Exit")
 
-        choice = Prompt.ask("\n[bold green]Select an option[/bold green]", choices=["1", "2", "3"])
+        choice = Prompt.ask("\n[bold green]Select an option[/bold green]", choices=["1", "2", "3", "4"])
 
         if choice == "1":
             if wallet_exists():
@@ -122,8 +166,12 @@ def main_menu():
         elif choice == "2":
             receive_sol()
         elif choice == "3":
+            send_sol()
+        elif choice == "4":
             console.print("[bold red]Goodbye![/bold red]")
             break
 
+profiler.instrument(globals())
+
 if __name__ == "__main__":
     main_menu()
@@ -0,0 +1,126 @@
+"""
+Async Solana JSON-RPC adapter.
+- Packs many calls into one JSON-RPC batch array (one POST)
+- getMultipleAccounts for up to 100 addresses per call
+- Configurable commitment level
+- HTTP goes through the "sol" RPC router (latency-based provider selection + failover).
+  The router is blocking (requests), so the adapter is thread-backed: every POST
+  runs in the loop's default executor and concurrent calls are bounded by that
+  pool, not by the event loop
+- Paced by the per-host token bucket; an HTTP 429 pauses that bucket for the
+  reply's Retry-After (net.retry_after) and the call is retried, so the retry
+  waits in the bucket like every other request to the throttled host instead
+  of sleeping twice
+- A batch reply that is not an array is an error, never an empty result
+"""
+import asyncio
+import contextvars
+import itertools
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import rpc_router
+
+DEFAULT_RPC_URL = "https://api.mainnet-beta.solana.com"
+LAMPORTS_PER_SOL = 1_000_000_000
+MAX_ACCOUNTS_PER_CALL = 100  # hard limit of getMultipleAccounts
+MAX_BATCH_CALLS = 50  # calls per JSON-RPC batch array
+MAX_RETRIES = 4
+
+
+class SolanaRPCError(Exception):
+    def __init__(self, message: str, code: Optional[int] = None):
+        super().__init__(message)
+        self.code = code
+
+
+class SolanaRPC:
+    def __init__(self, url: str = DEFAULT_RPC_URL, commitment: str = "confirmed",
+                 max_batch: int = MAX_BATCH_CALLS):
+        self.url = url
+        self.commitment = commitment
+        self.max_batch = max_batch
+        self.router = rpc_router.get_router("sol", url)
+        self._ids = itertools.count(1)
+
+    # ---------- Transport ----------
+    async def _post(self, payload: Any) -> Any:
+        """POST through the router on an executor thread; 429s are retried once the host's bucket reopens."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(MAX_RETRIES + 1):
+            try:
+                return await loop.run_in_executor(None, contextvars.copy_context().run, self.router.post_json, payload)
+            except rpc_router.RouterError as e:
+                response = getattr(e.__cause__, "response", None)
+                status = getattr(response, "status_code", None)
+                if status == 429 and attempt < MAX_RETRIES:
+                    continue  # net already paused the host's bucket for Retry-After
+                raise SolanaRPCError(str(e), status) from e
+
+    def _request(self, method: str, params: Optional[list]) -> Dict[str, Any]:
+        return {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params or []}
+
+    @staticmethod
+    def _unwrap(reply: Dict[str, Any]) -> Any:
+        if "error" in reply:
+            err = reply["error"]
+            raise SolanaRPCError(err.get("message", str(err)), err.get("code"))
+        return reply["result"]
+
+    # ---------- JSON-RPC ----------
+    async def call(self, method: str, params: Optional[list] = None) -> Any:
+        return self._unwrap(await self._post(self._request(method, params)))
+
+    async def batch(self, calls: Sequence[Tuple[str, Optional[list]]], raise_errors: bool = True) -> List[Any]:
+        """
+        Run (method, params) pairs as JSON-RPC batch arrays; results keep call order.
+        With raise_errors=False a failed call yields its SolanaRPCError instead of raising.
+        """
+        requests_ = [self._request(method, params) for method, params in calls]
+        chunks = [requests_[i:i + self.max_batch] for i in range(0, len(requests_), self.max_batch)]
+        replies = await asyncio.gather(*(self._post(chunk) for chunk in chunks))
+
+        by_id = {}
+        for reply in replies:
+            if isinstance(reply, dict):  # whole batch rejected
+                self._unwrap(reply)
+            if not isinstance(reply, list) or not all(isinstance(item, dict) for item in reply):
+                raise SolanaRPCError(f"Malformed JSON-RPC batch reply: {str(reply)[:200]}")
+            for item in reply:
+                by_id[item.get("id")] = item
+        missing = [r["id"] for r in requests_ if r["id"] not in by_id]
+        if missing:
+            raise SolanaRPCError(f"No reply for {len(missing)} batched call(s)")
+        if raise_errors:
+            return [self._unwrap(by_id[r["id"]]) for r in requests_]
+
+        results = []
+        for r in requests_:
+            try:
+                results.append(self._unwrap(by_id[r["id"]]))
+            except SolanaRPCError as e:
+                results.append(e)
+        return results
+
+    # ---------- Accounts ----------
+    async def get_multiple_accounts(self, addresses: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+        """Account info for every address (None for unused accounts), 100 addresses per call."""
+        config = {"commitment": self.commitment, "encoding": "base64",
+                  "dataSlice": {"offset": 0, "length": 0}}
+        calls = [("getMultipleAccounts", [list(addresses[i:i + MAX_ACCOUNTS_PER_CALL]), config])
+                 for i in range(0, len(addresses), MAX_ACCOUNTS_PER_CALL)]
+        accounts = []
+        for result in await self.batch(calls):
+            accounts.extend(result["value"])
+        return accounts
+
+    async def get_balances(self, addresses: Sequence[str]) -> Dict[str, float]:
+        accounts = await self.get_multiple_accounts(addresses)
+        return {addr: (acc["lamports"] if acc else 0) / LAMPORTS_PER_SOL
+                for addr, acc in zip(addresses, accounts)}
+
+
+def get_balances(addresses: Sequence[str], url: str = DEFAULT_RPC_URL,
+                 commitment: str = "confirmed") -> Dict[str, float]:
+    """Blocking helper for scripts that aren't async."""
+    rpc = SolanaRPC(url, commitment=commitment)
+    return asyncio.run(rpc.get_balances(list(addresses)))
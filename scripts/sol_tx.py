@@ -0,0 +1,178 @@
+"""
+Local SOL transfer building and signing.
+- Legacy transaction format with a single System Program transfer
+- Signed with the wallet's nacl SigningKey, no SDK needed
+- Shared recent-blockhash cache (one per RPC URL and commitment) so many
+  transfers sign without a round trip each. While senders use it, a daemon
+  thread refreshes it every BLOCKHASH_REFRESH seconds, so a send rarely waits
+  for getLatestBlockhash; it stops after BLOCKHASH_IDLE seconds without use
+- Signed transactions are submitted together as JSON-RPC batch arrays
+"""
+import asyncio
+import base64
+import contextvars
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import base58
+from nacl import signing
+
+import metrics
+import rpc_router
+from sol_rpc import LAMPORTS_PER_SOL, SolanaRPC, SolanaRPCError
+
+SYSTEM_PROGRAM_ID = bytes(32)  # base58 "11111111111111111111111111111111"
+SYSTEM_TRANSFER = 2  # SystemInstruction::Transfer
+BLOCKHASH_MAX_AGE = 20.0  # seconds; a blockhash stays valid for ~60-90s
+BLOCKHASH_REFRESH = 8.0  # background refresh interval, well inside BLOCKHASH_MAX_AGE
+BLOCKHASH_IDLE = 120.0  # stop refreshing after this long without a get()
+
+
+def sol_to_lamports(amount) -> int:
+    return int(round(float(amount) * LAMPORTS_PER_SOL))
+
+
+def decode_pubkey(address: str) -> bytes:
+    raw = base58.b58decode(address)
+    if len(raw) != 32:
+        raise ValueError(f"Invalid Solana address: {address}")
+    return raw
+
+
+def shortvec(n: int) -> bytes:
+    """Solana compact-u16 length prefix."""
+    out = bytearray()
+    while True:
+        byte = n & 0x7F
+        n >>= 7
+        if n:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def transfer_message(from_pubkey: bytes, to_pubkey: bytes, lamports: int, blockhash: str) -> bytes:
+    if from_pubkey == to_pubkey:
+        raise ValueError("Sender and recipient are the same account.")
+    if lamports <= 0:
+        raise ValueError("Amount must be positive.")
+
+    header = bytes([1, 0, 1])  # 1 signer, 0 readonly signers, 1 readonly non-signer (system program)
+    keys = shortvec(3) + from_pubkey + to_pubkey + SYSTEM_PROGRAM_ID
+    data = struct.pack("<IQ", SYSTEM_TRANSFER, lamports)
+    instruction = bytes([2]) + shortvec(2) + bytes([0, 1]) + shortvec(len(data)) + data
+    return header + keys + base58.b58decode(blockhash) + shortvec(1) + instruction
+
+
+def sign_transfer(key: signing.SigningKey, to_address: str, lamports: int, blockhash: str) -> Tuple[str, str]:
+    """Return (signature, base64 wire transaction)."""
+    message = transfer_message(key.verify_key.encode(), decode_pubkey(to_address), lamports, blockhash)
+    signature = key.sign(message).signature
+    wire = shortvec(1) + signature + message
+    return base58.b58encode(signature).decode(), base64.b64encode(wire).decode()
+
+
+def load_signing_key(private_key_b58: str) -> signing.SigningKey:
+    return signing.SigningKey(base58.b58decode(private_key_b58)[:32])
+
+
+class BlockhashCache:
+    """Latest blockhash of one endpoint; thread-safe and usable from any event loop."""
+
+    def __init__(self, url: str, commitment: str, max_age: float = BLOCKHASH_MAX_AGE,
+                 refresh_every: float = BLOCKHASH_REFRESH, idle_after: float = BLOCKHASH_IDLE):
+        self.router = rpc_router.get_router("sol", url)
+        self.commitment = commitment
+        self.max_age = max_age
+        self.refresh_every = refresh_every
+        self.idle_after = idle_after
+        self._blockhash: Optional[str] = None
+        self._fetched_at = 0.0
+        self._used_at = 0.0
+        self._lock = threading.Lock()  # guards the fields above
+        self._fetch_lock = threading.Lock()  # one foreground fetch at a time
+        self._thread: Optional[threading.Thread] = None
+
+    def _fresh(self) -> Optional[str]:
+        with self._lock:
+            if self._blockhash is not None and time.monotonic() - self._fetched_at <= self.max_age:
+                return self._blockhash
+            return None
+
+    def refresh(self) -> str:
+        reply = self.router.post_json({"jsonrpc": "2.0", "id": 1, "method": "getLatestBlockhash",
+                                       "params": [{"commitment": self.commitment}]})
+        blockhash = SolanaRPC._unwrap(reply)["value"]["blockhash"]
+        with self._lock:
+            self._blockhash, self._fetched_at = blockhash, time.monotonic()
+        return blockhash
+
+    def _get_blocking(self) -> str:
+        with self._fetch_lock:  # callers queued behind a fetch reuse its result
+            return self._fresh() or self.refresh()
+
+    def _refresher(self):
+        while True:
+            time.sleep(self.refresh_every)
+            with self._lock:
+                if time.monotonic() - self._used_at > self.idle_after:
+                    self._thread = None
+                    return
+            try:
+                self.refresh()
+            except Exception:  # provider trouble: the next get() fetches in the foreground
+                pass
+
+    def _touch(self):
+        with self._lock:
+            self._used_at = time.monotonic()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._refresher, name="sol-blockhash", daemon=True)
+                self._thread.start()
+
+    async def get(self) -> str:
+        self._touch()
+        blockhash = self._fresh()
+        if blockhash is not None:
+            return blockhash
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, contextvars.copy_context().run, self._get_blocking)
+
+    def invalidate(self):
+        with self._lock:
+            self._blockhash = None
+
+
+_blockhash_caches: Dict[Tuple[str, str], BlockhashCache] = {}
+_caches_lock = threading.Lock()
+
+
+def blockhash_cache(rpc: SolanaRPC) -> BlockhashCache:
+    """One cache per RPC URL and commitment, shared by every sender (and SolanaRPC instance) in the process."""
+    with _caches_lock:
+        key = (rpc.url, rpc.commitment)
+        cache = _blockhash_caches.get(key)
+        if cache is None:
+            cache = _blockhash_caches[key] = BlockhashCache(rpc.url, rpc.commitment)
+        return cache
+
+
+async def send_transfers(rpc: SolanaRPC, key: signing.SigningKey,
+                         transfers: Sequence[Tuple[str, int]]) -> List[object]:
+    """
+    Sign (to_address, lamports) transfers back-to-back against one cached blockhash
+    and submit them together. Returns a signature or a SolanaRPCError per transfer.
+    """
+    blockhash = await blockhash_cache(rpc).get()
+    signed = [sign_transfer(key, to, lamports, blockhash) for to, lamports in transfers]
+    config = {"encoding": "base64", "preflightCommitment": rpc.commitment}
+    results = await rpc.batch([("sendTransaction", [wire, config]) for _, wire in signed], raise_errors=False)
+
+    if any(isinstance(r, SolanaRPCError) and "blockhash" in str(r).lower() for r in results):
+        blockhash_cache(rpc).invalidate()
+    for r in results:
+        metrics.count_send("sol", not isinstance(r, SolanaRPCError))
+    return results
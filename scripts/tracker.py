@@ -0,0 +1,370 @@
+"""
+Confirmation tracker for every in-flight transaction.
+- Sends from the wallet scripts are registered with track(); the send queue's
+  broadcast jobs are picked up from its database automatically
+- One timer polls all chains: per chain it reads the head block once and only
+  looks at transactions not yet checked at that head, so between blocks a tick
+  costs one request per chain
+- Lookups are batched per chain: EVM receipts as eth_getTransactionReceipt
+  JSON-RPC batches (EVM_BATCH per request), Tron gettransactioninfobyid and
+  BTC / LTC / DOGE bitcoinlib lookups WORKERS at a time
+- Status lives in the send queue's SQLite file (table `tracked`): pending until
+  the chain's CONFIRMATIONS are reached, then confirmed, or failed when the
+  chain reports the transaction reverted. Queue jobs follow via
+  send_queue.mark_confirmed / mark_failed
+- Fee bumps (fee_bump.py) register the replacement with replace(): every
+  version stays tracked, and once one of them is mined the others are marked
+  replaced and the queue jobs point at the mined one
+- Time from the first broadcast to confirmation is recorded as a metric, so
+  fee choices can be judged on real numbers
+
+`python3 tracker.py [run [--once] | add <coin> <txid> | list [status]]`
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import metrics
+import send_queue
+
+INTERVAL = float(os.environ.get("HIDERAX_TRACK_INTERVAL", "15"))  # seconds between polls
+EVM_BATCH = 100  # receipts per JSON-RPC batch
+WORKERS = 8  # concurrent Tron / UTXO lookups
+
+PENDING, CONFIRMED, FAILED, REPLACED = "pending", "confirmed", "failed", "replaced"  # as send_queue's
+
+# coin -> (backend kind, rpc_router chain or bitcoinlib network, confirmations required)
+CHAINS: Dict[str, Tuple[str, Optional[str], int]] = {
+    "BTC": ("utxo", "bitcoin", 2),
+    "LTC": ("utxo", "litecoin", 6),
+    "DOGE": ("utxo", "dogecoin", 6),
+    "ETH": ("evm", "eth", 12),
+    "BNB": ("evm", "bsc", 15),
+    "POL": ("evm", "polygon", 64),
+    "USDT-ERC20": ("evm", "eth", 12),
+    "USDT-TRC20": ("tron", None, 19),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked (
+    txid TEXT PRIMARY KEY,
+    coin TEXT NOT NULL,
+    status TEXT NOT NULL,
+    block INTEGER,
+    confirmations INTEGER NOT NULL DEFAULT 0,
+    checked_head INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    root TEXT,  -- first transaction of its fee-bump chain (itself for the first)
+    submitted REAL NOT NULL,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tracked_by_status ON tracked (status, coin, checked_head);
+"""
+# columns added after a release: (name, definition, backfill statement)
+MIGRATIONS = [
+    ("root", "TEXT", "UPDATE tracked SET root = txid WHERE root IS NULL"),
+]
+
+confirmation_time = metrics.Histogram("hiderax_confirmation_seconds", "Time from broadcast to confirmation",
+                                      ("chain",), buckets=(30, 60, 120, 300, 600, 1200, 1800, 3600, 7200, 21600))
+
+_wake = threading.Event()
+_thread: Optional[threading.Thread] = None
+_schema_ready = threading.local()
+
+
+def _migrate(conn):
+    """Bring a `tracked` table created by an older version up to SCHEMA."""
+    columns = {r[1] for r in conn.execute("PRAGMA table_info(tracked)")}
+    for name, definition, backfill in MIGRATIONS:
+        if name not in columns:
+            try:
+                conn.execute(f"ALTER TABLE tracked ADD COLUMN {name} {definition}")
+            except sqlite3.OperationalError as e:  # another process migrated first
+                if "duplicate column" not in str(e):
+                    raise
+        conn.execute(backfill)  # idempotent, also covers rows written by an older process meanwhile
+    conn.execute("CREATE INDEX IF NOT EXISTS tracked_by_root ON tracked (root)")
+
+
+def db():
+    conn = send_queue.db()
+    if not getattr(_schema_ready, "done", False):
+        conn.executescript(SCHEMA)
+        _migrate(conn)
+        _schema_ready.done = True
+    return conn
+
+
+def _normalize(coin: str, txid: str) -> Tuple[str, str]:
+    coin = coin.upper()
+    if coin not in CHAINS:
+        raise ValueError(f"Unsupported coin: {coin}. Choose from {', '.join(CHAINS)}.")
+    txid = txid.lower().removeprefix("0x")
+    return coin, "0x" + txid if CHAINS[coin][0] == "evm" else txid
+
+
+def track(coin: str, txid: str):
+    """Register a broadcast transaction; the next poll picks it up."""
+    coin, txid = _normalize(coin, txid)
+    now = time.time()
+    db().execute("INSERT OR IGNORE INTO tracked (txid, coin, status, root, submitted, updated)"
+                 " VALUES (?, ?, ?, ?, ?, ?)", (txid, coin, PENDING, txid, now, now))
+    _wake.set()
+
+
+def track_sent(coin: str, txid: str) -> bool:
+    """track() for the wallet scripts: a tracking problem must never look like a failed send."""
+    try:
+        track(coin, txid)
+        return True
+    except Exception:
+        return False
+
+
+def replace(old_txid: str, new_txid: str, raw: Optional[str] = None):
+    """Track a fee-bumped replacement of old_txid; queue jobs move to the new transaction."""
+    old = get(old_txid)
+    if old is None:
+        raise KeyError(f"{old_txid} is not tracked.")
+    coin, new_txid = _normalize(old["coin"], new_txid)
+    now = time.time()
+    with send_queue._transaction():
+        db().execute("INSERT OR IGNORE INTO tracked (txid, coin, status, root, submitted, updated)"
+                     " VALUES (?, ?, ?, ?, ?, ?)", (new_txid, coin, PENDING, old["root"], now, now))
+        send_queue.replace_tx(old["txid"], new_txid, raw)
+    _wake.set()
+
+
+def family(row: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Every version of a transaction (the original and its fee bumps), oldest first."""
+    return [dict(r) for r in db().execute("SELECT * FROM tracked WHERE root = ? ORDER BY submitted", (row["root"],))]
+
+
+def get(txid: str) -> Optional[Dict[str, Any]]:
+    row = db().execute("SELECT * FROM tracked WHERE txid IN (?, ?)",
+                       (txid.lower().removeprefix("0x"), "0x" + txid.lower().removeprefix("0x"))).fetchone()
+    return dict(row) if row else None
+
+
+def tracked(status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+    query, args = "SELECT * FROM tracked", []
+    if status:
+        query, args = query + " WHERE status = ?", [status]
+    return [dict(r) for r in db().execute(query + " ORDER BY submitted DESC LIMIT ?", args + [limit])]
+
+
+def _adopt_queue_jobs():
+    """Track broadcast jobs of the send queue (queue coins are tracker coins)."""
+    db().execute("INSERT OR IGNORE INTO tracked (txid, coin, status, root, submitted, updated)"
+                 " SELECT txid, coin, ?, txid, MIN(updated), MIN(updated) FROM jobs WHERE status = ?"
+                 " GROUP BY txid, coin",
+                 (PENDING, send_queue.BROADCAST))
+
+
+# ---------- Chain backends: head(backend) -> block, lookup(backend, txids) -> {txid: (block, error)} ----------
+def _evm_head(chain: str) -> int:
+    import rpc_router
+    return int(rpc_router.get_router(chain).call("eth_blockNumber"), 16)
+
+
+def _evm_lookup(chain: str, txids: List[str]) -> Dict[str, tuple]:
+    import rpc_router
+    found = {}
+    for i in range(0, len(txids), EVM_BATCH):
+        batch = txids[i:i + EVM_BATCH]
+        reply = rpc_router.get_router(chain).post_json(
+            [{"jsonrpc": "2.0", "id": n, "method": "eth_getTransactionReceipt", "params": [t]}
+             for n, t in enumerate(batch)])
+        by_id = {r.get("id"): r for r in reply}
+        for n, txid in enumerate(batch):
+            receipt = (by_id.get(n) or {}).get("result")
+            if receipt and receipt.get("blockNumber"):
+                failed = "reverted" if receipt.get("status") == "0x0" else None
+                found[txid] = (int(receipt["blockNumber"], 16), failed)
+    return found
+
+
+@lru_cache(maxsize=1)
+def tron_client():
+    from tronpy import Tron
+    client = Tron()
+    metrics.instrument_session(client.provider.sess, "tron")
+    return client
+
+
+def _tron_head(_chain) -> int:
+    return tron_client().get_latest_block_number()
+
+
+def _tron_lookup(_chain, txids: List[str]) -> Dict[str, tuple]:
+    def one(txid):
+        info = tron_client().provider.make_request("wallet/gettransactioninfobyid", {"value": txid, "visible": True})
+        if not info or "blockNumber" not in info:
+            return txid, None
+        result = info.get("receipt", {}).get("result", "SUCCESS")
+        failed = None if info.get("result") != "FAILED" and result == "SUCCESS" else f"failed: {result}"
+        return txid, (info["blockNumber"], failed)
+
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="track-tron") as pool:
+        return {txid: found for txid, found in pool.map(one, txids) if found}
+
+
+def _utxo_head(network: str) -> int:
+    from bitcoinlib.services.services import Service
+    return Service(network=network).blockcount()
+
+
+def _utxo_lookup(network: str, txids: List[str]) -> Dict[str, tuple]:
+    from bitcoinlib.services.services import Service
+
+    def one(txid):
+        tx = Service(network=network).gettransaction(txid)  # own Service per lookup: its cache isn't thread-safe
+        return txid, (tx.block_height, None) if tx and tx.block_height else None
+
+    with ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix=f"track-{network}") as pool:
+        return {txid: found for txid, found in pool.map(one, txids) if found}
+
+
+BACKENDS = {"evm": (_evm_head, _evm_lookup), "tron": (_tron_head, _tron_lookup), "utxo": (_utxo_head, _utxo_lookup)}
+
+
+# ---------- Polling ----------
+def _settle(coin: str, row, block: int, head: int, failed: Optional[str]) -> List[str]:
+    """Record a mined transaction; returns the txids of the versions it replaced."""
+    confirmations = max(0, head - block + 1)
+    now = time.time()
+    versions = family(row)
+    replaced = [v["txid"] for v in versions if v["txid"] != row["txid"] and v["status"] == PENDING]
+    for txid in replaced:  # a mined version invalidates the others (same inputs or nonce)
+        send_queue.replace_tx(txid, row["txid"])
+        db().execute("UPDATE tracked SET status = ?, updated = ? WHERE txid = ?", (REPLACED, now, txid))
+    if failed:
+        status = FAILED
+        send_queue.mark_failed(row["txid"], failed)
+    elif confirmations >= CHAINS[coin][2]:
+        status = CONFIRMED
+        send_queue.mark_confirmed(row["txid"])
+        confirmation_time.observe(now - versions[0]["submitted"], coin)
+    else:
+        status = PENDING
+    db().execute("UPDATE tracked SET status = ?, block = ?, confirmations = ?, checked_head = ?, error = ?,"
+                 " updated = ? WHERE txid = ?", (status, block, confirmations, head, failed, now, row["txid"]))
+    return replaced
+
+
+def poll_chain(kind: str, backend: Optional[str], coins: List[str]) -> int:
+    """Check the pending transactions of one chain not yet seen at its head; returns how many were checked."""
+    marks = ",".join("?" * len(coins))
+    if not db().execute(f"SELECT 1 FROM tracked WHERE status = ? AND coin IN ({marks}) LIMIT 1",
+                        [PENDING, *coins]).fetchone():
+        return 0
+    head_of, lookup = BACKENDS[kind]
+    head = head_of(backend)
+    rows = db().execute(f"SELECT * FROM tracked WHERE status = ? AND coin IN ({marks}) AND checked_head < ?",
+                        [PENDING, *coins, head]).fetchall()
+    if not rows:
+        return 0
+    found = lookup(backend, [r["txid"] for r in rows])
+    replaced = set()
+    with send_queue._transaction():
+        for row in rows:
+            if row["txid"] in replaced:
+                continue
+            if row["txid"] in found:
+                block, failed = found[row["txid"]]
+                replaced.update(_settle(row["coin"], row, block, head, failed))
+            else:  # not mined (yet): look again at the next block
+                db().execute("UPDATE tracked SET checked_head = ?, updated = ? WHERE txid = ?",
+                             (head, time.time(), row["txid"]))
+    return len(rows)
+
+
+def _chains() -> Dict[Tuple[str, Optional[str]], List[str]]:
+    """Coins sharing one backend (ETH and USDT-ERC20) are polled together."""
+    grouped: Dict[Tuple[str, Optional[str]], List[str]] = {}
+    for coin, (kind, backend, _) in CHAINS.items():
+        grouped.setdefault((kind, backend), []).append(coin)
+    return grouped
+
+
+def poll() -> int:
+    """One pass over every chain, chains in parallel; a failing chain is retried next tick."""
+    _adopt_queue_jobs()
+
+    def one(item):
+        (kind, backend), coins = item
+        try:
+            return poll_chain(kind, backend, coins)
+        except Exception:
+            return 0
+
+    groups = _chains()
+    with ThreadPoolExecutor(max_workers=len(groups), thread_name_prefix="tracker") as pool:
+        return sum(pool.map(one, groups.items()))
+
+
+def run(interval: float = INTERVAL, once: bool = False):
+    while True:
+        poll()
+        if once:
+            return
+        _wake.wait(interval)
+        _wake.clear()
+
+
+def start(interval: float = INTERVAL) -> threading.Thread:
+    """Poll from a daemon thread (idempotent)."""
+    global _thread
+    if _thread is None:
+        _thread = threading.Thread(target=run, args=(interval,), name="tracker", daemon=True)
+        _thread.start()
+    return _thread
+
+
+def _collect():
+    try:
+        rows = db().execute("SELECT coin, COUNT(*) FROM tracked WHERE status = ? GROUP BY coin", (PENDING,)).fetchall()
+    except Exception:
+        return
+    yield "hiderax_pending_transactions", "gauge", "Broadcast transactions not yet confirmed", \
+        [({"chain": coin}, count) for coin, count in rows]
+
+
+metrics.register_collector(_collect)
+
+
+def _table(rows: Iterable[Dict[str, Any]]):
+    from rich.table import Table
+    table = Table(title=f"⛓ Tracked transactions ({send_queue.DB_PATH})", header_style="bold magenta")
+    for column in ("Coin", "TXID", "Status", "Block", "Confirmations", "Age"):
+        table.add_column(column, overflow="fold")
+    for r in rows:
+        need = CHAINS[r["coin"]][2]
+        table.add_row(r["coin"], r["txid"], r["status"] if not r["error"] else f"{r['status']} ({r['error']})",
+                      str(r["block"] or ""), f"{r['confirmations']}/{need}", f"{time.time() - r['submitted']:.0f}s")
+    return table
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+
+    console = Console()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "add" and len(sys.argv) > 3:
+        track(sys.argv[2], sys.argv[3])
+        command = "run"
+        sys.argv.append("--once")
+    if command == "run":
+        if "--once" in sys.argv:
+            poll()
+            console.print(_table(tracked()))
+        else:
+            run()
+    else:
+        console.print(_table(tracked(sys.argv[2] if len(sys.argv) > 2 else None)))
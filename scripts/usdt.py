@@ -1,11 +1,19 @@
 import os
 import json
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
 
+import hd_evm
+import metrics
+import profiler
 import qrcode
+import rpc_router
+import tracker
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.table import Table
 from web3 import Web3
 from tronpy import Tron
 from tronpy.keys import PrivateKey
@@ -17,15 +25,21 @@ WALLET_FILE = os.path.join(WALLET_DIR, "wallet_info.json")
 
 # Infura or Alchemy or your Ethereum node
 ETH_RPC_URL = "https://mainnet.infura.io/v3/ae6132a817bc4f029109a313dd848182"
-w3 = Web3(Web3.HTTPProvider(ETH_RPC_URL))
+w3 = Web3(rpc_router.web3_provider("eth", ETH_RPC_URL))
 
 # Tron client (mainnet)
 tron = Tron()
+metrics.instrument_session(tron.provider.sess, "tron")
 
 # USDT contract addresses
 USDT_ERC20_CONTRACT = "0xdAC17F958D2ee523a2206206994597C13D831ec7"
 USDT_TRC20_CONTRACT = "TXLAQ63Xg1NAzckPwKHvzw7CSEmLMEqcdj"  # TRC20 USDT contract address
 
+# transfers built and signed per step of a batch payout; a chunk is built while the previous one is
+# broadcast and never earlier, so it must go out well inside tronpy's 60 s transaction expiry
+TRC20_BATCH_CHUNK = 100
+TRC20_WORKERS = 8  # concurrent node requests (building, broadcasting) in a batch payout
+
 
 def wallet_exists():
     return os.path.exists(WALLET_FILE)
@@ -55,8 +69,12 @@ def send_usdt():
     if not wallet:
         return
 
-    console.print(Panel.fit("[bold cyan]Select Network[/bold cyan]\n[1] Ethereum (ERC20)\n[2] Tron (TRC20)"))
-    network_choice = Prompt.ask("Enter your choice", choices=["1", "2"], default="1")
+    console.print(Panel.fit("[bold cyan]Select Network[/bold cyan]\n[1] Ethereum (ERC20)\n[2] Tron (TRC20)\n"
+                            "[3] Tron (TRC20) batch payout from a CSV file"))
+    network_choice = Prompt.ask("Enter your choice", choices=["1", "2", "3"], default="1")
+    if network_choice == "3":
+        send_trc20_usdt_csv(wallet)
+        return
 
     to_address = Prompt.ask("Enter recipient address")
     amount_str = Prompt.ask("Enter amount in USDT")
@@ -94,10 +112,13 @@ def create_wallet():
 
     os.makedirs(WALLET_DIR, exist_ok=True)
 
-    # Ethereum Wallet
-    eth_account = w3.eth.account.create()
-    eth_address = eth_account.address
-    eth_private_key = eth_account.key.hex()
+    # Ethereum Wallet: index 0 of the shared EVM seed, key derived on load
+    mnemonic = hd_evm.ensure_seed()
+    if mnemonic:
+        console.print(Panel.fit(f"[bold yellow]Write this down and store offline[/bold yellow]\n\n{mnemonic}",
+                                title="🧠 EVM Recovery Phrase (ETH • BNB • POL • USDT)", border_style="green"))
+    eth_wallet = hd_evm.wallet_info(0)
+    eth_address = eth_wallet["address"]
 
     # Tron Wallet
     tron_priv_key = PrivateKey.random()
@@ -105,10 +126,7 @@ def create_wallet():
     tron_priv_key_hex = tron_priv_key.hex()
 
     wallet_info = {
-        "ethereum": {
-            "address": eth_address,
-            "private_key": eth_private_key
-        },
+        "ethereum": eth_wallet,
         "tron": {
             "address": tron_address,
             "private_key": tron_priv_key_hex
@@ -129,17 +147,17 @@ def load_wallet():
         console.print("[red]No wallet found. Please create one first.[/red]")
         return None
     with open(WALLET_FILE) as f:
-        return json.load(f)
+        wallet = json.load(f)
+    wallet["ethereum"] = hd_evm.unlock(wallet["ethereum"])
+    return wallet
 
 
 def send_trc20_usdt(wallet, to_address, amount):
-    from tronpy import Tron
     from tronpy.keys import PrivateKey
 
     private_key = wallet['tron']['private_key']
     from_address = wallet['tron']['address']
 
-    tron = Tron()
     client_key = PrivateKey(bytes.fromhex(private_key))
     contract = tron.get_contract(USDT_TRC20_CONTRACT)
 
@@ -155,12 +173,113 @@ def send_trc20_usdt(wallet, to_address, amount):
         result = txn.broadcast()
         if result['result']:
             console.print(f"[green]TRC20 USDT sent! Transaction ID: {txn.txid}[/green]")
+            tracker.track_sent("USDT-TRC20", txn.txid)
         else:
             console.print("[red]Failed to send TRC20 USDT.[/red]")
     except Exception as e:
         console.print(f"[red]Error sending TRC20 USDT: {e}[/red]")
 
 
+def send_trc20_usdt_batch(wallet, payouts):
+    """
+    Send [(to_address, amount), ...] as TRC20 transfers in a pipeline: while one
+    chunk of TRC20_BATCH_CHUNK transfers is broadcast (TRC20_WORKERS at a time),
+    the next one is built and signed across all cores. At most one chunk waits
+    signed, so nothing sits long enough to expire.
+    A payout that fails to build, sign or broadcast gets its error and the rest
+    go on, so the result always says which recipients were paid.
+    Returns [(to_address, txid or None, error or None)] in payout order.
+    """
+    from batch_signer import BatchSigner, sign_tron_transactions
+
+    from_address = wallet['tron']['address']
+    contract = tron.get_contract(USDT_TRC20_CONTRACT)
+
+    def build(payout):
+        to_address, amount = payout
+        try:
+            return (contract.functions.transfer(to_address, int(Decimal(str(amount)) * 1_000_000))
+                    .with_owner(from_address)
+                    .fee_limit(1_000_000)
+                    .build()), None
+        except Exception as e:
+            return None, f"build failed: {e}"
+
+    def broadcast(to_address, txn):
+        try:
+            result = txn.broadcast()
+        except Exception as e:
+            return to_address, None, str(e)
+        if not result['result']:
+            return to_address, txn.txid, str(result)
+        tracker.track_sent("USDT-TRC20", txn.txid)
+        return to_address, txn.txid, None
+
+    results, signed, seconds = [], 0, 0.0
+    with BatchSigner("tron", wallet['tron']['private_key']) as signer, \
+            ThreadPoolExecutor(max_workers=TRC20_WORKERS, thread_name_prefix="trc20-build") as builders, \
+            ThreadPoolExecutor(max_workers=TRC20_WORKERS, thread_name_prefix="trc20-send") as broadcasters:
+        sending = []  # broadcasts of the previous chunk
+        for start in range(0, len(payouts), TRC20_BATCH_CHUNK):
+            chunk = payouts[start:start + TRC20_BATCH_CHUNK]
+            built = list(builders.map(build, chunk))
+            ready = [(to_address, txn) for (to_address, _), (txn, _) in zip(chunk, built) if txn is not None]
+            try:
+                stats = sign_tron_transactions([txn for _, txn in ready], wallet['tron']['private_key'],
+                                               signer=signer)
+                signed, seconds = signed + stats.count, seconds + stats.seconds
+                sign_error = None
+            except Exception as e:
+                sign_error = f"signing failed: {e}"
+
+            results += [future.result() for future in sending]
+            sending = []
+            for (to_address, _), (txn, error) in zip(chunk, built):
+                if error or sign_error:
+                    sending.append(_done((to_address, None, error or sign_error)))
+                else:
+                    sending.append(broadcasters.submit(broadcast, to_address, txn))
+        results += [future.result() for future in sending]
+    console.print(f"[dim]Signed {signed} TRC20 transfers at {signed / seconds if seconds else 0:,.0f} sig/s[/dim]")
+    return results
+
+
+def _done(value):
+    future = Future()
+    future.set_result(value)
+    return future
+
+
+def send_trc20_usdt_csv(wallet):
+    from offline import read_payouts
+
+    path = Prompt.ask("Payout CSV file (address,amount per line)")
+    try:
+        payouts = read_payouts(path)
+    except InvalidOperation:
+        console.print("[red]Invalid payout file: every amount must be a number.[/red]")
+        return
+    except (OSError, ValueError, IndexError) as e:
+        console.print(f"[red]Invalid payout file: {e}[/red]")
+        return
+    bad = [f"{to_address} {amount}" for to_address, amount in payouts if not amount.is_finite() or amount <= 0]
+    if bad:
+        console.print(f"[red]Invalid payout file: amounts must be positive ({', '.join(bad[:5])})[/red]")
+        return
+    total = sum(amount for _, amount in payouts)
+    console.print(f"[cyan]{len(payouts)} TRC20 USDT payouts, {total} USDT in total[/cyan]")
+
+    results = send_trc20_usdt_batch(wallet, payouts)
+    table = Table(title="TRC20 USDT batch payout", header_style="bold magenta")
+    table.add_column("To", style="cyan", overflow="fold")
+    table.add_column("Result", overflow="fold")
+    for to_address, txid, error in results:
+        table.add_row(to_address, f"[red]{error}[/red]" if error else f"[green]{txid}[/green]")
+    console.print(table)
+    failed = sum(1 for _, _, error in results if error)
+    console.print(f"[green]{len(results) - failed} sent[/green]" + (f", [red]❌ {failed} failed[/red]" if failed else ""))
+
+
 def send_eth_usdt(wallet, to_address, amount, gas_price_gwei):
     from web3 import Web3
 
@@ -187,7 +306,7 @@ def send_eth_usdt(wallet, to_address, amount, gas_price_gwei):
         gas_price = w3.to_wei(gas_price_gwei, 'gwei')
         amount_in_wei = int(float(amount) * 1e6)
 
-        tx = contract.functions.transfer(to_address, amount_in_wei).buildTransaction({
+        tx = contract.functions.transfer(to_address, amount_in_wei).build_transaction({
             'chainId': 1,
             'gas': 100000,
             'gasPrice': gas_price,
@@ -195,9 +314,10 @@ def send_eth_usdt(wallet, to_address, amount, gas_price_gwei):
         })
 
         signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        tx_hash = w3.eth.send_raw_transaction(getattr(signed_tx, "raw_transaction", None) or signed_tx.rawTransaction)
 
         console.print(f"[green]ERC20 USDT sent! TxHash: {tx_hash.hex()}[/green]")
+        tracker.track_sent("USDT-ERC20", tx_hash.hex())
     except Exception as e:
         console.print(f"[red]Error sending ERC20 USDT: {e}[/red]")
 
@@ -289,5 +409,8 @@ def main_menu():
                 sys.exit()
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
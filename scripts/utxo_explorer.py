@@ -0,0 +1,170 @@
+"""
+Balance and UTXO lookups for the receive-only UTXO wallets (DASH, ZEC) through
+pluggable block explorer backends.
+- One Explorer class per API flavour: Insight (bitcore insight-api), Blockbook
+  (Trezor's /api/v2) and BlockCypher. Each knows how many addresses one request
+  can carry (Insight: comma-joined /addrs/<a,b,..>/utxo; BlockCypher:
+  semicolon-joined /addrs/<a;b;..>; Blockbook: one address per request)
+- balances() / utxos() split any number of addresses into such batches and run
+  them concurrently (WORKERS threads), so a sweep over many addresses costs
+  ceil(n / batch_size) requests spread over the pool
+- Requests go through the coin's rpc_router (failover, pacing, metrics) as
+  cached GETs, so repeated lookups within http_cache's TTL cost nothing
+- The backend is picked per coin: HIDERAX_EXPLORER_<COIN> names the flavour
+  (default DEFAULTS[coin]), HIDERAX_RPC_<COIN> overrides the URL(s) as for
+  every other router; otherwise the flavour's public endpoint from EXPLORERS
+- Balances are confirmed amounts in the coin's smallest unit; a malformed
+  reply raises rpc_router.RouterError instead of reading as 0
+
+`python3 utxo_explorer.py [balance | utxos] <coin> <address> [address ...]`
+"""
+import os
+import sys
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence
+
+import rpc_router
+
+WORKERS = 8
+
+# coin -> flavour -> public endpoint
+EXPLORERS: Dict[str, Dict[str, str]] = {
+    "DASH": {
+        "blockcypher": "https://api.blockcypher.com/v1/dash/main",
+        "insight": "https://insight.dash.org/insight-api",
+        "blockbook": "https://dash1.trezor.io",
+    },
+    "ZEC": {
+        "blockbook": "https://zec1.trezor.io",
+    },
+}
+DEFAULTS = {"DASH": "blockcypher", "ZEC": "blockbook"}
+
+_pool = ThreadPoolExecutor(max_workers=WORKERS, thread_name_prefix="explorer")
+
+
+class Explorer(ABC):
+    """A block explorer API behind one rpc_router; subclasses fill in the two batch lookups."""
+    batch_size = 1  # addresses per request
+
+    def __init__(self, coin: str, router: rpc_router.RPCRouter):
+        self.coin = coin
+        self.router = router
+
+    @abstractmethod
+    def _balances(self, batch: Sequence[str]) -> Dict[str, int]:
+        """{address: confirmed balance} for one batch."""
+
+    @abstractmethod
+    def _utxos(self, batch: Sequence[str]) -> List[Dict[str, Any]]:
+        """[{address, txid, vout, value, confirmations, height}] for one batch."""
+
+    def _gather(self, lookup: Callable[[Sequence[str]], Any], addresses: Sequence[str]) -> List[Any]:
+        addresses = list(dict.fromkeys(addresses))
+        batches = [addresses[i:i + self.batch_size] for i in range(0, len(addresses), self.batch_size)]
+        try:
+            return list(_pool.map(lookup, batches))
+        except (KeyError, TypeError, ValueError) as e:
+            raise rpc_router.RouterError(f"{self.coin} explorer returned an unexpected reply: {e!r}") from e
+
+    def balances(self, addresses: Sequence[str]) -> Dict[str, int]:
+        """Confirmed balance per address."""
+        found: Dict[str, int] = {}
+        for part in self._gather(self._balances, addresses):
+            found.update(part)
+        return {a: found.get(a, 0) for a in addresses}
+
+    def balance(self, addresses: Sequence[str]) -> int:
+        return sum(self.balances(addresses).values())
+
+    def utxos(self, addresses: Sequence[str]) -> List[Dict[str, Any]]:
+        return [u for part in self._gather(self._utxos, addresses) for u in part]
+
+
+class InsightExplorer(Explorer):
+    batch_size = 50
+
+    def _utxos(self, batch):
+        reply = self.router.get_json(f"/addrs/{','.join(batch)}/utxo", cached=True)
+        return [{"address": u["address"], "txid": u["txid"], "vout": u["vout"], "value": int(u["satoshis"]),
+                 "confirmations": u.get("confirmations", 0), "height": u.get("height")} for u in reply]
+
+    def _balances(self, batch):
+        totals = dict.fromkeys(batch, 0)
+        for u in self._utxos(batch):
+            if u["confirmations"]:
+                totals[u["address"]] += u["value"]
+        return totals
+
+
+class BlockbookExplorer(Explorer):
+    batch_size = 1
+
+    def _utxos(self, batch):
+        reply = self.router.get_json(f"/api/v2/utxo/{batch[0]}", cached=True)
+        return [{"address": batch[0], "txid": u["txid"], "vout": u["vout"], "value": int(u["value"]),
+                 "confirmations": u.get("confirmations", 0), "height": u.get("height")} for u in reply]
+
+    def _balances(self, batch):
+        reply = self.router.get_json(f"/api/v2/address/{batch[0]}?details=basic", cached=True)
+        return {batch[0]: int(reply["balance"])}
+
+
+class BlockCypherExplorer(Explorer):
+    batch_size = 20
+
+    def _get(self, batch, suffix: str) -> List[Dict[str, Any]]:
+        reply = self.router.get_json(f"/addrs/{';'.join(batch)}{suffix}", cached=True)
+        return reply if isinstance(reply, list) else [reply]  # a single address comes back unwrapped
+
+    def _balances(self, batch):
+        return {entry["address"]: int(entry["balance"]) for entry in self._get(batch, "/balance")}
+
+    def _utxos(self, batch):
+        return [{"address": entry["address"], "txid": ref["tx_hash"], "vout": ref["tx_output_n"],
+                 "value": int(ref["value"]), "confirmations": ref.get("confirmations", 0),
+                 "height": ref.get("block_height")}
+                for entry in self._get(batch, "?unspentOnly=true")
+                for ref in entry.get("txrefs", []) + entry.get("unconfirmed_txrefs", [])]
+
+
+BACKENDS: Dict[str, type] = {
+    "insight": InsightExplorer,
+    "blockbook": BlockbookExplorer,
+    "blockcypher": BlockCypherExplorer,
+}
+
+
+@lru_cache(maxsize=None)
+def get(coin: str) -> Explorer:
+    """The coin's configured explorer (one per process)."""
+    coin = coin.upper()
+    flavour = os.environ.get(f"HIDERAX_EXPLORER_{coin}", DEFAULTS[coin]).lower()
+    if flavour not in BACKENDS:
+        raise ValueError(f"Unknown explorer backend {flavour!r} for {coin}; choose from {', '.join(BACKENDS)}")
+    return BACKENDS[flavour](coin, rpc_router.get_router(coin.lower(), EXPLORERS[coin].get(flavour)))
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    if len(sys.argv) < 4 or sys.argv[1] not in ("balance", "utxos"):
+        print("Usage: utxo_explorer.py [balance | utxos] <coin> <address> [address ...]")
+        sys.exit(1)
+    command, coin, addresses = sys.argv[1], sys.argv[2].upper(), sys.argv[3:]
+    explorer = get(coin)
+    table = Table(title=f"🔎 {coin} via {type(explorer).__name__}", header_style="bold magenta")
+    if command == "balance":
+        table.add_column("Address", style="cyan")
+        table.add_column("Balance", justify="right", style="green")
+        for address, sats in explorer.balances(addresses).items():
+            table.add_row(address, f"{sats / 1e8:.8f}")
+    else:
+        for column in ("Address", "Outpoint", "Value", "Confirmations"):
+            table.add_column(column, overflow="fold")
+        for u in explorer.utxos(addresses):
+            table.add_row(u["address"], f"{u['txid']}:{u['vout']}", f"{u['value'] / 1e8:.8f}", str(u["confirmations"]))
+    Console().print(table)
@@ -0,0 +1,231 @@
+"""
+Watch-only mode for balance servers.
+- `export` runs where the wallets live and writes WATCH_PATH with account-level
+  public keys only: the bitcoinlib account key for BTC/LTC/DOGE, the shared EVM
+  xpub from hd_evm, and BIP44 (ATOM) / CIP-1852 (ADA) account xpubs derived from
+  the ADA/ATOM mnemonic. A balance server copies just that file: it can derive
+  and scan addresses but never sign
+- Addresses are derived in bulk with bip_utils, one non-hardened child step each
+  (~0.2 ms, against ~3 ms through bitcoinlib's HDKey), and kept in memory;
+  precompute() fills the cache at startup so later lookups are list slices
+- scan() looks derived addresses up: BTC/LTC/DOGE through bitcoinlib services,
+  ETH/BNB/POL through batched eth_getBalance on the chain's rpc_router.
+  ATOM and ADA have no balance backend yet and are derive-only
+- ADA uses CIP-1852 Icarus keys (Yoroi / Daedalus layout), so it yields real
+  Shelley base addresses from the same mnemonic as ada-atom.py
+
+`python3 watch_only.py export | addresses <chain> [start] [count] | scan <chain> [count]`
+"""
+import importlib
+import json
+import os
+import sys
+import threading
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional
+
+from bip_utils import (Bip32KeyData, Bip32Secp256k1, Bip39SeedGenerator, Bip44, Bip44Changes, Bip44Coins,
+                       CardanoIcarusSeedGenerator, CardanoShelley, Cip1852, Cip1852Coins, P2PKHAddrEncoder,
+                       P2WPKHAddrEncoder)
+
+import hd_evm
+
+WATCH_DIR = "wallet_Watch"
+WATCH_PATH = os.environ.get("HIDERAX_WATCH_FILE", os.path.join(WATCH_DIR, "xpubs.json"))
+PRECOMPUTE = int(os.environ.get("HIDERAX_WATCH_PRECOMPUTE", "1000"))  # addresses per key at startup
+EVM_BATCH = 100  # eth_getBalance calls per JSON-RPC batch
+
+KEYS = ("BTC", "LTC", "DOGE", "EVM", "ATOM", "ADA")  # one account key per local wallet
+UTXO_WALLETS = {"BTC": ("btc", "bitcoin"), "LTC": ("ltc", "litecoin"), "DOGE": ("doge", "dogecoin")}
+
+# chain -> (key in WATCH_PATH, how to scan it, backend: bitcoinlib network or rpc_router chain, decimals)
+CHAINS: Dict[str, tuple] = {
+    "BTC": ("BTC", "utxo", "bitcoin", 8),
+    "LTC": ("LTC", "utxo", "litecoin", 8),
+    "DOGE": ("DOGE", "utxo", "dogecoin", 8),
+    "ETH": ("EVM", "evm", "eth", 18),
+    "BNB": ("EVM", "evm", "bsc", 18),
+    "POL": ("EVM", "evm", "polygon", 18),
+    "ATOM": ("ATOM", None, None, 6),
+    "ADA": ("ADA", None, None, 6),
+}
+
+_cache: Dict[str, List[str]] = {}  # key in WATCH_PATH -> addresses 0..n-1
+_derivers: Dict[str, Callable[[int], str]] = {}
+_cache_lock = threading.Lock()
+
+
+# ---------- Export (runs next to the secrets) ----------
+def account_key(name: str) -> Optional[Dict[str, Any]]:
+    """Account-level public key of one local wallet (see KEYS), or None if it doesn't exist."""
+    if name in UTXO_WALLETS:
+        from bitcoinlib.wallets import Wallet
+        script, network = UTXO_WALLETS[name]
+        module = importlib.import_module(script)
+        if not module.wallet_exists():
+            return None
+        account = Wallet(module.WALLET_NAME, db_uri=f"sqlite:///{module.DB_PATH}").public_master()
+        return {"xpub": account.wif, "path": account.path, "network": network}
+
+    if name == "EVM":
+        return {"xpub": hd_evm.load_seed()["xpub"], "path": hd_evm.ACCOUNT_PATH} if hd_evm.seed_exists() else None
+
+    staking = importlib.import_module("ada-atom")
+    mnemonic = staking.safe_load_json(staking.INFO_PATH).get("mnemonic") if staking.wallet_exists() else None
+    if not mnemonic:
+        return None
+    if name == "ATOM":
+        atom = Bip44.FromSeed(Bip39SeedGenerator(mnemonic).Generate(), Bip44Coins.COSMOS).Purpose().Coin().Account(0)
+        return {"xpub": atom.PublicKey().ToExtended(), "path": "m/44'/118'/0'"}
+    if name == "ADA":
+        ada = Cip1852.FromSeed(CardanoIcarusSeedGenerator(mnemonic).Generate(), Cip1852Coins.CARDANO_ICARUS)
+        return {"xpub": ada.Purpose().Coin().Account(0).PublicKey().ToExtended(), "path": "m/1852'/1815'/0'"}
+    raise KeyError(name)
+
+
+def export() -> Dict[str, Dict[str, Any]]:
+    """Write WATCH_PATH from the local wallets; returns the exported keys."""
+    keys = {name: entry for name in KEYS if (entry := account_key(name))}
+    if not keys:
+        raise FileNotFoundError("No wallets to export. Create one first.")
+    os.makedirs(os.path.dirname(WATCH_PATH) or ".", exist_ok=True)
+    with open(WATCH_PATH, "w") as f:
+        json.dump(keys, f, indent=4)
+    return keys
+
+
+# ---------- Derivation (runs on the balance server) ----------
+@lru_cache(maxsize=1)
+def load() -> Dict[str, Dict[str, Any]]:
+    if not os.path.exists(WATCH_PATH):
+        raise FileNotFoundError(f"{WATCH_PATH} not found. Run `watch_only.py export` next to the wallets.")
+    with open(WATCH_PATH) as f:
+        return json.load(f)
+
+
+def _utxo_deriver(entry: Dict[str, Any]) -> Callable[[int], str]:
+    from bitcoinlib.keys import HDKey
+
+    account = HDKey(entry["xpub"], network=entry["network"])
+    external = Bip32Secp256k1.FromPublicKey(account.public_byte,
+                                            Bip32KeyData(chain_code=account.chain, depth=account.depth)).ChildKey(0)
+    prefixes = account.network
+    if account.witness_type == "segwit":
+        encode = lambda pub: P2WPKHAddrEncoder.EncodeKey(pub, hrp=prefixes.prefix_bech32, wit_ver=0)
+    elif account.witness_type == "legacy":
+        encode = lambda pub: P2PKHAddrEncoder.EncodeKey(pub, net_ver=prefixes.prefix_address)
+    else:
+        raise ValueError(f"Unsupported witness type for watch-only: {account.witness_type}")
+    return lambda i: encode(external.ChildKey(i).PublicKey().RawCompressed().ToBytes())
+
+
+def deriver(key: str, entry: Dict[str, Any]) -> Callable[[int], str]:
+    """index -> receive address for an account_key() entry; public keys only."""
+    if key in UTXO_WALLETS:
+        return _utxo_deriver(entry)
+    if key == "EVM":
+        return lambda i: hd_evm.derive(i, extended_key=entry["xpub"]).address
+    if key == "ATOM":
+        external = Bip44.FromExtendedKey(entry["xpub"], Bip44Coins.COSMOS).Change(Bip44Changes.CHAIN_EXT)
+        return lambda i: external.AddressIndex(i).PublicKey().ToAddress()
+    if key == "ADA":
+        account = Cip1852.FromExtendedKey(entry["xpub"], Cip1852Coins.CARDANO_ICARUS)
+        external = CardanoShelley.FromCip1852Object(account).Change(Bip44Changes.CHAIN_EXT)
+        return lambda i: external.AddressIndex(i).PublicKeys().ToAddress()
+    raise KeyError(key)
+
+
+def _key(chain: str) -> str:
+    chain = chain.upper()
+    if chain not in CHAINS:
+        raise ValueError(f"Unknown chain: {chain}. Choose from {', '.join(CHAINS)}.")
+    key = CHAINS[chain][0]
+    if key not in load():
+        raise KeyError(f"{chain} is not in {WATCH_PATH}.")
+    return key
+
+
+def addresses(chain: str, start: int = 0, count: int = 1) -> List[str]:
+    """Receive addresses start..start+count-1 of a chain, derived once and cached."""
+    key = _key(chain)
+    with _cache_lock:
+        derive = _derivers.get(key) or _derivers.setdefault(key, deriver(key, load()[key]))
+        cached = _cache.setdefault(key, [])
+        cached.extend(derive(i) for i in range(len(cached), start + count))
+        return cached[start:start + count]
+
+
+def precompute(count: int = PRECOMPUTE, chains: Optional[List[str]] = None):
+    """Derive the first `count` addresses of every exported chain (or just `chains`)."""
+    for chain in chains or [c for c, spec in CHAINS.items() if spec[0] in load()]:
+        addresses(chain, 0, count)
+
+
+# ---------- Scanning ----------
+def _evm_balances(router_chain: str, batch: List[str]) -> List[int]:
+    import rpc_router
+    reply = rpc_router.get_router(router_chain).post_json(
+        [{"jsonrpc": "2.0", "id": i, "method": "eth_getBalance", "params": [a, "latest"]} for i, a in enumerate(batch)])
+    by_id = {r.get("id"): r for r in reply}
+    errors = [r["error"] for r in reply if "error" in r]
+    if errors:
+        raise rpc_router.RouterError(f"eth_getBalance: {errors[0]}")
+    return [int(by_id[i]["result"], 16) for i in range(len(batch))]
+
+
+def scan(chain: str, count: int = 20, start: int = 0) -> Dict[str, Any]:
+    """Balances of a chain's derived addresses; `funded` is per address where the backend allows it."""
+    chain = chain.upper()
+    key, kind, backend, decimals = CHAINS[chain] if chain in CHAINS else (None, None, None, 0)
+    batch = addresses(chain, start, count)
+    if kind == "utxo":
+        from bitcoinlib.services.services import Service
+        total, funded = Service(network=backend).getbalance(batch), []
+    elif kind == "evm":
+        amounts = []
+        for i in range(0, len(batch), EVM_BATCH):
+            amounts += _evm_balances(backend, batch[i:i + EVM_BATCH])
+        funded = [(start + i, a, v / 10 ** decimals) for i, (a, v) in enumerate(zip(batch, amounts)) if v]
+        total = sum(amounts)
+    else:
+        raise ValueError(f"No balance backend for {chain}; use `addresses` instead.")
+    return {"chain": chain, "start": start, "count": len(batch), "total": total / 10 ** decimals, "funded": funded}
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "export":
+        table = Table(title=f"👀 Watch-only keys → {WATCH_PATH}", header_style="bold magenta")
+        table.add_column("Key", style="cyan")
+        table.add_column("Path")
+        table.add_column("Extended public key", style="green", overflow="fold")
+        for name, entry in export().items():
+            table.add_row(name, entry["path"], entry["xpub"])
+        console.print(table)
+    elif command == "addresses" and len(sys.argv) > 2:
+        start = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+        count = int(sys.argv[4]) if len(sys.argv) > 4 else 10
+        table = Table(title=f"👀 {sys.argv[2].upper()} watch-only addresses", header_style="bold magenta")
+        table.add_column("Index", style="cyan", justify="right")
+        table.add_column("Address", style="green")
+        for i, address in enumerate(addresses(sys.argv[2], start, count), start):
+            table.add_row(str(i), address)
+        console.print(table)
+    elif command == "scan" and len(sys.argv) > 2:
+        count = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+        precompute(max(count, PRECOMPUTE), [sys.argv[2]])
+        result = scan(sys.argv[2], count)
+        table = Table(title=f"👀 {result['chain']} scan: {result['count']} addresses, total {result['total']}",
+                      header_style="bold magenta")
+        table.add_column("Index", style="cyan", justify="right")
+        table.add_column("Address", style="green")
+        table.add_column("Balance", justify="right")
+        for i, address, amount in result["funded"]:
+            table.add_row(str(i), address, f"{amount}")
+        console.print(table)
+    else:
+        console.print("Usage: watch_only.py export | addresses <chain> [start] [count] | scan <chain> [count]")
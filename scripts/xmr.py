@@ -8,6 +8,8 @@ import qrcode
 
 from monero.seed import Seed
 
+import profiler
+
 console = Console()
 WALLET_DIR = "wallet_XMR"
 INFO_PATH = os.path.join(WALLET_DIR, "wallet_info.json")
@@ -74,6 +76,56 @@ def receive_xmr():
     q.print_ascii(invert=True)
 
 
+def sync_wallet():
+    if not wallet_exists():
+        console.print("[red]❌ Wallet not found.[/red]\n")
+        return
+    import xmr_sync
+    try:
+        with console.status("[cyan]Scanning blocks with the view key...[/cyan]") as status:
+            state = xmr_sync.sync(
+                progress=lambda height, top: status.update(f"[cyan]Block {height:,} / {top:,}[/cyan]"))
+    except Exception as e:
+        console.print(f"[red]❌ Sync failed:[/red] {e}\n")
+        return
+
+    table = Table(title="📥 Received Outputs", header_style="bold magenta")
+    table.add_column("Height", justify="right")
+    table.add_column("TXID", style="cyan", overflow="fold")
+    table.add_column("Amount (XMR)", justify="right", style="green")
+    for o in state["outputs"][-20:]:
+        table.add_row(str(o["height"]), o["txid"], f"{o['amount'] / 1e12:.12f}")
+    console.print(table)
+    for o in state.get("skipped", []):
+        console.print(f"[yellow]⚠️ Output {o['txid']}:{o['n']} (block {o['height']}) is ours but was not counted: "
+                      f"{o['error']}[/yellow]")
+    console.print(Panel.fit(f"[bold cyan]Synced to block:[/bold cyan] {state['height']:,}\n"
+                            f"[bold cyan]Received:[/bold cyan] {xmr_sync.received(state) / 1e12:.12f} XMR\n"
+                            "[dim]View-key scan: outgoing spends are not subtracted.[/dim]",
+                            title="🛡️ Monero Sync"))
+
+
+def generate_subaddresses():
+    if not wallet_exists():
+        console.print("[red]❌ Wallet not found.[/red]\n")
+        return
+    import xmr_subaddress
+    major = int(Prompt.ask("[bold cyan]Account (major index)[/bold cyan]", default="0"))
+    count = int(Prompt.ask("[bold cyan]How many new subaddresses[/bold cyan]", default="10"))
+    first = max([r[1] for r in xmr_subaddress.load() if r[0] == major], default=0) + 1
+    with console.status(f"[cyan]Deriving {count:,} subaddresses...[/cyan]"):
+        new = xmr_subaddress.generate([major], range(first, first + count))
+
+    table = Table(title="🛡️ New Subaddresses", header_style="bold magenta")
+    table.add_column("Index", justify="right")
+    table.add_column("Address", style="cyan", overflow="fold")
+    for major_, minor, addr, _ in new[:20]:
+        table.add_row(f"{major_}/{minor}", addr)
+    console.print(table)
+    console.print(f"[green]✅ {len(new):,} subaddresses saved to {xmr_subaddress.SUBADDRESS_PATH}[/green] "
+                  "[dim](the next sync recognises deposits to them)[/dim]\n")
+
+
 def main_menu():
     while True:
         console.print(Panel("[bold yellow]XMR Wallet CLI[/bold yellow]",
@@ -85,16 +137,25 @@ def main_menu():
             console.print("[bold blue]1.[/bold blue] Create Wallet")
 
         console.print("[bold blue]2.[/bold blue] Receive XMR")
-        console.print("[bold blue]3.[/bold blue] Exit")
-        choice = Prompt.ask("\n[bold green]Select an option[/bold green]", choices=["1", "2", "3"])
+        console.print("[bold blue]3.[/bold blue] Sync & Received Balance")
+        console.print("[bold blue]4.[/bold blue] Generate Subaddresses")
+        console.print("[bold blue]5.[/bold blue] Exit")
+        choice = Prompt.ask("\n[bold green]Select an option[/bold green]", choices=["1", "2", "3", "4", "5"])
         if choice == "1":
             view_wallet() if wallet_exists() else create_wallet()
         elif choice == "2":
             receive_xmr()
+        elif choice == "3":
+            sync_wallet()
+        elif choice == "4":
+            generate_subaddresses()
         else:
             console.print("[bold red]Goodbye![/bold red]")
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
@@ -0,0 +1,145 @@
+"""
+Monero subaddresses in bulk, for per-customer deposit addresses.
+- Subaddress (major, minor) of the wallet: m = Hs("SubAddr\\0" || a || major || minor),
+  D = B + m·G, C = a·D (a: private view key, B: primary spend public key), so
+  only the view key is needed and the spend key never leaves wallet_info.json
+- Index ranges are split into BATCH-sized runs and derived on every core
+  (WORKERS processes, like xmr_sync's scanner)
+- Results go to wallet_XMR/subaddresses.json (written atomically) as
+  [major, minor, address, spend public key] rows. Generating a range again only
+  derives the indices not in the file yet
+- table() is the spend public key -> (major, minor) lookup xmr_sync uses to
+  recognise outputs to any of them with one dict lookup per output. Outputs to
+  a subaddress are only found in blocks scanned after it was generated: rescan
+  with `xmr_sync.py sync <height>` when adding addresses for past deposits
+
+`python3 xmr_subaddress.py [generate <majors> <minors> | list [major]]` (ranges like 0 or 0-999)
+"""
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Tuple
+
+import nacl.bindings as sodium
+from monero import base58, const
+from monero.address import address as parse_address
+from monero.keccak import keccak_256
+
+import xmr
+import xmr_sync
+
+SUBADDRESS_PATH = os.path.join(xmr.WALLET_DIR, "subaddresses.json")
+BATCH = 500  # indices per worker task
+WORKERS = os.cpu_count() or 1
+
+Row = List  # [major, minor, address, spend public key hex]
+
+
+# ---------- Derivation (runs in the worker processes) ----------
+_view_key: bytes = b""
+_spend_pub: bytes = b""
+_netbyte: int = 0
+
+
+def _init(view_key_hex: str, spend_pub: bytes, netbyte: int):
+    global _view_key, _spend_pub, _netbyte
+    _view_key, _spend_pub, _netbyte = bytes.fromhex(view_key_hex), spend_pub, netbyte
+
+
+def derive(major: int, minor: int) -> Row:
+    m = xmr_sync.scalar(b"SubAddr\x00" + _view_key + struct.pack("<II", major, minor))
+    spend = sodium.crypto_core_ed25519_add(_spend_pub, sodium.crypto_scalarmult_ed25519_base_noclamp(m))
+    view = sodium.crypto_scalarmult_ed25519_noclamp(_view_key, spend)
+    data = bytes([_netbyte]) + spend + view
+    return [major, minor, base58.encode((data + keccak_256(data).digest()[:4]).hex()), spend.hex()]
+
+
+def _derive_run(run: Tuple[int, List[int]]) -> List[Row]:
+    major, minors = run
+    return [derive(major, minor) for minor in minors]
+
+
+# ---------- Storage ----------
+def load() -> List[Row]:
+    try:
+        with open(SUBADDRESS_PATH) as f:
+            return json.load(f)["subaddresses"]
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _save(rows: List[Row]):
+    tmp = SUBADDRESS_PATH + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"subaddresses": rows, "updated": time.time()}, f)
+    os.replace(tmp, SUBADDRESS_PATH)
+
+
+def table() -> Dict[bytes, Tuple[int, int]]:
+    """Spend public key -> (major, minor) of every generated subaddress."""
+    return {bytes.fromhex(spend): (major, minor) for major, minor, _, spend in load()}
+
+
+def address_of(major: int, minor: int) -> str:
+    for row in load():
+        if row[0] == major and row[1] == minor:
+            return row[2]
+    raise KeyError(f"Subaddress {major}/{minor} not generated")
+
+
+def generate(majors: Iterable[int], minors: Iterable[int]) -> List[Row]:
+    """Derive every (major, minor) not in the file yet, in parallel; returns the new rows."""
+    view_key, spend_pub = xmr_sync.load_keys()
+    with open(xmr.INFO_PATH) as f:
+        net = parse_address(json.load(f)["address"]).net
+    rows = load()
+    have = {(r[0], r[1]) for r in rows}
+    minors = list(minors)
+    runs = []
+    for major in majors:
+        todo = [m for m in minors if (major, m) not in have and (major, m) != (0, 0)]  # 0/0 is the primary
+        runs += [(major, todo[i:i + BATCH]) for i in range(0, len(todo), BATCH)]
+    if not runs:
+        return []
+
+    initargs = (view_key, spend_pub, const.SUBADDR_NETBYTES[const.NETS.index(net)])
+    if len(runs) == 1:  # not worth starting processes for
+        _init(*initargs)
+        new = _derive_run(runs[0])
+    else:
+        with ProcessPoolExecutor(max_workers=min(WORKERS, len(runs)), initializer=_init,
+                                 initargs=initargs) as pool:
+            new = [row for part in pool.map(_derive_run, runs) for row in part]
+    _save(sorted(rows + new, key=lambda r: (r[0], r[1])))
+    return new
+
+
+def _range(text: str) -> range:
+    first, _, last = text.partition("-")
+    return range(int(first), int(last or first) + 1)
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    command = sys.argv[1] if len(sys.argv) > 1 else "list"
+    if command == "generate":
+        started = time.perf_counter()
+        new = generate(_range(sys.argv[2]) if len(sys.argv) > 2 else range(1),
+                       _range(sys.argv[3]) if len(sys.argv) > 3 else range(1, 101))
+        console.print(f"[green]✅ {len(new)} subaddresses derived in {time.perf_counter() - started:.1f}s[/green] "
+                      f"→ {SUBADDRESS_PATH}")
+    else:
+        major = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        listing = Table(title=f"🛡️ XMR subaddresses ({SUBADDRESS_PATH})", header_style="bold magenta")
+        for column in ("Index", "Address"):
+            listing.add_column(column, overflow="fold")
+        for row in load():
+            if major is None or row[0] == major:
+                listing.add_row(f"{row[0]}/{row[1]}", row[2])
+        console.print(listing)
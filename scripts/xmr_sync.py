@@ -0,0 +1,339 @@
+"""
+Monero wallet sync: finds incoming outputs with the private view key.
+- Blocks come from a monerod RPC (HIDERAX_RPC_XMR, default DAEMON_URL) through
+  rpc_router: get_block per height on a thread pool, then one /get_transactions
+  call per TX_BATCH transaction hashes
+- Blocks are scanned on every core (WORKERS processes, like batch_signer). Per
+  transaction key one 8·a·R derivation; per output the view tag is checked
+  first (skips ~255 of 256 foreign outputs), then the spend key P - Hs·G is
+  looked up in a table of our spend public keys: one dict lookup per output, no
+  matter how many subaddresses the table holds (the primary address plus
+  everything xmr_subaddress.py has generated)
+- Amounts are decrypted from ecdhInfo (8-byte XOR for RingCT types 4+, the
+  older 32-byte scalar encoding for types 1-3) and checked against the
+  output's commitment (y·G + b·H), so a bogus amount is never counted. An
+  output that is ours but whose amount can't be verified is kept in the
+  checkpoint's `skipped` list instead of being dropped; malformed outputs that
+  can't be checked at all are passed over without stopping the scan
+- Progress is checkpointed to wallet_XMR/sync.json after every CHUNK blocks
+  (written atomically). The last REORG_DEPTH block hashes are kept: if the
+  chain no longer continues from them, sync rewinds and rescans
+- Receive side only: telling spent outputs apart needs key images, which this
+  does not compute, so the total is what the wallet has received
+
+`python3 xmr_sync.py [sync [from_height] | outputs]`
+"""
+import json
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import nacl.bindings as sodium
+import varint
+from nacl.exceptions import CryptoError
+from monero.address import address as parse_address
+from monero.keccak import keccak_256
+
+import rpc_router
+import xmr
+
+DAEMON_URL = "http://127.0.0.1:18081"
+CHECKPOINT_PATH = os.path.join(xmr.WALLET_DIR, "sync.json")
+RESTORE_HEIGHT = int(os.environ.get("HIDERAX_XMR_RESTORE_HEIGHT", "0"))  # first block of a new wallet
+CHUNK = 200  # blocks per fetch / checkpoint
+FETCH_WORKERS = 8  # concurrent get_block calls
+TX_BATCH = 100  # hashes per /get_transactions call (restricted RPC limit)
+WORKERS = os.cpu_count() or 1
+REORG_DEPTH = 10
+
+H = bytes.fromhex("8b655970153799af2aeadc9ff1add0ea6c7251d54154cfa92c173a0dd39c1f94")  # amount generator
+EIGHT = (8).to_bytes(32, "little")
+
+
+# ---------- Keys ----------
+def scalar(data: bytes) -> bytes:
+    """Hs(): keccak reduced mod l."""
+    return sodium.crypto_core_ed25519_scalar_reduce(keccak_256(data).digest() + bytes(32))
+
+
+def load_keys() -> Tuple[str, bytes]:
+    """(private view key hex, primary spend public key) of the local wallet."""
+    if not xmr.wallet_exists():
+        raise FileNotFoundError("XMR wallet not found. Create it first.")
+    with open(xmr.INFO_PATH) as f:
+        info = json.load(f)
+    return info["private_view_key"], bytes.fromhex(parse_address(info["address"]).spend_key())
+
+
+def spend_table() -> Dict[bytes, Tuple[int, int]]:
+    """Spend public key -> (major, minor) for every address the scanner should recognise."""
+    import xmr_subaddress  # imports this module
+    _, spend_pub = load_keys()
+    return {**xmr_subaddress.table(), spend_pub: (0, 0)}
+
+
+# ---------- Scanning (runs in the worker processes) ----------
+_view_key: bytes = b""
+_table: Dict[bytes, Tuple[int, int]] = {}
+
+
+def _init(view_key_hex: str, table: Dict[bytes, Tuple[int, int]]):
+    global _view_key, _table
+    _view_key = sodium.crypto_core_ed25519_scalar_mul(bytes.fromhex(view_key_hex), EIGHT)  # 8·a, once
+    _table = table
+
+
+def _tx_keys(extra: List[int]) -> Tuple[List[bytes], List[bytes]]:
+    """(transaction public keys, additional per-output keys) from tx_extra."""
+    data, i, main, additional = bytes(extra), 0, [], []
+    while i < len(data):
+        tag = data[i]
+        if tag == 0x00:  # padding runs to the end
+            break
+        if tag == 0x01:
+            main.append(data[i + 1:i + 33])
+            i += 33
+        elif tag == 0x02:  # nonce (payment id)
+            i += 2 + data[i + 1]
+        elif tag == 0x04:
+            count = varint.decode_bytes(data[i + 1:i + 11])
+            i += 1 + len(varint.encode(count))
+            additional = [data[i + 32 * k:i + 32 * (k + 1)] for k in range(count)]
+            i += 32 * count
+        else:  # unknown field: its length can't be known, the keys come first anyway
+            break
+    return main, additional
+
+
+def _derive(tx_key: bytes) -> Optional[bytes]:
+    try:
+        return sodium.crypto_scalarmult_ed25519_noclamp(_view_key, tx_key)
+    except Exception:  # not a valid point: can't be ours
+        return None
+
+
+def _commitment(mask: bytes, value: bytes) -> bytes:
+    """mask·G + value·H; libsodium refuses a zero scalar, and a zero amount commits to mask·G alone."""
+    blinded = sodium.crypto_scalarmult_ed25519_base_noclamp(mask)
+    if not any(value):
+        return blinded
+    return sodium.crypto_core_ed25519_add(blinded, sodium.crypto_scalarmult_ed25519_noclamp(value, H))
+
+
+def _amount(tx: Dict[str, Any], n: int, hs: bytes) -> Optional[int]:
+    """Decrypted amount in atomic units, or None if it doesn't match the commitment."""
+    rct = tx.get("rct_signatures") or {}
+    if not rct.get("type"):  # coinbase / pre-RingCT: the amount is in the clear
+        return tx["vout"][n]["amount"]
+    ecdh = rct["ecdhInfo"][n]
+    if rct["type"] <= 3:  # Full / Simple / Bulletproof: 32-byte scalars blinded with Hs(hs) and Hs(Hs(hs))
+        blind = scalar(hs)
+        mask = sodium.crypto_core_ed25519_scalar_sub(bytes.fromhex(ecdh["mask"]), blind)
+        value = sodium.crypto_core_ed25519_scalar_sub(bytes.fromhex(ecdh["amount"]), scalar(blind))
+        if any(value[8:]):
+            return None
+    else:
+        encrypted = bytes.fromhex(ecdh["amount"])[:8]
+        value = bytes(a ^ b for a, b in zip(encrypted, keccak_256(b"amount" + hs).digest()[:8])) + bytes(24)
+        mask = scalar(b"commitment_mask" + hs)
+    if _commitment(mask, value).hex() != rct["outPk"][n]:
+        return None
+    return struct.unpack("<Q", value[:8])[0]
+
+
+def _scan_output(tx: Dict[str, Any], n: int, derivations: List[bytes],
+                 additional: List[bytes]) -> Optional[Tuple[bytes, Tuple[int, int], Optional[int], Optional[str]]]:
+    """(one-time key, subaddress, amount, error) if output n is ours, else None."""
+    target = tx["vout"][n]["target"]
+    key = bytes.fromhex(target["tagged_key"]["key"] if "tagged_key" in target else target["key"])
+    tag = bytes.fromhex(target["tagged_key"]["view_tag"]) if "tagged_key" in target else None
+    candidates = derivations + ([d] if n < len(additional) and (d := _derive(additional[n])) else [])
+    index = varint.encode(n)
+    for derivation in candidates:
+        if tag is not None and keccak_256(b"view_tag" + derivation + index).digest()[:1] != tag:
+            continue
+        hs = scalar(derivation + index)
+        try:
+            spend_key = sodium.crypto_core_ed25519_sub(key, sodium.crypto_scalarmult_ed25519_base_noclamp(hs))
+        except CryptoError:
+            continue
+        subaddress = _table.get(spend_key)
+        if subaddress is None:
+            continue
+        try:
+            amount = _amount(tx, n, hs)
+        except (CryptoError, KeyError, IndexError, ValueError) as e:
+            return key, subaddress, None, f"undecodable amount ({type(e).__name__}: {e})"
+        return key, subaddress, amount, None if amount is not None else "amount does not match its commitment"
+    return None
+
+
+def scan_transaction(tx: Dict[str, Any], txid: str, height: int, indices: Optional[List[int]]) -> List[Dict[str, Any]]:
+    """Our outputs in tx; ones whose amount can't be verified carry an `error` and amount None."""
+    main, additional = _tx_keys(tx.get("extra", []))
+    derivations = [d for d in map(_derive, main) if d]
+    found = []
+    for n in range(len(tx["vout"])):
+        try:
+            mine = _scan_output(tx, n, derivations, additional)
+        except (CryptoError, KeyError, ValueError, TypeError):  # malformed output: can't be checked, skip it
+            continue
+        if mine is None:
+            continue
+        key, subaddress, amount, error = mine
+        record = {"height": height, "txid": txid, "n": n, "key": key.hex(), "amount": amount,
+                  "global_index": indices[n] if indices else None, "subaddress": list(subaddress),
+                  "coinbase": "gen" in tx["vin"][0]}
+        if error:
+            record["error"] = error
+        found.append(record)
+    return found
+
+
+def scan_block(block: Dict[str, Any]) -> List[Dict[str, Any]]:
+    found = []
+    for tx in block["txs"]:
+        found += scan_transaction(tx["json"], tx["hash"], block["height"], tx.get("output_indices"))
+    return found
+
+
+# ---------- Daemon ----------
+def router():
+    return rpc_router.get_router("xmr", DAEMON_URL)
+
+
+def _rpc(method: str, **params) -> Dict[str, Any]:
+    reply = router().post_json({"jsonrpc": "2.0", "id": "0", "method": method, "params": params}, path="/json_rpc")
+    if "error" in reply:
+        raise rpc_router.RouterError(f"{method}: {reply['error']}")
+    return reply["result"]
+
+
+def daemon_height() -> int:
+    """Height of the next block: blocks 0..height-1 exist."""
+    return _rpc("get_block_count")["count"]
+
+
+def fetch_blocks(start: int, end: int) -> List[Dict[str, Any]]:
+    """Blocks start..end-1 with their transactions decoded."""
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="xmr-fetch") as pool:
+        raw = list(pool.map(lambda h: _rpc("get_block", height=h), range(start, end)))
+
+    blocks, hashes = [], []
+    for reply in raw:
+        header, body = reply["block_header"], json.loads(reply["json"])
+        blocks.append({"height": header["height"], "hash": header["hash"], "prev_hash": header["prev_hash"],
+                       "txs": [{"hash": reply.get("miner_tx_hash", ""), "json": body["miner_tx"]}],
+                       "tx_hashes": reply.get("tx_hashes") or []})
+        hashes += blocks[-1]["tx_hashes"]
+
+    txs = {}
+    for i in range(0, len(hashes), TX_BATCH):
+        reply = router().post_json({"txs_hashes": hashes[i:i + TX_BATCH], "decode_as_json": True},
+                                   path="/get_transactions")
+        for tx in reply.get("txs") or []:
+            txs[tx["tx_hash"]] = {"hash": tx["tx_hash"], "json": json.loads(tx["as_json"]),
+                                  "output_indices": tx.get("output_indices")}
+    for block in blocks:
+        missing = [h for h in block["tx_hashes"] if h not in txs]
+        if missing:
+            raise rpc_router.RouterError(f"Daemon did not return transaction {missing[0]}")
+        block["txs"] += [txs[h] for h in block.pop("tx_hashes")]
+    return blocks
+
+
+# ---------- Checkpoint ----------
+def load_checkpoint() -> Dict[str, Any]:
+    try:
+        with open(CHECKPOINT_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"height": RESTORE_HEIGHT, "hashes": {}, "outputs": [], "skipped": []}
+
+
+def _save_checkpoint(state: Dict[str, Any]):
+    tmp = CHECKPOINT_PATH + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, CHECKPOINT_PATH)
+
+
+def _rewind(state: Dict[str, Any]):
+    """The chain forked below our checkpoint: forget the last REORG_DEPTH blocks."""
+    known = sorted(map(int, state["hashes"]))
+    height = known[0] if known else max(RESTORE_HEIGHT, state["height"] - REORG_DEPTH)
+    state["height"] = height
+    state["hashes"] = {}
+    state["outputs"] = [o for o in state["outputs"] if o["height"] < height]
+    state["skipped"] = [o for o in state.get("skipped", []) if o["height"] < height]
+
+
+def sync(start: Optional[int] = None, progress: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+    """Scan from the checkpoint (or `start`) to the daemon's tip; returns the checkpoint."""
+    view_key, _ = load_keys()
+    table = spend_table()
+    state = load_checkpoint()
+    if start is not None and start != state["height"]:
+        state = {"height": start, "hashes": {}, "outputs": [o for o in state["outputs"] if o["height"] < start],
+                 "skipped": [o for o in state.get("skipped", []) if o["height"] < start]}
+    top = daemon_height()
+
+    with ProcessPoolExecutor(max_workers=WORKERS, initializer=_init, initargs=(view_key, table)) as pool, \
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="xmr-prefetch") as prefetch:
+        pending = prefetch.submit(fetch_blocks, state["height"], min(state["height"] + CHUNK, top))
+        while state["height"] < top:
+            blocks = pending.result()
+            end = state["height"] + len(blocks)
+            parent = state["hashes"].get(str(state["height"] - 1))
+            if parent and blocks and blocks[0]["prev_hash"] != parent:
+                _rewind(state)
+                _save_checkpoint(state)
+                pending = prefetch.submit(fetch_blocks, state["height"], min(state["height"] + CHUNK, top))
+                continue
+            if end < top:  # fetch the next chunk while this one is scanned
+                pending = prefetch.submit(fetch_blocks, end, min(end + CHUNK, top))
+
+            chunksize = max(1, len(blocks) // (WORKERS * 4))
+            for found in pool.map(scan_block, blocks, chunksize=chunksize):
+                state["outputs"] += [o for o in found if "error" not in o]
+                state.setdefault("skipped", []).extend(o for o in found if "error" in o)
+            hashes = {**state["hashes"], **{str(b["height"]): b["hash"] for b in blocks}}
+            state["hashes"] = {h: hashes[h] for h in sorted(hashes, key=int)[-REORG_DEPTH:]}
+            state["height"] = end
+            state["updated"] = time.time()
+            _save_checkpoint(state)
+            if progress:
+                progress(end, top)
+    return state
+
+
+def received(state: Optional[Dict[str, Any]] = None) -> int:
+    """Atomic units received by the wallet up to the checkpoint."""
+    return sum(o["amount"] for o in (state or load_checkpoint())["outputs"])
+
+
+if __name__ == "__main__":
+    from rich.console import Console
+    from rich.table import Table
+
+    console = Console()
+    command = sys.argv[1] if len(sys.argv) > 1 else "sync"
+    if command == "sync":
+        started = time.perf_counter()
+        state = sync(int(sys.argv[2]) if len(sys.argv) > 2 else None,
+                     lambda height, top: console.print(f"[dim]{height}/{top}[/dim]"))
+        console.print(f"[green]✅ Synced to {state['height']} in {time.perf_counter() - started:.1f}s:[/green] "
+                      f"{len(state['outputs'])} outputs, {received(state) / 1e12:.12f} XMR received")
+        for o in state.get("skipped", []):
+            console.print(f"[yellow]⚠️ Skipped output {o['txid']}:{o['n']} at {o['height']}: {o['error']}[/yellow]")
+    else:
+        table = Table(title=f"🛡️ XMR outputs ({CHECKPOINT_PATH})", header_style="bold magenta")
+        for column in ("Height", "TXID", "Out", "Subaddress", "Amount"):
+            table.add_column(column, overflow="fold")
+        for o in load_checkpoint()["outputs"]:
+            table.add_row(str(o["height"]), o["txid"], str(o["n"]), "{}/{}".format(*o["subaddress"]),
+                          f"{o['amount'] / 1e12:.12f}")
+        console.print(table)
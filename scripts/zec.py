@@ -6,6 +6,9 @@ import qrcode
 import os
 import json
 from pycoin.symbols.zec import network
+import profiler
+import rpc_router
+import utxo_explorer
 
 console = Console()
 WALLET_DIR = "wallet_ZEC"
@@ -47,7 +50,13 @@ def view_wallet():
     with open(INFO_PATH, "r") as f:
         data = json.load(f)
 
+    try:
+        balance = f"{utxo_explorer.get('ZEC').balance([data['address']]) / 1e8:.8f} ZEC"
+    except (rpc_router.RouterError, ValueError) as e:
+        balance = f"[red]unavailable ({e})[/red]"
+
     console.print(Panel.fit(f"[bold cyan]ZEC Address:[/bold cyan] {data['address']}\n"
+                            f"[bold cyan]Balance:[/bold cyan] {balance}\n"
                             f"[bold cyan]Private Key (WIF):[/bold cyan] {data['wif']}",
                             title="👛 Wallet Info"))
 
@@ -92,5 +101,8 @@ def main_menu():
             break
 
 
+profiler.instrument(globals())
+
+
 if __name__ == "__main__":
     main_menu()
@@ -1,5 +1,6 @@
 import os
 import platform
+import queue
 import shutil
 import sys
 from pathlib import Path
@@ -16,27 +17,17 @@ console = Console()
 BASE_DIR = Path(__file__).parent.resolve()
 SCRIPTS_DIR = BASE_DIR / "scripts"
 
+sys.path.insert(0, str(SCRIPTS_DIR))
+import registry  # same wallets as main.py
+
 logo = """
 Hiderax
 """
 
-wallet_options = [
-    ("1", "USDT Wallet", "[TRC20] | [ERC20]"),
-    ("2", "BTC Wallet", "Bitcoin Network"),
-    ("3", "ETH Wallet", "Ethereum Network"),
-    ("4", "POL Wallet", "Polygon Network"),
-    ("5", "LTC Wallet", "Litecoin Network"),
-    ("6", "DOGE Wallet", "Dogecoin Network"),
-    ("7", "XMR Wallet", "[Linux Only] Monero Network"),
-    ("8", "ZEC Wallet", "Zcash Network"),
-    ("9", "DASH Wallet", "Dash Network"),
-    ("10", "BNB Wallet", "Binance Chain (BEP20)"),
-    ("0", "[bold red]Exit[/bold red]", "Leave application")
-]
-
-selected_index = 0
-exit_flag = False
-enter_pressed = False
+wallet_options = [(key, info["name"], info["network"]) for key, info in registry.menu_entries()]
+wallet_options.append((registry.EXIT_KEY, "[bold red]Exit[/bold red]", "Leave application"))
+
+MOVES = {keyboard.Key.up: -1, keyboard.Key.down: 1}
 
 
 def clear_console():
@@ -59,7 +50,7 @@ def print_banner():
     gradient_print(centered_logo, start_color="#8e44ad", end_color="#1abc9c")
 
 
-def render_wallet_menu():
+def render_wallet_menu(selected_index):
     table = Table(title="Select Wallet Option (↑ ↓ Enter)", box=box.SIMPLE, title_style="bold magenta")
     table.add_column("Option", justify="center", style="bold yellow")
     table.add_column("Wallet", style="bold white")
@@ -72,70 +63,58 @@ def render_wallet_menu():
     return table
 
 
-def on_press(key):
-    global selected_index, exit_flag, enter_pressed
-
-    if key == keyboard.Key.down:
-        if selected_index < len(wallet_options) - 1:
-            selected_index += 1
-
-    elif key == keyboard.Key.up:
-        if selected_index > 0:
-            selected_index -= 1
-
-    elif key == keyboard.Key.enter:
-        enter_pressed = True
-        exit_flag = True
-        return False
-
-    elif key == keyboard.Key.esc:
-        exit_flag = True
-        return False
+def choose_wallet():
+    """
+    Arrow-key menu. The pynput listener thread only queues keystrokes; this
+    thread blocks on the queue and redraws when the selection actually moves.
+    Returns the chosen option key (Esc = exit).
+    """
+    keys = queue.Queue()
+
+    def on_press(key):
+        keys.put(key)
+        if key in (keyboard.Key.enter, keyboard.Key.esc):
+            return False
+
+    selected_index = 0
+    listener = keyboard.Listener(on_press=on_press)
+    listener.start()
+    try:
+        with Live(render_wallet_menu(selected_index), auto_refresh=False, screen=True) as live:
+            while True:
+                key = keys.get()
+                if key == keyboard.Key.enter:
+                    return wallet_options[selected_index][0]
+                if key == keyboard.Key.esc:
+                    return registry.EXIT_KEY
+                moved = min(max(selected_index + MOVES.get(key, 0), 0), len(wallet_options) - 1)
+                if moved != selected_index:
+                    selected_index = moved
+                    live.update(render_wallet_menu(selected_index), refresh=True)
+    finally:
+        listener.stop()
 
 
 def wallet_launcher():
-    global exit_flag, selected_index, enter_pressed
-
     while True:
-
-        exit_flag = False
-        enter_pressed = False
-
         print_banner()
         console.print("[bold white]Powered by [bold magenta]Hiderox Technologies[/bold magenta][/bold white]", justify="center")
         console.print("[bold blue underline]www.hiderox.com[/bold blue underline]\n", justify="center")
         console.print(Panel.fit("[bold cyan]🚀 Multi-Crypto Wallet Manager[/bold cyan]",
                                 subtitle="Secure • Flexible • Fast", style="bold blue", padding=(1, 4)))
 
-        listener = keyboard.Listener(on_press=on_press)
-        listener.start()
-
-        with Live(render_wallet_menu(), refresh_per_second=10, screen=True) as live:
-            while not exit_flag:
-                live.update(render_wallet_menu())
-
-        listener.stop()
+        selected_choice = choose_wallet()
 
-        selected_choice = wallet_options[selected_index][0]
-        script_map = {
-            "1": "usdt.py",
-            "2": "btc.py",
-            "3": "eth.py",
-            "4": "pol.py",
-            "5": "ltc.py",
-            "6": "doge.py",
-            "7": "xmr.py",
-            "8": "zec.py",
-            "9": "dash.py",
-            "10": "bnb.py"
-        }
-
-        if selected_choice == "0":
+        if selected_choice == registry.EXIT_KEY:
             console.print("\n[bold green]✓ Exiting wallet manager. Have a great day![/bold green]\n")
             sys.exit(0)
 
-        if selected_choice in script_map:
-            execute_script(script_map[selected_choice])
+        info = registry.WALLETS[selected_choice]
+        reason = registry.unsupported(info)
+        if reason:
+            console.print(f"[bold red]✖ {reason}[/bold red]")
+        else:
+            execute_script(info["script"])
 
         console.print("\n[dim]Press Enter to return to the main menu...[/dim]")
         input()
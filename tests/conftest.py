@@ -0,0 +1,19 @@
+import os
+import sys
+import threading
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [os.path.join(ROOT, "scripts"), os.path.join(ROOT, "bench")]
+
+
+@pytest.fixture
+def queue_db(tmp_path, monkeypatch):
+    """send_queue (and tracker, which shares its database) on a fresh file."""
+    import send_queue
+    import tracker
+    monkeypatch.setattr(send_queue, "DB_PATH", str(tmp_path / "send_queue.db"))
+    monkeypatch.setattr(send_queue, "_local", threading.local())
+    monkeypatch.setattr(tracker, "_schema_ready", threading.local())
+    yield send_queue.db()
@@ -0,0 +1,58 @@
+import json
+import threading
+
+import pytest
+
+from address_pool import AddressPool
+
+
+def _derive(indexes):
+    return [f"addr-{i}" for i in indexes]
+
+
+def _pool(tmp_path, derive=_derive, first_index=5):
+    return AddressPool("TEST", str(tmp_path), derive, first_index, size=4, low_water=2)
+
+
+def test_take_fills_an_empty_pool_and_refills_below_low_water(tmp_path):
+    pool = _pool(tmp_path)
+    assert [pool.take()["index"] for _ in range(3)] == [5, 6, 7]  # the third leaves 1 < low_water
+    pool.refill(wait=True)
+    assert pool.stats()["unused"] == 4 and pool.next_index == 12
+    assert [e[0] for e in pool.unused] == [8, 9, 10, 11]
+
+
+def test_handed_out_addresses_and_labels_survive_a_restart(tmp_path):
+    pool = _pool(tmp_path)
+    first = pool.take("order-1")
+    second = pool.take("order-2")
+
+    reopened = _pool(tmp_path)
+    assert reopened.used_count == 2 and reopened.next_index == pool.next_index
+    assert first["address"] not in [a for _, a in reopened.unused]
+    with open(reopened.used_path) as f:
+        log = [json.loads(line) for line in f]
+    assert [(e["address"], e["label"]) for e in log] == [(first["address"], "order-1"), (second["address"], "order-2")]
+    assert reopened.take()["index"] == second["index"] + 1
+
+
+def test_a_failing_derivation_is_raised_by_take_not_retried_forever(tmp_path):
+    broken = threading.Event()
+    broken.set()
+
+    def derive(indexes):
+        if broken.is_set():
+            raise OSError("wallet database locked")
+        return _derive(indexes)
+
+    pool = _pool(tmp_path, derive)
+    outcome = []
+    worker = threading.Thread(target=lambda: outcome.append(pytest.raises(OSError, pool.take)), daemon=True)
+    worker.start()
+    worker.join(5)
+    assert not worker.is_alive(), "take() hung on a failing refill"
+    assert "locked" in str(outcome[0].value) and pool.stats()["error"]
+
+    broken.clear()
+    assert pool.take()["index"] == 5  # the next refill works again
+    assert pool.error is None
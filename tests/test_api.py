@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+
+import api
+
+
+async def _exchange(request: bytes) -> bytes:
+    server = await asyncio.start_server(api._serve_connection, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(request)
+        await writer.drain()
+        reply = await asyncio.wait_for(reader.read(), 5)
+        writer.close()
+    return reply
+
+
+@pytest.mark.parametrize("length", [b"abc", b"-5"])
+def test_bad_content_length_gets_400(length):
+    reply = asyncio.run(_exchange(b"POST /sends HTTP/1.1\r\nContent-Length: " + length + b"\r\n\r\n"))
+    assert reply.startswith(b"HTTP/1.1 400") and b"Invalid Content-Length" in reply
+
+
+def test_oversized_body_gets_413():
+    reply = asyncio.run(_exchange(b"POST /sends HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % (api.MAX_BODY + 1)))
+    assert reply.startswith(b"HTTP/1.1 413")
+
+
+@pytest.mark.parametrize("value", ["NaN", "sNaN", "Infinity", "-Infinity"])
+def test_non_finite_amounts_are_client_errors(value):
+    with pytest.raises(api.HTTPError) as e:
+        api._decimal({"amount": value}, "amount")
+    assert e.value.status == 400
+
+
+@pytest.mark.parametrize("value, error", [("abc", "a number"), ("0", "positive"), ("-2", "positive")])
+def test_amount_validation(value, error):
+    with pytest.raises(api.HTTPError, match=error):
+        api._decimal({"amount": value}, "amount")
+    assert api._decimal({"amount": "1.5"}, "amount") == api.Decimal("1.5")
+    assert api._decimal({}, "fee", required=False) is None
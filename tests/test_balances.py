@@ -0,0 +1,84 @@
+import os
+
+import pytest
+
+import balances
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """balances on a fresh snapshot file with one fake wallet, 'fake.py'."""
+    monkeypatch.setattr(balances, "SNAPSHOT_PATH", str(tmp_path / "cache" / "balances.json"))
+    replies = ["1.00000000 BTC"]
+
+    def fetch():
+        reply = replies[0]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+    monkeypatch.setattr(balances, "FETCHERS", {"fake.py": fetch})
+    monkeypatch.setattr(balances, "_wake", type(balances._wake)())
+    return replies
+
+
+def test_is_stale():
+    now = 10_000.0
+    assert balances.is_stale(None) and balances.is_stale({})
+    assert not balances.is_stale({"checked": now - 10}, max_age=300, now=now)
+    assert balances.is_stale({"checked": now - 300}, max_age=300, now=now)
+
+
+def test_failed_lookups_are_retried_sooner_than_max_age():
+    now = 10_000.0
+    failed = {"checked": now - balances.RETRY_AFTER + 1, "error": "timeout"}
+    assert not balances.is_stale(failed, max_age=10, now=now)  # RETRY_AFTER applies, not max_age
+    failed["checked"] = now - balances.RETRY_AFTER
+    assert balances.is_stale(failed, max_age=3600, now=now)
+
+
+def test_refresh_records_the_balance(store):
+    balances.refresh("fake.py")
+    snapshot = balances.load()["fake.py"]
+    assert snapshot["balance"] == "1.00000000 BTC" and snapshot["error"] is None
+    assert snapshot["updated"] == snapshot["checked"]
+    assert not balances.is_stale(snapshot)
+    assert balances.describe("fake.py").startswith("[green]1.00000000 BTC[/green]")
+
+
+def test_refresh_failure_keeps_the_last_good_balance(store):
+    balances.refresh("fake.py")
+    updated = balances.load()["fake.py"]["updated"]
+    store[0] = ConnectionError("provider down")
+    balances.refresh("fake.py")
+    snapshot = balances.load()["fake.py"]
+    assert snapshot["balance"] == "1.00000000 BTC" and snapshot["updated"] == updated
+    assert snapshot["error"] == "provider down" and snapshot["checked"] >= updated
+    assert balances.describe("fake.py").startswith("[yellow]")
+    store[0] = "2.00000000 BTC"
+    balances.refresh("fake.py")
+    assert balances.load()["fake.py"]["error"] is None
+
+
+def test_refresh_failure_without_a_message_names_the_exception(store):
+    store[0] = TimeoutError()
+    balances.refresh("fake.py")
+    assert balances.load()["fake.py"]["error"] == "TimeoutError"
+    assert balances.describe("fake.py") == "[red]unavailable[/red]"
+
+
+def test_invalidate_marks_a_wallet_stale_and_wakes_the_refresher(store):
+    balances.refresh("fake.py")
+    balances.invalidate("fake.py")
+    snapshot = balances.load()["fake.py"]
+    assert balances.is_stale(snapshot) and snapshot["balance"] == "1.00000000 BTC"
+    assert balances._wake.is_set()
+
+
+def test_invalidate_ignores_wallets_without_a_lookup(store):
+    balances.invalidate("xmr.py")
+    assert balances.load() == {} and not balances._wake.is_set()
+
+
+def test_snapshots_live_next_to_the_scripts():
+    assert os.path.dirname(os.path.dirname(balances.SNAPSHOT_PATH)) == balances.SCRIPTS_DIR
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import coin_select
+from coin_select import FeeModel, Utxo, UtxoIndex
+
+FEES = FeeModel(rate=2.0)
+
+
+def _index(values):
+    return UtxoIndex(Utxo(v, f"{i:064x}", 0) for i, v in enumerate(values))
+
+
+def _covers(selection, amount, fees=FEES, n_outputs=1):
+    assert selection.total == amount + selection.fee + selection.change
+    assert selection.fee >= fees.base_fee(n_outputs) + len(selection.utxos) * fees.input_fee
+    assert selection.change == 0 or selection.change >= coin_select.DUST
+
+
+def test_index_keeps_values_sorted_with_prefix_sums():
+    index = _index([50, 10, 30])
+    assert index.values() == [10, 30, 50] and index.sum_range(0, 3) == 90
+    index.add(Utxo(20, "ff" * 32, 1))
+    assert index.values() == [10, 20, 30, 50] and index.sum_range(1, 3) == 50
+    index.remove(Utxo(20, "ff" * 32, 1))
+    assert index.values() == [10, 30, 50]
+    with pytest.raises(KeyError):
+        index.remove(Utxo(30, "ee" * 32, 0))
+
+
+def test_branch_and_bound_finds_an_exact_changeless_match():
+    index = _index([5_000, 70_000, 120_000, 40_000, 300_000])
+    amount = 110_000 - FEES.base_fee(1) - 2 * FEES.input_fee
+    selection = coin_select.branch_and_bound(index, amount, FEES)
+    assert selection.change == 0 and sorted(u.value for u in selection.utxos) == [40_000, 70_000]
+    _covers(selection, amount)
+
+
+def test_dust_is_never_picked():
+    index = _index([FEES.input_fee] * 50 + [100_000])
+    selection = coin_select.select(index, 50_000, FEES)
+    assert [u.value for u in selection.utxos] == [100_000]
+
+
+@pytest.mark.parametrize("strategy", list(coin_select.STRATEGIES))
+def test_every_strategy_covers_amount_and_fees(strategy):
+    rng = random.Random(7)
+    index = _index([rng.randint(1_000, 2_000_000) for _ in range(2_000)])
+    for amount in (1_500, 250_000, 5_000_000, 40_000_000):
+        selection = coin_select.STRATEGIES[strategy](index, amount, FEES)
+        if selection is None:  # only branch and bound may find nothing: it never adds change
+            assert strategy == "branch_and_bound"
+            continue
+        _covers(selection, amount)
+
+
+def test_insufficient_funds_raises():
+    with pytest.raises(ValueError, match="Insufficient funds"):
+        coin_select.select(_index([10_000, 20_000]), 1_000_000, FEES)
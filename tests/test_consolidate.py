@@ -0,0 +1,181 @@
+import pytest
+
+import coin_select
+import consolidate
+from coin_select import FeeModel, Utxo, UtxoIndex
+
+FEES = FeeModel(rate=1.0)  # input 68, one-output base 42 sats
+
+
+def _index(values):
+    return UtxoIndex(Utxo(v, f"{i:064x}", 0) for i, v in enumerate(values))
+
+
+def test_plan_batches_needs_min_inputs():
+    assert consolidate.plan_batches(_index([5_000] * (consolidate.MIN_INPUTS - 1)), FEES, 100_000) == []
+    batches = consolidate.plan_batches(_index([5_000] * consolidate.MIN_INPUTS), FEES, 100_000)
+    assert [len(b) for b in batches] == [consolidate.MIN_INPUTS]
+
+
+def test_plan_batches_stops_at_a_short_tail():
+    batches = consolidate.plan_batches(_index([5_000] * 25), FEES, 100_000, max_inputs=10)
+    assert [len(b) for b in batches] == [10, 10]
+
+
+def test_plan_batches_caps_batches_per_run():
+    batches = consolidate.plan_batches(_index([5_000] * 100), FEES, 100_000, max_inputs=10, max_batches=3)
+    assert [len(b) for b in batches] == [10, 10, 10]
+
+
+def test_plan_batches_only_takes_small_spendable_utxos():
+    values = [60] * 5 + [5_000] * 10 + [200_000] * 10  # 60 < input fee, 200k above SMALL
+    (batch,) = consolidate.plan_batches(_index(values), FEES, 100_000)
+    assert [u.value for u in batch] == [5_000] * 10
+
+
+def test_plan_batches_skips_batches_that_would_only_leave_dust():
+    # 10 x 100 sats minus 722 sats of fee would leave 278 < DUST
+    values = [100] * 10 + [1_000] * 10
+    (batch,) = consolidate.plan_batches(_index(values), FEES, 100_000, max_inputs=10)
+    assert [u.value for u in batch] == [1_000] * 10
+    assert sum(u.value for u in batch) - consolidate.batch_fee(FEES, 10) >= coin_select.DUST
+
+
+@pytest.fixture
+def snapshots(tmp_path, monkeypatch):
+    monkeypatch.setattr(consolidate, "SNAPSHOT_PATH", str(tmp_path / "cache" / "fee_snapshots.json"))
+    fetched = []
+
+    def fetch(coin):
+        fetched.append(coin)
+        return float(len(fetched))
+
+    monkeypatch.setattr(consolidate, "fetch_fee_rate", fetch)
+    return fetched
+
+
+def test_fee_rate_reuses_a_fresh_snapshot(snapshots):
+    assert consolidate.fee_rate("BTC") == 1.0
+    assert consolidate.fee_rate("BTC") == 1.0
+    assert snapshots == ["BTC"]
+    assert consolidate.fee_rate("LTC") == 2.0  # snapshots are per coin
+    assert snapshots == ["BTC", "LTC"]
+
+
+def test_fee_rate_refetches_a_stale_snapshot_and_keeps_history(snapshots):
+    consolidate.fee_rate("BTC")
+    assert consolidate.fee_rate("BTC", max_age=0) == 2.0
+    assert [s["rate"] for s in consolidate.load_snapshots()["BTC"]] == [1.0, 2.0]
+
+
+def test_fee_rate_history_is_bounded(snapshots, monkeypatch):
+    monkeypatch.setattr(consolidate, "SNAPSHOT_HISTORY", 3)
+    for _ in range(5):
+        consolidate.fee_rate("BTC", max_age=0)
+    assert [s["rate"] for s in consolidate.load_snapshots()["BTC"]] == [3.0, 4.0, 5.0]
+
+
+class _Module:
+    @staticmethod
+    def wallet_exists():
+        return True
+
+
+@pytest.fixture
+def btc_only(monkeypatch):
+    """One BTC wallet whose UTXO set changes every time it is looked up."""
+    lookups, sent = [], []
+
+    def load_index(coin, wallet):
+        lookups.append(coin)
+        return _index([5_000 + len(lookups)] * consolidate.MIN_INPUTS)
+
+    monkeypatch.setattr(consolidate, "COINS", {"BTC": ("btc", "bitcoin")})
+    monkeypatch.setattr(consolidate, "coin_module", lambda coin: _Module)
+    monkeypatch.setattr(consolidate, "fee_rate", lambda coin: 1.0)
+    monkeypatch.setattr(consolidate, "open_wallet", lambda coin: object())
+    monkeypatch.setattr(consolidate, "wallet_fee_model", lambda coin, wallet, rate: FEES)
+    monkeypatch.setattr(consolidate, "load_index", load_index)
+    monkeypatch.setattr(consolidate, "send_batch",
+                        lambda coin, wallet, batch, fees: sent.append(batch) or f"tx{len(sent)}")
+    monkeypatch.setattr(consolidate, "render", lambda results, title: None)
+    return lookups, sent
+
+
+def test_cli_broadcasts_the_plan_it_showed(btc_only, monkeypatch):
+    lookups, sent = btc_only
+    monkeypatch.setattr(consolidate.Confirm, "ask", staticmethod(lambda *a, **k: True))
+    consolidate.consolidate_cli()
+    assert lookups == ["BTC"]  # not planned a second time after confirming
+    assert [[u.value for u in b] for b in sent] == [[5_001] * consolidate.MIN_INPUTS]
+
+
+def test_cli_sends_nothing_when_not_confirmed(btc_only, monkeypatch):
+    monkeypatch.setattr(consolidate.Confirm, "ask", staticmethod(lambda *a, **k: False))
+    consolidate.consolidate_cli()
+    assert btc_only[1] == []
+
+
+def test_execute_keeps_txids_sent_before_a_failure(monkeypatch):
+    calls = []
+
+    def send_batch(coin, wallet, batch, fees):
+        calls.append(batch)
+        if len(calls) == 2:
+            raise RuntimeError("mempool full")
+        return f"tx{len(calls)}"
+
+    monkeypatch.setattr(consolidate, "send_batch", send_batch)
+    batches = [_batch(), _batch(), _batch()]
+    result = consolidate.execute({"coin": "BTC", "batches": [], "txids": [], "plan": (object(), FEES, batches)})
+    assert result["txids"] == ["tx1"] and "mempool full" in result["error"]
+    assert len(calls) == 2
+
+
+def test_execute_leaves_skipped_plans_alone(monkeypatch):
+    monkeypatch.setattr(consolidate, "send_batch", lambda *a: pytest.fail("sent a skipped plan"))
+    result = {"coin": "BTC", "batches": [], "txids": [], "skipped": "fees above threshold"}
+    assert consolidate.execute(result) is result and result["txids"] == []
+
+
+class _Tx:
+    def __init__(self, txid, error=None):
+        self.txid, self.error = txid, error
+
+
+class _Key:
+    address = "bc1qchange"
+
+
+class _Wallet:
+    def __init__(self, tx):
+        self.tx, self.sent = tx, []
+
+    def get_key(self, change=0):
+        return _Key()
+
+    def send(self, outputs, **kwargs):
+        self.sent.append((outputs, kwargs))
+        return self.tx
+
+
+def _batch(n=consolidate.MIN_INPUTS, value=5_000):
+    return [Utxo(value, f"{i:064x}", 0, ref={"key_id": i}) for i in range(n)]
+
+
+def test_send_batch_tracks_the_transaction(monkeypatch):
+    tracked = []
+    monkeypatch.setattr(consolidate.tracker, "track_sent", lambda coin, txid: tracked.append((coin, txid)) or True)
+    wallet = _Wallet(_Tx("ab" * 32))
+    assert consolidate.send_batch("BTC", wallet, _batch(), FEES) == "ab" * 32
+    assert tracked == [("BTC", "ab" * 32)]
+    (outputs, kwargs), = wallet.sent
+    assert outputs == [("bc1qchange", 50_000 - consolidate.batch_fee(FEES, 10))] and kwargs["broadcast"]
+
+
+def test_send_batch_does_not_track_a_rejected_transaction(monkeypatch):
+    tracked = []
+    monkeypatch.setattr(consolidate.tracker, "track_sent", lambda coin, txid: tracked.append((coin, txid)))
+    with pytest.raises(RuntimeError, match="dust"):
+        consolidate.send_batch("BTC", _Wallet(_Tx(None, "dust")), _batch(), FEES)
+    assert tracked == []
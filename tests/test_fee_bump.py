@@ -0,0 +1,174 @@
+import math
+from types import SimpleNamespace
+
+import pytest
+
+import fee_bump
+import offline
+import tracker
+
+SENDER = "0x9858EfFD232B4033E47d90003D41EC34EcaEda94"
+GWEI = 10 ** 9
+
+
+def _evm_tx(**fees):
+    return {"from": SENDER, "to": SENDER.lower(), "value": hex(10 ** 18), "gas": hex(21000),
+            "input": "0x", "nonce": hex(7), **{k: hex(v) for k, v in fees.items()}}
+
+
+def test_legacy_gas_price_rises_by_the_bump_factor():
+    new = fee_bump._bumped(_evm_tx(gasPrice=20 * GWEI), gas_price=10 * GWEI, chain_id=56)
+    assert new["gasPrice"] == 25 * GWEI
+    assert (new["nonce"], new["chainId"], new["value"], new["gas"]) == (7, 56, 10 ** 18, 21000)
+    assert new["to"] == SENDER and "maxFeePerGas" not in new
+
+
+def test_legacy_gas_price_follows_a_higher_network_price():
+    new = fee_bump._bumped(_evm_tx(gasPrice=20 * GWEI), gas_price=40 * GWEI, chain_id=1)
+    assert new["gasPrice"] == 40 * GWEI
+
+
+def test_legacy_bump_clears_geths_ten_percent_rule_on_odd_prices():
+    old = 3 * GWEI + 1
+    new = fee_bump._bumped(_evm_tx(gasPrice=old), gas_price=0, chain_id=1)
+    assert new["gasPrice"] == math.ceil(old * fee_bump.BUMP_FACTOR) >= old * 1.1
+
+
+def test_eip1559_raises_tip_and_fee_cap_by_the_bump_factor():
+    new = fee_bump._bumped(_evm_tx(maxPriorityFeePerGas=2 * GWEI, maxFeePerGas=40 * GWEI),
+                           gas_price=10 * GWEI, chain_id=1)
+    assert new["maxPriorityFeePerGas"] == int(2.5 * GWEI)
+    assert new["maxFeePerGas"] == 50 * GWEI
+    assert "gasPrice" not in new
+
+
+def test_eip1559_fee_cap_covers_the_network_price_plus_the_new_tip():
+    new = fee_bump._bumped(_evm_tx(maxPriorityFeePerGas=2 * GWEI, maxFeePerGas=20 * GWEI),
+                           gas_price=30 * GWEI, chain_id=137)
+    assert new["maxPriorityFeePerGas"] == int(2.5 * GWEI)
+    assert new["maxFeePerGas"] == int(32.5 * GWEI)
+
+
+# ---------- BTC / LTC replace-by-fee against a stub wallet ----------
+def _output(address, value):
+    return SimpleNamespace(address=address, value=value)
+
+
+def _input(n, value):
+    return SimpleNamespace(prev_txid=bytes([n]) * 32, output_n_int=n, value=value, address=f"bc1qin{n}")
+
+
+class _Replacement:
+    def __init__(self, verified=True):
+        self.verified, self.signed = verified, False
+
+    def sign(self):
+        self.signed = True
+
+    def verify(self):
+        return self.verified
+
+    def raw_hex(self):
+        return "02000000replacement"
+
+
+class _Wallet:
+    """Just what _rbf touches of a bitcoinlib wallet."""
+
+    def __init__(self, old, verified=True):
+        self.old, self.created, self.replacement = old, [], _Replacement(verified)
+
+    def transaction(self, txid):
+        return self.old
+
+    def keys(self, change=0):
+        return [SimpleNamespace(address="bc1qchange")] if change else []
+
+    def transaction_create(self, outputs, **kwargs):
+        self.created.append((outputs, kwargs))
+        return self.replacement
+
+
+def _old(fee, vsize=200):
+    inputs = [_input(0, 60_000), _input(1, 50_000)]
+    outputs = [_output("bc1qpayee", 70_000), _output("bc1qchange", 40_000 - (fee or 0))]
+    return SimpleNamespace(inputs=inputs, outputs=outputs, fee=fee, vsize=vsize, locktime=812_345)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    broadcasts, replaced = [], []
+    monkeypatch.setattr(offline, "broadcast_utxo", lambda coin, raw: broadcasts.append((coin, raw)) or "ab" * 32)
+    monkeypatch.setattr(tracker, "replace", lambda old, new, raw: replaced.append((old, new, raw)))
+    return broadcasts, replaced
+
+
+def _fee(wallet):
+    (_, kwargs), = wallet.created
+    return kwargs["fee"]
+
+
+def test_rbf_keeps_inputs_payouts_and_locktime(sent):
+    wallet = _Wallet(_old(fee=1000))
+    result = fee_bump._rbf("BTC", {"coin": "BTC", "txid": "cd" * 32}, wallet, fee_rate=1)
+    assert result == {"coin": "BTC", "txid": "cd" * 32, "new_txid": "ab" * 32, "error": None}
+    (outputs, kwargs), = wallet.created
+    assert outputs == [("bc1qpayee", 70_000)]  # the change output is rebuilt from the remainder
+    assert [(i[0], i[1], i[3]) for i in kwargs["input_arr"]] == [("00" * 32, 0, 60_000), ("01" * 32, 1, 50_000)]
+    assert kwargs["locktime"] == 812_345 and kwargs["replace_by_fee"]
+    assert wallet.replacement.signed
+    assert sent == ([("BTC", "02000000replacement")], [("cd" * 32, "ab" * 32, "02000000replacement")])
+
+
+def test_rbf_fee_rises_by_the_bump_factor(sent):
+    wallet = _Wallet(_old(fee=2000))
+    fee_bump._rbf("BTC", {"coin": "BTC", "txid": "cd" * 32}, wallet, fee_rate=1)
+    assert _fee(wallet) == 2500
+
+
+def test_rbf_fee_pays_bip125_minimum_relay_for_its_own_size(sent):
+    # +25% of 400 is 500, but BIP 125 wants the old fee plus 1 sat/vB of the replacement
+    wallet = _Wallet(_old(fee=400, vsize=200))
+    fee_bump._rbf("BTC", {"coin": "BTC", "txid": "cd" * 32}, wallet, fee_rate=1)
+    assert _fee(wallet) == 600
+
+
+def test_rbf_fee_follows_a_higher_network_rate(sent):
+    wallet = _Wallet(_old(fee=1000, vsize=200))
+    fee_bump._rbf("LTC", {"coin": "LTC", "txid": "cd" * 32}, wallet, fee_rate=15)
+    assert _fee(wallet) == 3000
+
+
+def test_rbf_works_out_an_unknown_fee_from_the_amounts(sent):
+    old = _old(fee=None)
+    old.outputs[1].value = 39_000  # 110k in, 109k out
+    wallet = _Wallet(old)
+    fee_bump._rbf("BTC", {"coin": "BTC", "txid": "cd" * 32}, wallet, fee_rate=1)
+    assert _fee(wallet) == 1250
+
+
+def test_rbf_never_broadcasts_a_replacement_that_fails_verification(sent):
+    wallet = _Wallet(_old(fee=1000), verified=False)
+    with pytest.raises(ValueError, match="Signature check failed"):
+        fee_bump._rbf("BTC", {"coin": "BTC", "txid": "cd" * 32}, wallet, fee_rate=1)
+    assert sent == ([], [])
+
+
+def test_bump_utxo_reports_each_failure_and_carries_on(sent, monkeypatch):
+    wallet = _Wallet(_old(fee=1000))
+    wallet.anti_fee_sniping = True
+    monkeypatch.setattr(offline, "open_utxo_wallet", lambda coin: wallet)
+    monkeypatch.setattr(fee_bump.send_queue, "default_fee", lambda coin: 1)
+    calls = []
+
+    def rbf(coin, row, w, fee_rate):
+        calls.append(row["txid"])
+        if row["txid"] == "bad":
+            raise RuntimeError("missing inputs")
+        return fee_bump._result(row, "new")
+
+    monkeypatch.setattr(fee_bump, "_rbf", rbf)
+    results = fee_bump.bump_utxo("BTC", [{"coin": "BTC", "txid": "bad"}, {"coin": "BTC", "txid": "good"}])
+    assert [(r["txid"], r["new_txid"], r["error"]) for r in results] == [
+        ("bad", None, "missing inputs"), ("good", "new", None)]
+    assert wallet.anti_fee_sniping is False
@@ -0,0 +1,57 @@
+import json
+import os
+
+import pytest
+from eth_account import Account
+
+import hd_evm
+
+MNEMONIC = " ".join(["abandon"] * 11 + ["about"])
+FIRST_ADDRESS = "0x9858EfFD232B4033E47d90003D41EC34EcaEda94"  # m/44'/60'/0'/0/0 of MNEMONIC
+
+
+@pytest.fixture
+def seed_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(hd_evm, "SEED_DIR", str(tmp_path / "wallet_EVM"))
+    monkeypatch.setattr(hd_evm, "SEED_PATH", str(tmp_path / "wallet_EVM" / "hd_seed.json"))
+    return tmp_path
+
+
+def test_bip44_vector(seed_dir):
+    assert hd_evm.create_seed(MNEMONIC) == MNEMONIC
+    first = hd_evm.derive(0)
+    assert first.address == FIRST_ADDRESS
+    assert Account.from_key(first.private_key).address == FIRST_ADDRESS
+
+
+def test_xpub_derives_the_same_addresses_without_keys(seed_dir):
+    hd_evm.create_seed(MNEMONIC)
+    seed = hd_evm.load_seed()
+    assert seed["path"] == hd_evm.ACCOUNT_PATH
+    watched = [hd_evm.derive(i, extended_key=seed["xpub"]) for i in range(5)]
+    assert [d.address for d in watched] == hd_evm.addresses(0, 5)
+    assert watched[0].address == FIRST_ADDRESS and all(d.private_key is None for d in watched)
+
+
+def test_wallet_files_store_only_the_index(seed_dir):
+    hd_evm.create_seed(MNEMONIC)
+    info = hd_evm.wallet_info(3)
+    assert info == {"address": hd_evm.derive(3).address, "hd_index": 3, "derivation": "m/44'/60'/0'/0/3"}
+    assert hd_evm.unlock(info)["private_key"] == hd_evm.derive(3).private_key
+    legacy = {"address": "0xabc", "private_key": "0x01"}
+    assert hd_evm.unlock(legacy) is legacy
+
+
+def test_seed_is_never_overwritten_and_must_be_valid(seed_dir):
+    with pytest.raises(ValueError, match="Invalid BIP39"):
+        hd_evm.create_seed("abandon " * 12)
+    hd_evm.create_seed(MNEMONIC)
+    with pytest.raises(FileExistsError):
+        hd_evm.create_seed()
+    assert hd_evm.ensure_seed() is None
+    with open(hd_evm.SEED_PATH) as f:
+        assert json.load(f)["mnemonic"] == MNEMONIC
+
+
+def test_seed_dir_is_next_to_the_scripts():
+    assert hd_evm.SEED_DIR == os.path.join(os.path.dirname(os.path.abspath(hd_evm.__file__)), "wallet_EVM")
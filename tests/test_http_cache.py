@@ -0,0 +1,79 @@
+import json
+
+import pytest
+import requests
+
+import http_cache
+import net
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path))
+    calls = []
+
+    def request(method, url, headers=None, **kwargs):
+        calls.append((url, dict(headers or {})))
+        res = requests.Response()
+        res.status_code, res.url = (304, url) if headers and "If-None-Match" in headers else (200, url)
+        res.headers["ETag"] = '"v1"'
+        res._content = json.dumps(replies.get(url, {})).encode()
+        return res
+
+    replies = {}
+    monkeypatch.setattr(net, "request", request)
+    return replies, calls
+
+
+def _age(url, seconds):
+    entry = http_cache._load(url)
+    entry["fetched_at"] -= seconds
+    http_cache._store(url, entry)
+
+
+def test_ttl_rules_first_match_wins():
+    assert http_cache._rule("https://x/prices/BTC-USDT/spot") == (10, "price")
+    assert http_cache._rule("https://x/addrs/abc/balance") == (30, "balance")
+    assert http_cache._rule("https://x/api/v2/address/abc?details=basic") == (30, "balance")
+    assert http_cache._rule("https://x/api/v2/utxo/abc") == (30, "utxo")
+    assert http_cache._rule("https://x/tx/abc") == (15, "tx")
+    assert http_cache._rule("https://x/other") == (http_cache.DEFAULT_TTL, "other")
+
+
+@pytest.mark.parametrize("body, confirmed", [
+    ({"status": {"confirmed": True, "block_height": 5}}, True),
+    ({"status": {"confirmed": False}}, False),
+    ({"confirmations": 3}, True),
+    ({"confirmations": 0, "block_height": -1}, False),
+    ({"blockheight": 840_000}, True),
+    ([1, 2], False),
+])
+def test_confirmed_detection(body, confirmed):
+    assert http_cache._confirmed(json.dumps(body)) is confirmed
+    assert http_cache._confirmed("not json") is False
+
+
+def test_fresh_hit_then_revalidation(cache):
+    replies, calls = cache
+    url = "https://x/addrs/abc/balance"
+    replies[url] = {"balance": 1}
+    assert http_cache.get_json(url) == {"balance": 1}
+    assert http_cache.get_json(url) == {"balance": 1}
+    assert len(calls) == 1
+    _age(url, 31)
+    assert http_cache.get_json(url) == {"balance": 1}
+    assert calls[-1][1]["If-None-Match"] == '"v1"'
+
+
+def test_unconfirmed_transaction_expires_quickly(cache):
+    replies, calls = cache
+    pending, mined = "https://x/tx/pending", "https://x/tx/mined"
+    replies[pending] = {"status": {"confirmed": False}}
+    replies[mined] = {"status": {"confirmed": True, "block_height": 840_000}}
+    http_cache.get_json(pending)
+    http_cache.get_json(mined)
+    _age(pending, 20)
+    _age(mined, 20)
+    http_cache.get_json(pending)
+    http_cache.get_json(mined)
+    assert [url for url, _ in calls] == [pending, mined, pending]
@@ -0,0 +1,14 @@
+import metrics
+
+
+def _sends():
+    return [line for line in metrics.sends.render() if not line.startswith("#")]
+
+
+def test_sends_are_labelled_by_ticker_whoever_counts_them():
+    for name, ticker in [("bitcoin", "btc"), ("Litecoin", "ltc"), ("bsc", "bnb"), ("polygon", "pol"),
+                         ("tron", "trx"), ("eth", "eth"), ("SOL", "sol")]:
+        metrics.count_send(name, True)
+        assert any(f'chain="{ticker}",result="ok"' in line for line in _sends()), name
+    labels = {line.split('chain="')[1].split('"')[0] for line in _sends()}
+    assert not labels & set(metrics.TICKERS)
@@ -0,0 +1,128 @@
+import socket
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+import rlp
+from eth_account import Account
+from eth_utils import keccak
+
+import offline
+
+
+@pytest.fixture
+def batch_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(offline, "BATCH_DIR", str(tmp_path / "batches"))
+    return tmp_path
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    """Any attempt to resolve or connect fails the test, like an air-gapped box."""
+    attempts = []
+
+    def refuse(*args, **kwargs):
+        attempts.append(args)
+        raise OSError("network access while signing offline")
+
+    monkeypatch.setattr(socket.socket, "connect", refuse)
+    monkeypatch.setattr(socket.socket, "connect_ex", refuse)
+    monkeypatch.setattr(socket, "create_connection", refuse)
+    monkeypatch.setattr(socket, "getaddrinfo", refuse)
+    return attempts
+
+
+def _carry(batch, stage):
+    """Write the batch file and read it back on the other machine."""
+    return offline.read_batch(offline.write_batch(batch, stage), stage)
+
+
+# ---------- UTXO chains (bitcoinlib) ----------
+class _Service:
+    def __init__(self, network=None, **kwargs):
+        pass
+
+    def blockcount(self):
+        return 850_000
+
+
+@pytest.fixture(params=[("BTC", "bitcoin", "segwit"), ("DOGE", "dogecoin", "legacy")], ids=["btc", "doge"])
+def utxo_wallet(request, batch_dir, monkeypatch):
+    from bitcoinlib.wallets import Wallet
+    coin, network, witness_type = request.param
+    db = batch_dir / "wallet.db"
+    wallet = Wallet.create("offline-test", db_uri=f"sqlite:///{db}", network=network, witness_type=witness_type)
+    funding = wallet.get_key().address
+    wallet.utxo_add(funding, 150_000, "11" * 32, 0, confirmations=6)
+    wallet.utxo_add(funding, 90_000, "22" * 32, 1, confirmations=6)
+    module = SimpleNamespace(WALLET_NAME="offline-test", DB_PATH=str(db), wallet_exists=lambda: True)
+    monkeypatch.setattr(offline, "coin_module", lambda coin: module)
+    monkeypatch.setattr(Wallet, "utxos_update", lambda self, *a, **k: 0)  # the UTXOs above are all there is
+    monkeypatch.setattr("bitcoinlib.services.services.Service", _Service)
+    return coin, network
+
+
+def test_utxo_batch_round_trip_signs_without_network(utxo_wallet, no_network):
+    from bitcoinlib.keys import HDKey
+    from bitcoinlib.transactions import Transaction
+    coin, network = utxo_wallet
+    payee = HDKey(network=network).address()
+    unsigned = _carry(offline.build_utxo_batch(coin, [(payee, Decimal("0.001"))], fee_rate=2), "unsigned")
+    (item,) = unsigned["items"]
+    assert item["locktime"] == 850_000 and item["outputs"] == [[payee, 100_000]]
+
+    signed = _carry(offline.sign_utxo_batch(unsigned), "signed")
+    assert no_network == []
+    (item,) = signed["items"]
+    tx = Transaction.parse_hex(item["raw"], network=network)
+    assert tx.txid == item["txid"] and tx.locktime == 850_000
+    assert {(i.prev_txid.hex(), i.output_n_int) for i in tx.inputs} == {(txid, n) for txid, n, _, _ in item["inputs"]}
+    outputs = {o.address: o.value for o in tx.outputs}
+    assert outputs.pop(payee) == 100_000
+    assert sum(outputs.values()) == sum(i[2] for i in item["inputs"]) - 100_000 - item["fee"]  # the change
+    assert all(i.sequence == 0xfffffffd for i in tx.inputs)  # replaceable, so fee_bump can bump it
+    values = {(txid, n): value for txid, n, value, _ in item["inputs"]}
+    for i in tx.inputs:  # segwit signatures commit to the amounts, which the raw form leaves out
+        i.value = values[(i.prev_txid.hex(), i.output_n_int)]
+    assert tx.verify()  # every input carries a valid signature
+
+
+# ---------- EVM ----------
+@pytest.fixture
+def evm_wallet(batch_dir, monkeypatch):
+    account = Account.create()
+    eth = SimpleNamespace(get_transaction_count=lambda address, block: 7)
+    module = SimpleNamespace(load_wallet=lambda: {"address": account.address, "private_key": account.key.hex()},
+                             web3=SimpleNamespace(eth=eth))
+    monkeypatch.setattr(offline, "coin_module", lambda coin: module)
+    return account
+
+
+def test_evm_batch_round_trip_signs_without_network(evm_wallet, no_network):
+    payouts = [(Account.create().address.lower(), Decimal("0.5")), (Account.create().address, Decimal("1.25"))]
+    unsigned = _carry(offline.build_evm_batch("BNB", payouts, Decimal("3")), "unsigned")
+    assert [i["tx"]["nonce"] for i in unsigned["items"]] == [7, 8]
+
+    signed = _carry(offline.sign_evm_batch(unsigned), "signed")
+    assert no_network == []
+    for item, (to, amount) in zip(signed["items"], payouts):
+        raw = bytes.fromhex(item["raw"].removeprefix("0x"))
+        assert Account.recover_transaction(raw) == evm_wallet.address
+        assert "0x" + keccak(raw).hex().removeprefix("0x") == item["txid"]
+        nonce, gas_price, gas, recipient, value, *_ = rlp.decode(raw)
+        assert int.from_bytes(nonce, "big") == item["tx"]["nonce"]
+        assert int.from_bytes(gas_price, "big") == 3 * 10 ** 9
+        assert "0x" + recipient.hex() == to.lower() and int.from_bytes(value, "big") == int(amount * 10 ** 18)
+
+
+def test_signing_refuses_a_batch_for_another_sender(evm_wallet, no_network):
+    batch = offline.build_evm_batch("ETH", [(Account.create().address, Decimal("1"))], Decimal("1"))
+    batch["sender"] = Account.create().address
+    with pytest.raises(ValueError, match="different sender"):
+        offline.sign_evm_batch(batch)
+
+
+def test_read_batch_checks_the_stage(batch_dir):
+    path = offline.write_batch(offline.new_batch("BTC"), "unsigned")
+    with pytest.raises(ValueError, match="Expected a 'signed' batch"):
+        offline.read_batch(path, "signed")
@@ -0,0 +1,52 @@
+import pytest
+
+import rate_limit
+from rate_limit import TokenBucket
+
+
+def _clock(monkeypatch, start=1000.0):
+    now = [start]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_burst_is_free_then_callers_queue_at_the_rate(monkeypatch):
+    _clock(monkeypatch)
+    bucket = TokenBucket(rate=4, burst=2)
+    assert [bucket._reserve(1) for _ in range(5)] == pytest.approx([0, 0, 0.25, 0.5, 0.75])
+    assert bucket.queued == pytest.approx(3)
+
+
+def test_tokens_refill_up_to_the_burst(monkeypatch):
+    now = _clock(monkeypatch)
+    bucket = TokenBucket(rate=10, burst=3)
+    for _ in range(3):
+        bucket._reserve(1)
+    now[0] += 60  # a long idle spell must not bank more than `burst` tokens
+    assert [bucket._reserve(1) for _ in range(4)] == pytest.approx([0, 0, 0, 0.1])
+
+
+def test_pause_holds_every_caller_until_retry_after(monkeypatch):
+    now = _clock(monkeypatch)
+    bucket = TokenBucket(rate=10, burst=10)
+    bucket.pause(2.0)
+    assert bucket._reserve(1) == pytest.approx(2.0)
+    now[0] += 5
+    assert bucket._reserve(1) == 0
+
+
+def test_acquire_sleeps_for_its_reservation(monkeypatch):
+    slept = []
+    monkeypatch.setattr(rate_limit.time, "sleep", slept.append)
+    bucket = TokenBucket(rate=1000, burst=1)
+    bucket.acquire()
+    bucket.acquire()
+    assert len(slept) == 1 and 0 < slept[0] <= 0.001
+
+
+def test_one_bucket_per_host_with_its_quota():
+    rate_limit.set_quota("quota.test", 2, 5)
+    bucket = rate_limit.bucket_for("https://QUOTA.test/rpc?x=1")
+    assert bucket is rate_limit.bucket_for("https://quota.test/other")
+    assert (bucket.rate, bucket.burst) == (2, 5)
+    assert rate_limit.bucket_for("https://unlisted.test").rate == rate_limit.DEFAULT_QUOTA[0]
@@ -0,0 +1,78 @@
+import json
+import threading
+import time
+
+import pytest
+
+import rpc_router
+from rpc_router import RPCRouter, RouterError
+
+A, B, C = "https://a.test", "https://b.test", "https://c.test"
+
+
+def test_fails_over_and_cools_down_a_failing_provider():
+    router = RPCRouter("test", [A, B], cooldown=60)
+    calls = []
+
+    def op(url):
+        calls.append(url)
+        if url == A:
+            raise ConnectionError("down")
+        return url
+
+    for _ in range(rpc_router.FAILS_BEFORE_COOLDOWN):
+        assert router.execute(op) == B
+    assert not router.providers[0].healthy
+    calls.clear()
+    assert router.execute(op) == B and calls == [B]  # A is skipped while cooling down
+    assert router.metrics()["providers"][0]["last_error"] == "down"
+
+
+def test_all_providers_failing_raises_router_error():
+    router = RPCRouter("test", [A, B])
+
+    def op(url):
+        raise ValueError(url)
+
+    with pytest.raises(RouterError, match="All test providers failed"):
+        router.execute(op)
+
+
+def test_ranks_by_latency_weighted_by_errors():
+    router = RPCRouter("test", [A, B, C])
+    router._record(router.providers[0], 0.2, None)
+    router._record(router.providers[1], 0.1, None)
+    router._record(router.providers[2], 0.05, None)
+    router._record(router.providers[2], 0.05, ValueError("x"))  # 50% errors: 0.05 * 3 = 0.15
+    assert [p.url for p in router.ranked()] == [B, C, A]
+
+
+def test_slow_provider_is_hedged_to_the_next_one():
+    router = RPCRouter("test", [A, B], hedge_after=0.05)
+    release = threading.Event()
+
+    def op(url):
+        if url == A:
+            release.wait(2)
+            return A
+        return B
+
+    try:
+        start = time.perf_counter()
+        assert router.execute(op) == B
+        assert time.perf_counter() - start < 1
+        assert router.providers[0].hedges == 1
+    finally:
+        release.set()
+
+
+def test_provider_list_sources(monkeypatch, tmp_path):
+    monkeypatch.delenv("HIDERAX_RPC_ETH", raising=False)
+    monkeypatch.delenv("HIDERAX_RPC_CONFIG", raising=False)
+    assert rpc_router.configured_providers("eth", A) == [A] + rpc_router.PUBLIC_PROVIDERS["eth"]
+    config = tmp_path / "rpc.json"
+    config.write_text(json.dumps({"eth": [C]}))
+    monkeypatch.setenv("HIDERAX_RPC_CONFIG", str(config))
+    assert rpc_router.configured_providers("eth", A) == [C]
+    monkeypatch.setenv("HIDERAX_RPC_ETH", f"{A}, {B}")
+    assert rpc_router.configured_providers("eth", C) == [A, B]
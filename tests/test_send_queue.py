@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import offline
+import send_queue
+
+RECIPIENT = "0x" + "11" * 20
+
+
+def _signed_job(txid="0x" + "ab" * 32, nonce=7):
+    job = send_queue.enqueue("ETH", RECIPIENT, "0.5", fee="20")
+    send_queue._update([job["id"]], status=send_queue.SIGNED, txid=txid, raw="0xf86c", nonce=nonce)
+    return job["id"]
+
+
+def _reject(message):
+    def broadcast(coin, raw):
+        raise ValueError(message)
+    return broadcast
+
+
+def test_idempotency_key_returns_the_same_job(queue_db):
+    first = send_queue.enqueue("ETH", RECIPIENT, "0.5", key="payout-1")
+    assert send_queue.enqueue("ETH", RECIPIENT, "0.5", key="payout-1")["id"] == first["id"]
+    with pytest.raises(ValueError, match="different payout"):
+        send_queue.enqueue("ETH", RECIPIENT, "0.6", key="payout-1")
+
+
+def test_already_known_counts_as_broadcast(queue_db, monkeypatch):
+    job_id = _signed_job()
+    monkeypatch.setattr(offline, "broadcast_evm", _reject("already known"))
+    send_queue._broadcast("ETH")
+    assert send_queue.get(job_id)["status"] == send_queue.BROADCAST
+
+
+def test_nonce_too_low_needs_our_transaction_on_the_node(queue_db, monkeypatch):
+    job_id = _signed_job()
+    monkeypatch.setattr(offline, "broadcast_evm", _reject("nonce too low"))
+    monkeypatch.setattr(send_queue, "_known_to_node", lambda coin, txid: False)
+    send_queue._broadcast("ETH")
+    job = send_queue.get(job_id)
+    assert job["status"] == send_queue.SIGNED and "used by another transaction" in job["error"]
+
+    send_queue._update([job_id], next_attempt=0)
+    monkeypatch.setattr(send_queue, "_known_to_node", lambda coin, txid: True)
+    send_queue._broadcast("ETH")
+    assert send_queue.get(job_id)["status"] == send_queue.BROADCAST
+
+
+def test_broadcast_gives_up_after_max_attempts(queue_db, monkeypatch):
+    job_id = _signed_job()
+    monkeypatch.setattr(offline, "broadcast_evm", _reject("insufficient funds"))
+    for _ in range(send_queue.MAX_ATTEMPTS):
+        send_queue._update([job_id], next_attempt=0)
+        send_queue._broadcast("ETH")
+    assert send_queue.get(job_id)["status"] == send_queue.FAILED
+
+
+@pytest.mark.parametrize("module", ["offline", "send_queue", "tracker"])
+def test_modules_import_in_any_order_and_keep_the_db_next_to_the_scripts(module, tmp_path):
+    scripts = os.path.dirname(os.path.abspath(send_queue.__file__))
+    env = {k: v for k, v in os.environ.items() if k != "HIDERAX_SEND_DB"}
+    env["PYTHONPATH"] = scripts
+    out = subprocess.run([sys.executable, "-c", f"import {module}, send_queue; print(send_queue.DB_PATH)"],
+                         cwd=tmp_path, env=env, capture_output=True, text=True, check=True).stdout
+    assert out.strip() == os.path.join(scripts, "sends", "send_queue.db")
@@ -0,0 +1,101 @@
+import asyncio
+import time
+
+import pytest
+import requests
+
+import net
+import rate_limit
+import rpc_router
+import sol_rpc
+from sol_rpc import SolanaRPC, SolanaRPCError
+
+
+def _rpc(post_json):
+    rpc = SolanaRPC("https://sol.test/rpc")
+    rpc.router = type("Router", (), {"post_json": staticmethod(post_json)})()
+    return rpc
+
+
+def _echo(payload, path=""):
+    return [{"jsonrpc": "2.0", "id": r["id"], "result": r["method"]} for r in payload]
+
+
+def test_batch_keeps_call_order_across_chunks():
+    rpc = _rpc(_echo)
+    rpc.max_batch = 2
+    calls = [(f"m{i}", None) for i in range(5)]
+    assert asyncio.run(rpc.batch(calls)) == [f"m{i}" for i in range(5)]
+
+
+@pytest.mark.parametrize("reply", [{"jsonrpc": "2.0", "id": 1, "result": 5}, "oops", [1, 2]])
+def test_batch_rejects_a_reply_that_is_not_an_array_of_objects(reply):
+    rpc = _rpc(lambda payload, path="": reply)
+    with pytest.raises(SolanaRPCError):
+        asyncio.run(rpc.batch([("getSlot", None)]))
+
+
+def test_batch_raises_the_error_of_a_rejected_batch():
+    rpc = _rpc(lambda payload, path="": {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "bad"}})
+    with pytest.raises(SolanaRPCError, match="bad") as e:
+        asyncio.run(rpc.batch([("getSlot", None)]))
+    assert e.value.code == -32600
+
+
+def _throttled(response, fail_times):
+    attempts = []
+
+    def post_json(payload, path=""):
+        attempts.append(payload)
+        if len(attempts) <= fail_times:
+            raise rpc_router.RouterError("throttled") from requests.HTTPError(response=response)
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": 42}
+    return post_json, attempts
+
+
+def _response(status, retry_after=None):
+    response = requests.Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return response
+
+
+def test_429_is_retried_without_sleeping_a_second_time(monkeypatch):
+    post_json, attempts = _throttled(_response(429, "0.25"), fail_times=1)
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    assert asyncio.run(_rpc(post_json).call("getSlot")) == 42
+    assert slept == [] and len(attempts) == 2  # the wait is the bucket pause net already set
+
+
+def test_429_gives_up_after_max_retries():
+    post_json, attempts = _throttled(_response(429), fail_times=sol_rpc.MAX_RETRIES + 1)
+    with pytest.raises(SolanaRPCError) as e:
+        asyncio.run(_rpc(post_json).call("getSlot"))
+    assert e.value.code == 429 and len(attempts) == sol_rpc.MAX_RETRIES + 1
+
+
+def test_other_http_errors_are_not_retried():
+    post_json, attempts = _throttled(_response(503), fail_times=1)
+    with pytest.raises(SolanaRPCError) as e:
+        asyncio.run(_rpc(post_json).call("getSlot"))
+    assert e.value.code == 503 and len(attempts) == 1
+
+
+def test_429_pauses_the_hosts_bucket_for_retry_after():
+    url = "https://throttled.sol.test/rpc"
+    http = type("Session", (), {"request": staticmethod(lambda method, url, **kw: _response(429, "0.25"))})()
+    assert net.request("POST", url, retries=0, http=http).status_code == 429
+    paused = rate_limit.bucket_for(url)._paused_until - time.monotonic()
+    assert 0.2 < paused <= 0.25
+
+
+def test_retry_after_falls_back_to_exponential_back_off():
+    assert net.retry_after(_response(429, "3"), 0) == 3.0
+    assert net.retry_after(_response(429, "-1"), 0) == 0.0
+    assert net.retry_after(_response(429, "Wed, 21 Oct 2026 07:28:00 GMT"), 2) == 4.0
+    assert net.retry_after(requests.Response(), 3) == 8.0
@@ -0,0 +1,86 @@
+import asyncio
+import base64
+import time
+
+import base58
+from nacl import signing
+
+import sol_tx
+from sol_rpc import SolanaRPC
+
+BLOCKHASH = base58.b58encode(bytes(range(32))).decode()
+
+
+def _counting(cache):
+    calls = []
+
+    def post_json(payload, path=""):
+        calls.append(payload["method"])
+        return {"jsonrpc": "2.0", "id": payload["id"], "result": {"value": {"blockhash": BLOCKHASH}}}
+
+    cache.router = type("Router", (), {"post_json": staticmethod(post_json)})()
+    return calls
+
+
+def test_shortvec():
+    assert sol_tx.shortvec(0) == b"\x00"
+    assert sol_tx.shortvec(127) == b"\x7f"
+    assert sol_tx.shortvec(128) == b"\x80\x01"
+    assert sol_tx.shortvec(16384) == b"\x80\x80\x01"
+
+
+def test_signed_transfer_verifies():
+    key = signing.SigningKey.generate()
+    to = base58.b58encode(bytes([7]) * 32).decode()
+    signature, wire = sol_tx.sign_transfer(key, to, 5_000, BLOCKHASH)
+    raw = base64.b64decode(wire)
+    message = raw[1 + 64:]
+    key.verify_key.verify(message, raw[1:65])
+    assert base58.b58decode(signature) == raw[1:65]
+    assert message.count(bytes(range(32))) == 1  # the blockhash
+
+
+def test_cache_is_shared_by_url_across_instances_and_event_loops():
+    url = "https://sol.test/shared"
+    first, second = SolanaRPC(url), SolanaRPC(url)
+    cache = sol_tx.blockhash_cache(first)
+    assert sol_tx.blockhash_cache(second) is cache
+    calls = _counting(cache)
+    assert asyncio.run(cache.get()) == BLOCKHASH
+    assert asyncio.run(sol_tx.blockhash_cache(second).get()) == BLOCKHASH  # second loop, no new fetch
+    assert calls == ["getLatestBlockhash"]
+    assert sol_tx.blockhash_cache(SolanaRPC(url, commitment="finalized")) is not cache
+
+
+def test_concurrent_misses_fetch_once():
+    cache = sol_tx.BlockhashCache("https://sol.test/concurrent", "confirmed", refresh_every=60)
+    calls = _counting(cache)
+
+    async def many():
+        return await asyncio.gather(*(cache.get() for _ in range(20)))
+
+    assert set(asyncio.run(many())) == {BLOCKHASH}
+    assert len(calls) == 1
+
+
+def test_background_refresh_keeps_it_fresh_then_stops_when_idle():
+    cache = sol_tx.BlockhashCache("https://sol.test/refresh", "confirmed", max_age=0.3,
+                                  refresh_every=0.05, idle_after=0.3)
+    calls = _counting(cache)
+    asyncio.run(cache.get())
+    time.sleep(0.2)
+    assert len(calls) >= 3 and cache._fresh() == BLOCKHASH
+    time.sleep(0.5)
+    assert cache._thread is None
+    settled = len(calls)
+    time.sleep(0.2)
+    assert len(calls) == settled
+
+
+def test_invalidate_forces_a_fetch():
+    cache = sol_tx.BlockhashCache("https://sol.test/invalidate", "confirmed", refresh_every=60)
+    calls = _counting(cache)
+    asyncio.run(cache.get())
+    cache.invalidate()
+    asyncio.run(cache.get())
+    assert len(calls) == 2
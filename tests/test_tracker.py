@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+import fee_bump
+import send_queue
+import tracker
+
+OLD_SCHEMA = """
+CREATE TABLE tracked (
+    txid TEXT PRIMARY KEY, coin TEXT NOT NULL, status TEXT NOT NULL, block INTEGER,
+    confirmations INTEGER NOT NULL DEFAULT 0, checked_head INTEGER NOT NULL DEFAULT 0, error TEXT,
+    submitted REAL NOT NULL, updated REAL NOT NULL
+);
+"""
+TX1, TX2, TX3 = ("0x" + c * 64 for c in "123")
+
+
+@pytest.fixture
+def chain(queue_db, monkeypatch):
+    """A fake EVM backend: set `head` and `mined` ({txid: (block, error)}) to move the chain."""
+    state = {"head": 100, "mined": {}, "lookups": 0}
+
+    def lookup(backend, txids):
+        state["lookups"] += 1
+        return {t: state["mined"][t] for t in txids if t in state["mined"]}
+
+    monkeypatch.setitem(tracker.BACKENDS, "evm", (lambda backend: state["head"], lookup))
+    return state
+
+
+def _poll():
+    return tracker.poll_chain("evm", "eth", ["ETH", "USDT-ERC20"])
+
+
+def test_migrates_a_table_without_root(queue_db):
+    queue_db.executescript(OLD_SCHEMA)
+    queue_db.execute("INSERT INTO tracked (txid, coin, status, submitted, updated) VALUES (?, 'ETH', 'pending', 1, 1)",
+                     (TX1,))
+    row = tracker.get(TX1)
+    assert row["root"] == TX1
+    assert [v["txid"] for v in tracker.family(row)] == [TX1]
+    tracker.replace(TX1, TX2)
+    assert [v["txid"] for v in tracker.family(tracker.get(TX2))] == [TX1, TX2]
+
+
+def test_pending_until_enough_confirmations(chain):
+    tracker.track("ETH", TX1)
+    assert _poll() == 1
+    assert _poll() == 0  # nothing new at the same head: no lookup
+    assert chain["lookups"] == 1
+
+    chain["head"], chain["mined"][TX1] = 101, (100, None)
+    _poll()
+    assert (tracker.get(TX1)["status"], tracker.get(TX1)["confirmations"]) == (tracker.PENDING, 2)
+
+    chain["head"] = 100 + tracker.CHAINS["ETH"][2]
+    _poll()
+    assert tracker.get(TX1)["status"] == tracker.CONFIRMED
+
+
+def test_reverted_transaction_fails(chain):
+    tracker.track("ETH", TX1)
+    chain["mined"][TX1] = (100, "reverted")
+    _poll()
+    assert (tracker.get(TX1)["status"], tracker.get(TX1)["error"]) == (tracker.FAILED, "reverted")
+
+
+def test_mined_replacement_retires_the_other_versions(chain):
+    tracker.track("ETH", TX1)
+    tracker.replace(TX1, TX2)
+    tracker.replace(TX2, TX3)
+    chain["mined"] = {TX1: (99, None), TX2: (100, None)}  # a confused node reporting both: first seen wins
+    _poll()
+    statuses = {v["txid"]: v["status"] for v in tracker.family(tracker.get(TX1))}
+    assert statuses == {TX1: tracker.PENDING, TX2: tracker.REPLACED, TX3: tracker.REPLACED}
+
+
+def test_stuck_picks_the_newest_version_past_its_deadline(chain):
+    tracker.track("ETH", TX1)
+    later = time.time() + fee_bump.BUMP_AFTER["ETH"] + 1
+    assert [r["txid"] for r in fee_bump.stuck(later)] == [TX1]
+    tracker.replace(TX1, TX2)
+    assert [r["txid"] for r in fee_bump.stuck(later)] == [TX2]
+    assert fee_bump.stuck(time.time()) == []
+
+
+def test_stuck_stops_after_max_bumps(chain):
+    txids = ["0x" + f"{n:064x}" for n in range(fee_bump.MAX_BUMPS + 1)]
+    tracker.track("ETH", txids[0])
+    for old, new in zip(txids, txids[1:]):
+        tracker.replace(old, new)
+    assert fee_bump.stuck(time.time() + fee_bump.BUMP_AFTER["ETH"] + 1) == []
+
+
+def test_queue_jobs_follow_the_mined_version(chain):
+    job = send_queue.enqueue("ETH", "0x" + "11" * 20, "1")
+    send_queue._update([job["id"]], status=send_queue.BROADCAST, txid=TX1)
+    tracker._adopt_queue_jobs()
+    tracker.replace(TX1, TX2)
+    chain["head"], chain["mined"][TX2] = 200, (100, None)
+    _poll()
+    job = send_queue.get(job["id"])
+    assert (job["txid"], job["status"]) == (TX2, send_queue.CONFIRMED)
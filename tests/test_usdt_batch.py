@@ -0,0 +1,81 @@
+import hashlib
+import io
+
+import pytest
+from rich.console import Console
+from tronpy.keys import PrivateKey
+
+import usdt
+
+KEY = PrivateKey(bytes(range(1, 33)))
+WALLET = {"tron": {"address": KEY.public_key.to_base58check_address(), "private_key": KEY.hex()}}
+
+
+class _Txn:
+    def __init__(self, to_address, amount):
+        if to_address == "invalid":
+            raise ValueError("invalid address")
+        self.to_address, self.amount = to_address, amount
+        self.txid = hashlib.sha256(f"{to_address}:{amount}".encode()).hexdigest()
+        self._signature = []
+
+    def with_owner(self, owner):
+        return self
+
+    def fee_limit(self, limit):
+        return self
+
+    def build(self):
+        return self
+
+    def broadcast(self):
+        assert len(self._signature) == 1  # signed before it goes out
+        if self.to_address == "bad":
+            raise ValueError("rejected")
+        return {"result": True}
+
+
+class _Contract:
+    class functions:
+        transfer = _Txn
+
+
+@pytest.fixture
+def tracked(monkeypatch):
+    monkeypatch.setattr(usdt.tron, "get_contract", lambda address: _Contract)
+    monkeypatch.setattr(usdt, "TRC20_BATCH_CHUNK", 3)
+    tracked = []
+    monkeypatch.setattr(usdt.tracker, "track_sent", lambda coin, txid: tracked.append(txid))
+    return tracked
+
+
+def test_batch_payout_signs_broadcasts_and_tracks_in_payout_order(tracked):
+    payouts = [(f"T{i}", "1.5") for i in range(7)] + [("bad", "2")]
+
+    results = usdt.send_trc20_usdt_batch(WALLET, payouts)
+    assert [r[0] for r in results] == [to for to, _ in payouts]
+    assert all(txid and error is None for _, txid, error in results[:-1])
+    assert results[-1][1:] == (None, "rejected")
+    assert sorted(tracked) == sorted(txid for _, txid, _ in results[:-1])  # broadcasts run concurrently
+
+
+def test_a_build_failure_in_a_later_chunk_keeps_every_result(tracked):
+    payouts = [(f"T{i}", "1") for i in range(4)] + [("invalid", "1")] + [(f"T{i}", "1") for i in range(5, 8)]
+
+    results = usdt.send_trc20_usdt_batch(WALLET, payouts)
+    assert [r[0] for r in results] == [to for to, _ in payouts]
+    assert results[4][1] is None and "invalid address" in results[4][2]
+    assert all(txid and error is None for i, (_, txid, error) in enumerate(results) if i != 4)
+    assert len(tracked) == 7
+
+
+@pytest.mark.parametrize("amount", ["abc", "0", "-1", "NaN"])
+def test_csv_payout_rejects_bad_amounts_before_sending(amount, tmp_path, monkeypatch):
+    csv = tmp_path / "payouts.csv"
+    csv.write_text(f"T1,1\nT2,{amount}\n")
+    monkeypatch.setattr(usdt.Prompt, "ask", lambda *args, **kwargs: str(csv))
+    monkeypatch.setattr(usdt, "send_trc20_usdt_batch", lambda *args: pytest.fail("must not send"))
+    out = io.StringIO()
+    monkeypatch.setattr(usdt, "console", Console(file=out, width=200))
+    usdt.send_trc20_usdt_csv(WALLET)
+    assert "Invalid payout file" in out.getvalue()
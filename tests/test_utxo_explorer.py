@@ -0,0 +1,163 @@
+import io
+import json
+import socket
+
+import pytest
+from rich.console import Console
+
+import dash
+import http_cache
+import utxo_explorer
+import zec
+from mocks import MockServer
+from rpc_router import RPCRouter, RouterError
+
+ADDRESSES = [f"X{i:033d}" for i in range(120)]
+
+
+def _insight(method, path, body):
+    # /addrs/<a,b,..>/utxo: one confirmed 1000-sat and one unconfirmed 5-sat output per address
+    batch = path.split("/")[2].split(",")
+    return 200, [u for a in batch for u in (
+        {"address": a, "txid": "aa" * 32, "vout": 0, "satoshis": 1000, "confirmations": 3, "height": 100},
+        {"address": a, "txid": "bb" * 32, "vout": 1, "satoshis": 5, "confirmations": 0})]
+
+
+def _blockcypher(method, path, body):
+    batch = path.split("/")[2].split("?")[0].split(";")
+    entries = [{"address": a, "balance": 2000,
+                "txrefs": [{"tx_hash": "cc" * 32, "tx_output_n": 2, "value": 2000, "confirmations": 6,
+                            "block_height": 99}]} for a in batch]
+    return 200, entries if len(entries) > 1 else entries[0]
+
+
+def _blockbook(method, path, body):
+    address = path.split("/")[4].split("?")[0]
+    if path.startswith("/api/v2/utxo/"):
+        return 200, [{"txid": "dd" * 32, "vout": 0, "value": "700", "confirmations": 1, "height": 5}]
+    return 200, {"address": address, "balance": "700"}
+
+
+@pytest.fixture
+def servers(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", str(tmp_path))
+    started = []
+
+    def start(handle):
+        started.append(MockServer(handle))
+        return started[-1]
+
+    yield start
+    for server in started:
+        server.close()
+
+
+def _dead_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"  # closed again: connections are refused
+
+
+def _explorer(cls, *urls):
+    return cls("DASH", RPCRouter("dash", list(urls), cooldown=60))
+
+
+def test_insight_batches_addresses_and_counts_confirmed_outputs(servers):
+    server = servers(_insight)
+    explorer = _explorer(utxo_explorer.InsightExplorer, server.url)
+    balances = explorer.balances(ADDRESSES)
+    assert server.requests == 3  # 50 + 50 + 20
+    assert list(balances) == ADDRESSES and set(balances.values()) == {1000}
+    assert len(explorer.utxos(ADDRESSES[:10])) == 20
+
+
+def test_blockcypher_batches_and_unwraps_a_single_address(servers):
+    server = servers(_blockcypher)
+    explorer = _explorer(utxo_explorer.BlockCypherExplorer, server.url)
+    assert explorer.balance(ADDRESSES[:45]) == 45 * 2000
+    assert server.requests == 3  # 20 + 20 + 5
+    (utxo,) = explorer.utxos(ADDRESSES[:1])
+    assert utxo == {"address": ADDRESSES[0], "txid": "cc" * 32, "vout": 2, "value": 2000,
+                    "confirmations": 6, "height": 99}
+
+
+def test_blockbook_asks_once_per_address_and_dedupes(servers):
+    server = servers(_blockbook)
+    explorer = _explorer(utxo_explorer.BlockbookExplorer, server.url)
+    assert explorer.balances(ADDRESSES[:3] + ADDRESSES[:1]) == dict.fromkeys(ADDRESSES[:3], 700)
+    assert server.requests == 3
+    assert [u["address"] for u in explorer.utxos(ADDRESSES[:2])] == ADDRESSES[:2]
+
+
+def test_fails_over_to_the_next_explorer(servers):
+    failing = servers(lambda method, path, body: (500, {"error": "overloaded"}))
+    healthy = servers(_blockbook)
+    explorer = _explorer(utxo_explorer.BlockbookExplorer, _dead_url(), failing.url, healthy.url)
+    assert explorer.balance(ADDRESSES[:1]) == 700
+    stats = explorer.router.metrics()["providers"]
+    assert [p["errors"] for p in stats] == [1, 1, 0]
+
+
+def test_malformed_reply_raises_router_error(servers):
+    server = servers(lambda method, path, body: (200, {"unexpected": True}))
+    explorer = _explorer(utxo_explorer.BlockbookExplorer, server.url)
+    with pytest.raises(RouterError, match="unexpected reply"):
+        explorer.balance(ADDRESSES[:1])
+
+
+def test_explorer_subclasses_must_implement_both_lookups():
+    class Partial(utxo_explorer.Explorer):
+        def _balances(self, batch):
+            return {}
+
+    with pytest.raises(TypeError):
+        Partial("DASH", RPCRouter("dash", ["http://x.test"]))
+
+
+def test_get_rejects_an_unknown_backend(monkeypatch):
+    monkeypatch.setenv("HIDERAX_EXPLORER_DASH", "nope")
+    utxo_explorer.get.cache_clear()
+    try:
+        with pytest.raises(ValueError, match="Unknown explorer backend 'nope'"):
+            utxo_explorer.get("DASH")
+    finally:
+        utxo_explorer.get.cache_clear()
+
+
+@pytest.fixture(params=[(dash, "KEY_PATH"), (zec, "INFO_PATH")], ids=["dash", "zec"])
+def receive_wallet(request, tmp_path, monkeypatch):
+    module, attr = request.param
+    path = tmp_path / "wallet_info.json"
+    path.write_text(json.dumps({"address": ADDRESSES[0], "wif": "not-a-real-wif"}))
+    monkeypatch.setattr(module, attr, str(path))
+    out = io.StringIO()
+    monkeypatch.setattr(module, "console", Console(file=out, width=200))
+    return module, out
+
+
+def test_view_wallet_shows_the_explorer_balance(receive_wallet, servers, monkeypatch):
+    module, out = receive_wallet
+    explorer = _explorer(utxo_explorer.BlockbookExplorer, servers(_blockbook).url)
+    monkeypatch.setattr(utxo_explorer, "get", lambda coin: explorer)
+    module.view_wallet()
+    assert "0.00000700" in out.getvalue()
+
+
+def test_view_wallet_survives_a_failing_explorer(receive_wallet, servers, monkeypatch):
+    module, out = receive_wallet
+    explorer = _explorer(utxo_explorer.BlockbookExplorer, servers(lambda m, p, b: (503, {})).url)
+    monkeypatch.setattr(utxo_explorer, "get", lambda coin: explorer)
+    module.view_wallet()
+    assert "unavailable (All dash providers failed" in out.getvalue()
+
+
+def test_view_wallet_survives_a_misconfigured_explorer(receive_wallet, monkeypatch):
+    module, out = receive_wallet
+    monkeypatch.setenv("HIDERAX_EXPLORER_DASH", "nope")
+    monkeypatch.setenv("HIDERAX_EXPLORER_ZEC", "nope")
+    utxo_explorer.get.cache_clear()
+    try:
+        module.view_wallet()
+    finally:
+        utxo_explorer.get.cache_clear()
+    assert "unavailable (Unknown explorer backend" in out.getvalue()
@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+import hd_evm
+import watch_only
+
+MNEMONIC = " ".join(["abandon"] * 11 + ["about"])
+
+# Account-0 public keys of MNEMONIC, as `export` writes them, and their first receive addresses
+# (BIP 84 / BIP 44 reference vectors; the EVM key is hd_evm's m/44'/60'/0'/0 node)
+VECTORS = {
+    "BTC": ({"xpub": "zpub6rFR7y4Q2AijBEqTUquhVz398htDFrtymD9xYYfG1m4wAcvPhXNfE3EfH1r1ADqtfSdVCToUG868RvUUkgDKf31mGDtK"
+                     "sAYz2oz2AGutZYs", "path": "m/84'/0'/0'", "network": "bitcoin"},
+            ["bc1qcr8te4kr609gcawutmrza0j4xv80jy8z306fyu", "bc1qnjg0jd8228aq7egyzacy8cys3knf9xvrerkf9g"]),
+    "DOGE": ({"xpub": "xpub6Bxse8AT19u9HExKtP1EAudLi9CpLxPpxDvanL2fFtM7UFE2Q7TTWRg4bnMnmT4KcyN6GQkSgZmPWDtyUywSii3MDpMN"
+                      "fXSTuzH7gvZywLU", "path": "m/44'/3'/0'", "network": "dogecoin"},
+             ["DBus3bamQjgJULBJtYXpEzDWQRwF5iwxgC", "DAcDAtJRztxBHyA6D6h8du1HguyTR43Mas"]),
+    "EVM": ({"xpub": "xpub6EF8jXqFeFEW5bwMU7RpQtHkzE4KJxcqJtvkCjJumzW8CPpacXkb92ek4WzLQXjL93HycJwTPUAcuNxCqFPKKU5m5Z2V"
+                     "q4nCyh5CyPeBFFr", "path": hd_evm.ACCOUNT_PATH},
+            ["0x9858EfFD232B4033E47d90003D41EC34EcaEda94", "0x6Fac4D18c912343BF86fa7049364Dd4E424Ab9C0"]),
+}
+
+
+@pytest.fixture
+def watch_file(tmp_path, monkeypatch):
+    path = tmp_path / "xpubs.json"
+    path.write_text(json.dumps({key: entry for key, (entry, _) in VECTORS.items()}))
+    monkeypatch.setattr(watch_only, "WATCH_PATH", str(path))
+    monkeypatch.setattr(watch_only, "_cache", {})
+    monkeypatch.setattr(watch_only, "_derivers", {})
+    watch_only.load.cache_clear()
+    yield path
+    watch_only.load.cache_clear()
+
+
+@pytest.mark.parametrize("key", VECTORS)
+def test_xpub_derives_the_account_zero_receive_addresses(key):
+    entry, expected = VECTORS[key]
+    derive = watch_only.deriver(key, entry)
+    assert [derive(i) for i in range(len(expected))] == expected
+
+
+@pytest.mark.parametrize("chain", ["BTC", "DOGE", "ETH", "BNB", "POL"])
+def test_addresses_come_from_the_watch_file(watch_file, chain):
+    expected = VECTORS[watch_only.CHAINS[chain][0]][1]
+    assert watch_only.addresses(chain, 0, 2) == expected
+    assert watch_only.addresses(chain, 1, 1) == expected[1:]  # served from the cache
+
+
+@pytest.mark.parametrize("key, network, witness_type", [("BTC", "bitcoin", "segwit"), ("BTC", "bitcoin", "legacy"),
+                                                        ("LTC", "litecoin", "segwit"), ("DOGE", "dogecoin", "legacy")])
+def test_utxo_deriver_matches_the_wallet_it_was_exported_from(tmp_path, key, network, witness_type):
+    from bitcoinlib.wallets import Wallet
+    wallet = Wallet.create("watch-test", keys=MNEMONIC, network=network, witness_type=witness_type,
+                           db_uri=f"sqlite:///{tmp_path / 'wallet.db'}")
+    account = wallet.public_master()  # what account_key() exports
+    derive = watch_only.deriver(key, {"xpub": account.wif, "path": account.path, "network": network})
+    assert [derive(i) for i in range(5)] == [k.address for k in wallet.get_keys(number_of_keys=5)]
+
+
+def test_unknown_and_unexported_chains_are_refused(watch_file):
+    with pytest.raises(ValueError, match="Unknown chain"):
+        watch_only.addresses("XRP")
+    with pytest.raises(KeyError, match="LTC is not in"):
+        watch_only.addresses("LTC")
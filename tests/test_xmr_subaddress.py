@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from monero.address import address as parse_address
+from monero.backends.offline import OfflineWallet
+from monero.seed import Seed
+from monero.wallet import Wallet
+
+import xmr
+import xmr_subaddress
+
+
+@pytest.fixture
+def wallet(tmp_path, monkeypatch):
+    """A fresh XMR wallet on disk and the monero library's view of it."""
+    seed = Seed()
+    info = tmp_path / "wallet_info.json"
+    info.write_text(json.dumps({"address": str(seed.public_address()), "private_view_key": seed.secret_view_key()}))
+    monkeypatch.setattr(xmr, "INFO_PATH", str(info))
+    monkeypatch.setattr(xmr_subaddress, "SUBADDRESS_PATH", str(tmp_path / "subaddresses.json"))
+    return Wallet(OfflineWallet(seed.public_address(), view_key=seed.secret_view_key(),
+                                spend_key=seed.secret_spend_key()))
+
+
+def test_derive_matches_the_monero_library(wallet):
+    net = parse_address(str(wallet.address())).net
+    xmr_subaddress._init(wallet.view_key(), bytes.fromhex(wallet.address().spend_key()),
+                         xmr_subaddress.const.SUBADDR_NETBYTES[xmr_subaddress.const.NETS.index(net)])
+    for major, minor in [(0, 1), (0, 2), (1, 0), (3, 4_000_000_000)]:
+        major_, minor_, addr, spend = xmr_subaddress.derive(major, minor)
+        expected = wallet.get_address(major, minor)
+        assert (major_, minor_, addr) == (major, minor, str(expected))
+        assert spend == expected.spend_key()
+
+
+def test_generate_only_derives_missing_indices(wallet):
+    first = xmr_subaddress.generate(range(1), range(0, 4))
+    assert [(r[0], r[1]) for r in first] == [(0, 1), (0, 2), (0, 3)]  # 0/0 is the primary address
+    assert xmr_subaddress.generate(range(1), range(1, 4)) == []
+    more = xmr_subaddress.generate(range(2), range(0, 5))
+    assert sorted((r[0], r[1]) for r in more) == [(0, 4)] + [(1, m) for m in range(5)]
+    assert len(xmr_subaddress.load()) == 9
+    assert xmr_subaddress.address_of(1, 3) == str(wallet.get_address(1, 3))
+    table = xmr_subaddress.table()
+    assert table[bytes.fromhex(wallet.get_address(1, 3).spend_key())] == (1, 3)
@@ -0,0 +1,193 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+
+import nacl.bindings as sodium
+import pytest
+import varint
+from monero.keccak import keccak_256
+
+import xmr_sync
+
+EIGHT = (8).to_bytes(32, "little")
+
+
+def _point(k: bytes) -> bytes:
+    return sodium.crypto_scalarmult_ed25519_base_noclamp(k)
+
+
+def _secret() -> bytes:
+    return xmr_sync.scalar(os.urandom(32))
+
+
+def _wallet():
+    view, spend = _secret(), _secret()
+    xmr_sync._init(view.hex(), {_point(spend): (0, 0)})
+    return _point(view), _point(spend)
+
+
+def _tx(view_pub, spend_pub, amount: int, rct_type: int = 6, tamper: bool = False):
+    """One-output RingCT transaction paying (view_pub, spend_pub)."""
+    r = _secret()
+    derivation = sodium.crypto_scalarmult_ed25519_noclamp(sodium.crypto_core_ed25519_scalar_mul(r, EIGHT), view_pub)
+    index = varint.encode(0)
+    hs = xmr_sync.scalar(derivation + index)
+    key = sodium.crypto_core_ed25519_add(_point(hs), spend_pub)
+    value = amount.to_bytes(32, "little")
+    if rct_type <= 3:
+        mask = _secret()
+        blind = xmr_sync.scalar(hs)
+        ecdh = {"mask": sodium.crypto_core_ed25519_scalar_add(mask, blind).hex(),
+                "amount": sodium.crypto_core_ed25519_scalar_add(value, xmr_sync.scalar(blind)).hex()}
+    else:
+        mask = xmr_sync.scalar(b"commitment_mask" + hs)
+        ecdh = {"amount": bytes(a ^ b for a, b in zip(value[:8], keccak_256(b"amount" + hs).digest())).hex()}
+    committed = amount + 1 if tamper else amount
+    commitment = _point(mask)
+    if committed:
+        commitment = sodium.crypto_core_ed25519_add(
+            commitment, sodium.crypto_scalarmult_ed25519_noclamp(committed.to_bytes(32, "little"), xmr_sync.H))
+    target = {"tagged_key": {"key": key.hex(), "view_tag": keccak_256(b"view_tag" + derivation + index).digest()[:1].hex()}}
+    return {"vin": [{"key": {}}], "vout": [{"amount": 0, "target": target}],
+            "extra": list(b"\x01" + _point(r)),
+            "rct_signatures": {"type": rct_type, "ecdhInfo": [ecdh], "outPk": [commitment.hex()]}}
+
+
+def test_finds_current_ringct_amount():
+    view_pub, spend_pub = _wallet()
+    [found] = xmr_sync.scan_transaction(_tx(view_pub, spend_pub, 1_250_000_000), "aa", 7, [3])
+    assert (found["amount"], found["height"], found["global_index"]) == (1_250_000_000, 7, 3)
+    assert "error" not in found
+
+
+def test_zero_amount_does_not_crash():
+    view_pub, spend_pub = _wallet()
+    [found] = xmr_sync.scan_transaction(_tx(view_pub, spend_pub, 0), "aa", 7, None)
+    assert found["amount"] == 0
+
+
+def test_decodes_legacy_32_byte_amounts():
+    view_pub, spend_pub = _wallet()
+    for rct_type in (1, 2, 3):
+        [found] = xmr_sync.scan_transaction(_tx(view_pub, spend_pub, 42_000, rct_type), "aa", 7, None)
+        assert found["amount"] == 42_000
+
+
+def test_commitment_mismatch_is_reported_not_counted():
+    view_pub, spend_pub = _wallet()
+    [found] = xmr_sync.scan_transaction(_tx(view_pub, spend_pub, 5, tamper=True), "aa", 7, None)
+    assert found["amount"] is None and "commitment" in found["error"]
+
+
+def test_foreign_and_malformed_outputs_are_skipped():
+    view_pub, spend_pub = _wallet()
+    stranger = _tx(_point(_secret()), _point(_secret()), 10)
+    assert xmr_sync.scan_transaction(stranger, "aa", 7, None) == []
+    broken = _tx(view_pub, spend_pub, 10)
+    broken["vout"].append({"amount": 0, "target": {"key": "not hex"}})
+    [found] = xmr_sync.scan_transaction(broken, "aa", 7, None)
+    assert (found["n"], found["amount"]) == (0, 10)
+
+
+# ---------- sync() over a fixture chain ----------
+@pytest.fixture
+def node(tmp_path, monkeypatch):
+    """A fake daemon serving `node.chain`; payments to the wallet at `node.pays` heights."""
+    view, spend = _secret(), _secret()
+    view_pub, spend_pub = _point(view), _point(spend)
+    monkeypatch.setattr(xmr_sync, "CHECKPOINT_PATH", str(tmp_path / "sync.json"))
+    monkeypatch.setattr(xmr_sync, "CHUNK", 5)
+    monkeypatch.setattr(xmr_sync, "ProcessPoolExecutor", ThreadPoolExecutor)  # _init then applies in-process
+    monkeypatch.setattr(xmr_sync, "load_keys", lambda: (view.hex(), spend_pub))
+    monkeypatch.setattr(xmr_sync, "spend_table", lambda: {spend_pub: (0, 0)})
+    payments = {}
+
+    class Node:
+        chain: List[Dict[str, Any]] = []
+        fetches: List[Tuple[int, int]] = []
+
+        @staticmethod
+        def build(top, pays, fork_at=None):
+            """Blocks 0..top-1; from fork_at on they are a different branch."""
+            def block_hash(h):
+                return ("b" if fork_at is not None and h >= fork_at else "a") + str(h)
+
+            Node.chain = []
+            for h in range(top):
+                txs = []
+                if h in pays:
+                    key = (block_hash(h), pays[h])
+                    if key not in payments:
+                        payments[key] = _tx(view_pub, spend_pub, pays[h])
+                    txs.append({"hash": f"tx-{block_hash(h)}", "json": payments[key]})
+                Node.chain.append({"height": h, "hash": block_hash(h),
+                                   "prev_hash": block_hash(h - 1) if h else "", "txs": txs})
+
+    def fetch_blocks(start, end):
+        Node.fetches.append((start, end))
+        return [dict(b, txs=list(b["txs"])) for b in Node.chain[start:end]]
+
+    monkeypatch.setattr(xmr_sync, "fetch_blocks", fetch_blocks)
+    monkeypatch.setattr(xmr_sync, "daemon_height", lambda: len(Node.chain))
+    return Node
+
+
+def _received(state):
+    return sorted((o["height"], o["amount"]) for o in state["outputs"])
+
+
+def test_sync_scans_in_chunks_and_checkpoints(node):
+    node.build(12, {1: 100, 6: 200, 11: 300})
+    progress = []
+    state = xmr_sync.sync(progress=lambda height, top: progress.append((height, top)))
+    assert node.fetches == [(0, 5), (5, 10), (10, 12)]
+    assert progress == [(5, 12), (10, 12), (12, 12)]
+    assert _received(state) == [(1, 100), (6, 200), (11, 300)] and xmr_sync.received(state) == 600
+    saved = xmr_sync.load_checkpoint()
+    assert saved["height"] == 12 and _received(saved) == _received(state)
+    assert sorted(saved["hashes"], key=int) == [str(h) for h in range(12 - xmr_sync.REORG_DEPTH, 12)]
+
+
+def test_sync_resumes_from_the_checkpoint(node):
+    node.build(12, {1: 100, 11: 300})
+    xmr_sync.sync()
+    node.build(15, {1: 100, 11: 300, 13: 400})
+    node.fetches.clear()
+    state = xmr_sync.sync()
+    assert node.fetches == [(12, 15)]
+    assert _received(state) == [(1, 100), (11, 300), (13, 400)]
+    node.fetches.clear()
+    assert xmr_sync.sync()["height"] == 15
+    assert all(start == end for start, end in node.fetches)  # already at the tip: nothing refetched
+
+
+def test_sync_from_an_explicit_height_rescans(node):
+    node.build(12, {1: 100, 6: 200, 11: 300})
+    xmr_sync.sync()
+    node.fetches.clear()
+    state = xmr_sync.sync(start=6)
+    assert node.fetches == [(6, 11), (11, 12)]
+    assert _received(state) == [(1, 100), (6, 200), (11, 300)]  # no duplicates
+
+
+def test_sync_rewinds_when_the_chain_forks_below_the_checkpoint(node):
+    node.build(12, {1: 100, 10: 200})
+    xmr_sync.sync()
+    node.build(14, {1: 100, 10: 200, 11: 500, 13: 700}, fork_at=9)  # block 10's payment lands elsewhere
+    node.fetches.clear()
+    state = xmr_sync.sync()
+    # 12..13 doesn't continue from our block 11: back to the oldest remembered block and rescan
+    assert node.fetches[0] == (12, 14) and node.fetches[1] == (12 - xmr_sync.REORG_DEPTH, 7)
+    assert state["height"] == 14 and state["hashes"]["11"] == "b11"
+    assert _received(state) == [(1, 100), (10, 200), (11, 500), (13, 700)]
+    assert [o["txid"] for o in state["outputs"] if o["height"] == 10] == ["tx-b10"]
+
+
+def test_rewind_without_remembered_hashes_goes_back_reorg_depth(monkeypatch):
+    monkeypatch.setattr(xmr_sync, "RESTORE_HEIGHT", 3)
+    state = {"height": 20, "hashes": {}, "outputs": [{"height": 5}, {"height": 10}], "skipped": [{"height": 12}]}
+    xmr_sync._rewind(state)
+    assert state == {"height": 10, "hashes": {}, "outputs": [{"height": 5}], "skipped": []}
+    state = {"height": 8, "hashes": {}, "outputs": [], "skipped": []}
+    xmr_sync._rewind(state)
+    assert state["height"] == 3  # never before the wallet's restore height